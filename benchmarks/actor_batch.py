@@ -0,0 +1,72 @@
+"""
+Compares actor throughput (messages/sec) for the unbatched run loop, the batched run loop
+and `Behaviors.receive_batch`.
+
+    python -m benchmarks.actor_batch
+"""
+import asyncio
+import time
+
+from felis.actor import ActorContext, ActorSystem, Behavior, Behaviors
+from felis.utils import Logger, LoggerLevel
+
+MESSAGES = 200_000
+
+# actor tasks are only weakly referenced by the loop, so keep finished systems alive
+systems: list[ActorSystem[int]] = []
+
+
+async def run(name: str, behavior: Behavior[int], batch_size: int) -> None:
+    done = asyncio.get_running_loop().create_future()
+    counter = [0]
+
+    def count(n: int) -> None:
+        counter[0] += n
+        if counter[0] >= MESSAGES and not done.done():
+            done.set_result(None)
+
+    def setup(context: ActorContext[int]) -> Behavior[int]:
+        ref = context.spawn(behavior(count), "worker", batch_size=batch_size)
+        start = time.perf_counter()
+        for i in range(MESSAGES):
+            ref.tell(i)
+
+        async def report() -> None:
+            await done
+            elapsed = time.perf_counter() - start
+            print(f"{name:<24} {MESSAGES / elapsed:>12,.0f} msg/s")
+
+        context.loop.create_task(report())
+        return Behavior[int].same
+
+    systems.append(ActorSystem(Behaviors.setup(setup), "bench"))
+    await done
+    await asyncio.sleep(0)
+
+
+def single(count):
+    def on_message(_, message: int) -> Behavior[int]:
+        count(1)
+        return Behavior[int].same
+
+    return Behaviors.receive_message(on_message)
+
+
+def batched(count):
+    def on_messages(_, messages: list[int]) -> Behavior[int]:
+        count(len(messages))
+        return Behavior[int].same
+
+    return Behaviors.receive_batch(on_messages)
+
+
+async def main() -> None:
+    Logger.instance.set_level(LoggerLevel.WARNING)
+    await run("receive_message, n=1", single, 1)
+    await run("receive_message, n=32", single, 32)
+    await run("receive_batch, n=32", batched, 32)
+    await run("receive_batch, n=256", batched, 256)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
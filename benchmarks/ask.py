@@ -0,0 +1,68 @@
+"""
+Measures the ask pattern against an actor that replies immediately:
+- sequential asks, each awaited before the next one
+- batched asks, all in flight at once with pending timeouts
+- `ask_many` fanning out to a pool of actors
+
+    python -m benchmarks.ask
+"""
+import asyncio
+import time
+
+from felis.actor import ActorContext, ActorRef, ActorSystem, Behavior, Behaviors
+from felis.actor import Future
+from felis.utils import Logger, LoggerLevel
+
+ASKS = 100_000
+FANOUT = 100
+
+systems: list[ActorSystem[object]] = []
+
+
+def reply(_, future: Future[int]) -> Behavior[Future[int]]:
+    future.set_result(1)
+    return Behavior[Future[int]].same
+
+
+async def spawn() -> tuple[ActorContext[object], list[ActorRef[Future[int]]]]:
+    ready = asyncio.get_running_loop().create_future()
+
+    def setup(context: ActorContext[object]) -> Behavior[object]:
+        refs = [
+            context.spawn(Behaviors.receive_message(reply), f"echo_{i}")
+            for i in range(FANOUT)
+        ]
+        ready.set_result((context, refs))
+        return Behavior[object].same
+
+    systems.append(ActorSystem(Behaviors.setup(setup), "bench"))
+    return await ready
+
+
+def report(name: str, count: int, elapsed: float) -> None:
+    print(f"{name:<12} {count / elapsed:>12,.0f} asks/s")
+
+
+async def main() -> None:
+    Logger.instance.set_level(LoggerLevel.WARNING)
+    context, refs = await spawn()
+
+    start = time.perf_counter()
+    for _ in range(ASKS // 10):
+        await context.ask(refs[0], lambda f: f)
+    report("sequential", ASKS // 10, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    futures = [context.ask(refs[0], lambda f: f) for _ in range(ASKS)]
+    for future in futures:
+        await future
+    report("batched", ASKS, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(ASKS // FANOUT):
+        await context.ask_many(refs, lambda f: f)
+    report("ask_many", ASKS, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+Compares the size of OneBot 12 frames on the wire and the time to decode them, as JSON
+text frames and as MessagePack binary frames, raw and compressed with permessage-deflate
+at the default settings of websockets and at the largest window and memory level.
+Images are uploaded as base64 in JSON and as raw bytes in MessagePack.
+
+    python -m benchmarks.frames
+"""
+import base64
+import os
+import time
+import zlib
+from typing import Any, Callable
+
+from felis.driver import Codec, Codecs
+
+from .json_codec import GROUP_MESSAGE, MEMBER_LIST
+
+ROUNDS = 2_000
+
+IMAGE = os.urandom(64 * 1024)
+
+FRAMES = {
+    "group": GROUP_MESSAGE,
+    "members": MEMBER_LIST,
+    "image": {
+        "action": "upload_file",
+        "params": {"type": "data", "name": "image.png", "data": IMAGE},
+        "echo": "44",
+    },
+}
+
+# (window bits, memory level) of permessage-deflate
+DEFLATE = {"deflate": (12, 5), "deflate-max": (15, 9)}
+
+
+def frame(codec: Codec, data: dict[str, Any]) -> bytes:
+    if not codec.binary:
+        params = data.get("params", {})
+        if isinstance(params.get("data"), bytes):
+            # JSON has no bytes, OneBot 12 sends them as base64 instead
+            data = {
+                **data,
+                "params": {**params, "data": base64.b64encode(params["data"]).decode()},
+            }
+    encoded = codec.encode(data)
+    return encoded.encode() if isinstance(encoded, str) else encoded
+
+
+def deflate(data: bytes, window_bits: int, memory_level: int) -> bytes:
+    compressor = zlib.compressobj(
+        zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -window_bits, memory_level
+    )
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def measure(fn: Callable[[Any], Any], value: Any, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(value)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main() -> None:
+    codecs = dict[str, Codec]()
+    for name in ("json", "msgpack"):
+        try:
+            codecs[name] = Codecs.get_all()[name]()
+        except ImportError:
+            print(f"skipping {name}: not installed")
+    print(
+        f"{'':<18}{'raw':>10}"
+        + "".join(f"{name:>14}" for name in DEFLATE)
+        + f"{'decode':>14}"
+    )
+    for key, data in FRAMES.items():
+        for name, codec in codecs.items():
+            encoded = frame(codec, data)
+            sizes = [len(deflate(encoded, *settings)) for settings in DEFLATE.values()]
+            # text frames arrive as str
+            received = encoded if codec.binary else encoded.decode()
+            timing = measure(codec.decode, received, ROUNDS)
+            print(
+                f"{key + ' ' + name:<18}{len(encoded):>8} B"
+                + "".join(f"{size:>12} B" for size in sizes)
+                + f"{timing:>11.2f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
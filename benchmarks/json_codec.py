@@ -0,0 +1,125 @@
+"""
+Compares the codecs of the driver on OneBot 12 frames as they come from the connection:
+decoding events and a large action response, and encoding the actions clients send.
+Codecs whose library is not installed are skipped, as are binary codecs, which
+benchmarks/frames.py compares.
+
+    python -m benchmarks.json_codec
+"""
+import json
+import time
+from typing import Any, Callable
+
+from felis.driver import Codec, Codecs
+
+ROUNDS = 20_000
+
+SELF = {"platform": "qq", "user_id": "2233445566"}
+
+GROUP_MESSAGE = {
+    "id": "b6e65187-5ac0-489c-b431-53078e9d2bbb",
+    "time": 1632847927.599013,
+    "type": "message",
+    "detail_type": "group",
+    "sub_type": "",
+    "self": SELF,
+    "message_id": "6283",
+    "message": [
+        {"type": "mention", "data": {"user_id": "3847573"}},
+        {"type": "text", "data": {"text": " 今晚一起打游戏吗？带上图里这个 "}},
+        {"type": "image", "data": {"file_id": "e30f9684-3d54-4f65-b2da-db291a477f16"}},
+        {"type": "reply", "data": {"message_id": "6282", "user_id": "1234567"}},
+    ],
+    "alt_message": "@3847573 今晚一起打游戏吗？带上图里这个 [图片]",
+    "user_id": "123456788",
+    "group_id": "87654321",
+}
+
+PRIVATE_MESSAGE = {
+    **GROUP_MESSAGE,
+    "detail_type": "private",
+    "message": [{"type": "text", "data": {"text": "/ping"}}],
+    "alt_message": "/ping",
+}
+del PRIVATE_MESSAGE["group_id"]
+
+HEARTBEAT = {
+    "id": "b6e65187-5ac0-489c-b431-53078e9d2bbb",
+    "time": 1632847927.599013,
+    "type": "meta",
+    "detail_type": "heartbeat",
+    "sub_type": "",
+    "interval": 5000,
+}
+
+MEMBER_LIST = {
+    "status": "ok",
+    "retcode": 0,
+    "data": [
+        {
+            "user_id": str(10_000_000 + i),
+            "user_name": f"member{i}",
+            "user_displayname": f"群成员{i}",
+        }
+        for i in range(500)
+    ],
+    "message": "",
+    "echo": "42",
+}
+
+SEND_MESSAGE = {
+    "action": "send_message",
+    "params": {
+        "detail_type": "group",
+        "group_id": "87654321",
+        "message": [
+            {"type": "reply", "data": {"message_id": "6283", "user_id": "123456788"}},
+            {"type": "text", "data": {"text": "好啊，九点见"}},
+        ],
+    },
+    "echo": "43",
+}
+
+FRAMES = {
+    "group": json.dumps(GROUP_MESSAGE, ensure_ascii=False),
+    "private": json.dumps(PRIVATE_MESSAGE, ensure_ascii=False),
+    "heartbeat": json.dumps(HEARTBEAT),
+    "members": json.dumps(MEMBER_LIST, ensure_ascii=False),
+}
+
+
+def codecs() -> dict[str, Codec]:
+    available = dict[str, Codec]()
+    for name, CodecType in Codecs.get_all().items():
+        if CodecType.binary:
+            continue
+        try:
+            available[name] = CodecType()
+        except ImportError:
+            print(f"skipping {name}: not installed")
+    return available
+
+
+def measure(fn: Callable[[Any], Any], value: Any, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(value)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main() -> None:
+    available = codecs()
+    columns = [*FRAMES, "encode"]
+    print(f"{'':<10}" + "".join(f"{name:>12}" for name in columns))
+    for name, codec in available.items():
+        timings = [
+            # the member list is large, so fewer rounds keep the run short
+            measure(codec.decode, frame, ROUNDS // 50 if key == "members" else ROUNDS)
+            for key, frame in FRAMES.items()
+        ]
+        timings.append(measure(codec.encode, SEND_MESSAGE, ROUNDS))
+        print(f"{name:<10}" + "".join(f"{t:>9.2f} us" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compares the deque mailbox with the `asyncio.Queue` mailbox:
+- `ActorRef.tell` throughput into a busy actor
+- memory allocated per queued message
+- tell-to-receive latency of an idle actor, which pays for waking the mailbox
+
+    python -m benchmarks.mailbox_tell
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from felis.actor import ActorContext, ActorRef, ActorSystem, Behavior, Behaviors
+from felis.actor import Mailboxes, MailboxSpec
+from felis.utils import Logger, LoggerLevel
+
+MESSAGES = 200_000
+ROUNDS = 5
+PINGS = 50_000
+
+systems: list[ActorSystem[int]] = []
+
+
+async def spawn(name: str, spec: MailboxSpec, on_messages) -> "ActorRef[object]":
+    ready = asyncio.get_running_loop().create_future()
+
+    def setup(context: ActorContext[int]) -> Behavior[int]:
+        behavior = Behaviors.receive_batch(on_messages)
+        ready.set_result(context.spawn(behavior, name, spec, batch_size=MESSAGES))
+        return Behavior[int].same
+
+    systems.append(ActorSystem(Behaviors.setup(setup), "bench"))
+    return await ready
+
+
+async def measure(name: str, spec: MailboxSpec) -> None:
+    loop = asyncio.get_running_loop()
+    drained = [loop.create_future()]
+
+    def on_messages(_, messages: list[object]) -> Behavior[object]:
+        if not drained[0].done():
+            drained[0].set_result(None)
+        return Behavior[object].same
+
+    ref = await spawn(name, spec, on_messages)
+    message = object()
+
+    # the actor cannot run while we tell, so every message stays queued
+    best = float("inf")
+    for _ in range(ROUNDS):
+        drained[0] = loop.create_future()
+        start = time.perf_counter()
+        for _ in range(MESSAGES):
+            ref.tell(message)
+        best = min(best, time.perf_counter() - start)
+        await drained[0]
+
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    for _ in range(MESSAGES):
+        ref.tell(message)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sys.getallocatedblocks() - blocks
+
+    drained[0] = loop.create_future()
+    await drained[0]
+    start = time.perf_counter()
+    for _ in range(PINGS):
+        drained[0] = loop.create_future()
+        ref.tell(message)
+        await drained[0]
+    latency = (time.perf_counter() - start) / PINGS
+
+    print(
+        f"{name:<6} {MESSAGES / best:>12,.0f} tell/s "
+        f"{size / MESSAGES:>7.2f} bytes/msg {blocks / MESSAGES:>6.3f} blocks/msg "
+        f"{latency * 1e6:>6.2f} us/wakeup"
+    )
+
+
+async def main() -> None:
+    Logger.instance.set_level(LoggerLevel.WARNING)
+    await measure("deque", Mailboxes.unbounded())
+    await measure("queue", Mailboxes.queue())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
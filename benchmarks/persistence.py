@@ -0,0 +1,86 @@
+"""
+Measures persistent actors on both storages:
+- the time to handle a message that persists an event, journal writes included
+- the time to recover the state from the latest snapshot and the journal after it
+
+    python -m benchmarks.persistence
+"""
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from felis.actor import ActorContext, ActorSystem, Behavior, Behaviors
+from felis.actor import Persistence, Storage, Storages
+from felis.utils import Logger, LoggerLevel
+
+EVENTS = 50_000
+SNAPSHOT_EVERY = 10_000
+
+systems: list[ActorSystem[int]] = []
+
+
+def on_event(state: int, event: int) -> int:
+    return state + event
+
+
+async def run(name: str, storage: Storage, events: int) -> tuple[float, float]:
+    loop = asyncio.get_running_loop()
+    recovered = loop.create_future()
+    done = loop.create_future()
+
+    def counter(
+        context: ActorContext[int], persistence: Persistence[int, int]
+    ) -> Behavior[int]:
+        recovered.set_result((time.perf_counter(), context.self))
+
+        def on_message(_, message: int) -> Behavior[int]:
+            persistence.persist(message)
+            if persistence.sequence_nr % events == 0:
+                done.set_result(time.perf_counter())
+            return Behaviors.same
+
+        return Behaviors.receive_message(on_message)
+
+    start = time.perf_counter()
+    systems.append(
+        ActorSystem(
+            Behaviors.with_persistence(
+                "counter", storage, 0, on_event, counter, SNAPSHOT_EVERY
+            ),
+            name,
+        )
+    )
+    recovered_at, actor = await recovered
+    recovery = recovered_at - start
+    start = time.perf_counter()
+    for _ in range(events):
+        actor.tell(1)
+    persist = (await done - start) / events
+    return recovery, persist
+
+
+async def measure(name: str, storage: Callable[[], Storage]) -> None:
+    first = storage()
+    _, persist = await run(f"{name}_write", first, EVENTS)
+    # the last events only reach the storage once its thread is done
+    first.close()
+    second = storage()
+    recovery, _ = await run(f"{name}_recover", second, EVENTS)
+    second.close()
+    print(
+        f"{name:<8} persist {persist * 1e6:>6.2f} us/event "
+        f"recovery {recovery * 1e3:>7.2f} ms"
+    )
+
+
+async def main() -> None:
+    Logger.instance.set_level(LoggerLevel.WARNING)
+    directory = Path(tempfile.mkdtemp())
+    await measure("sqlite", lambda: Storages.sqlite(directory / "journal.sqlite"))
+    await measure("files", lambda: Storages.files(directory / "journal"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Compares the latency of pool router executors under a skewed load: a few sessions
+(think busy groups) send most of the messages, and every message takes about a
+millisecond of async work in a worker that handles one message at a time.
+
+    python -m benchmarks.router_latency
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+
+from felis.actor import ActorContext, ActorSystem, Behavior, Behaviors, Executors
+from felis.actor import Routers
+from felis.utils import Logger, LoggerLevel
+
+WORKERS = 8
+SESSIONS = 50
+MESSAGES = 20_000
+BURST = 30
+WORK = 0.001
+
+
+@dataclass
+class Job:
+    session: int
+    sent_at: float
+
+
+systems: list[ActorSystem[Job]] = []
+
+
+EXECUTORS = {
+    "random": Executors.random,
+    "round_robin": Executors.round_robin,
+    "smallest": Executors.smallest_mailbox,
+    "hash": lambda: Executors.consistent_hash(lambda job: job.session),
+}
+
+
+async def measure(name: str, executor) -> None:
+    loop = asyncio.get_running_loop()
+    latencies = list[float]()
+    done = loop.create_future()
+
+    async def work(job: Job) -> None:
+        await asyncio.sleep(WORK)
+        latencies.append(time.perf_counter() - job.sent_at)
+        if len(latencies) == MESSAGES and not done.done():
+            done.set_result(None)
+
+    worker = Behaviors.receive_async(lambda _, job: work(job), concurrency=1)
+    ready = loop.create_future()
+
+    def setup(context: ActorContext[Job]) -> Behavior[Job]:
+        ready.set_result(
+            context.spawn(Routers.pool(WORKERS, worker, executor()).apply(), "pool")
+        )
+        return Behavior[Job].same
+
+    systems.append(ActorSystem(Behaviors.setup(setup), f"bench_{name}"))
+    pool = await ready
+
+    # zipf-like weights: the first session sends SESSIONS times more than the last
+    weights = [1 / (i + 1) for i in range(SESSIONS)]
+    sessions = random.Random(1).choices(range(SESSIONS), weights, k=MESSAGES)
+    start = time.perf_counter()
+    for offset in range(0, MESSAGES, BURST):
+        now = time.perf_counter()
+        for session in sessions[offset : offset + BURST]:
+            pool.tell(Job(session, now))
+        await asyncio.sleep(0.01)
+    await done
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(
+        f"{name:<12} {MESSAGES / elapsed:>8,.0f} msg/s "
+        f"p50 {latencies[MESSAGES // 2] * 1e3:>7.2f} ms "
+        f"p99 {latencies[MESSAGES * 99 // 100] * 1e3:>7.2f} ms "
+        f"max {latencies[-1] * 1e3:>7.2f} ms"
+    )
+
+
+async def main() -> None:
+    Logger.instance.set_level(LoggerLevel.WARNING)
+    for name, executor in EXECUTORS.items():
+        await measure(name, executor)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
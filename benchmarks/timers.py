@@ -0,0 +1,69 @@
+"""
+Compares `loop.call_later` with the shared `TimingWheel` for many pending timers:
+- cost of scheduling and then cancelling a timer, the common case for timeouts
+- memory held per pending timer
+- lateness of fired timers
+
+    python -m benchmarks.timers
+"""
+import asyncio
+import random
+import time
+import tracemalloc
+
+from felis.actor import TimingWheel
+
+TIMERS = 50_000
+FIRED = 5_000
+
+
+async def measure(name: str, schedule, cancel) -> None:
+    loop = asyncio.get_running_loop()
+    delays = [random.uniform(1.0, 60.0) for _ in range(TIMERS)]
+
+    start = time.perf_counter()
+    timers = [schedule(delay, lambda: None) for delay in delays]
+    scheduled = time.perf_counter() - start
+    start = time.perf_counter()
+    for timer in timers:
+        cancel(timer)
+    cancelled = time.perf_counter() - start
+
+    tracemalloc.start()
+    timers = [schedule(delay, lambda: None) for delay in delays]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for timer in timers:
+        cancel(timer)
+
+    lateness = list[float]()
+    done = loop.create_future()
+
+    def on_fire(due: float) -> None:
+        lateness.append(loop.time() - due)
+        if len(lateness) == FIRED and not done.done():
+            done.set_result(None)
+
+    for _ in range(FIRED):
+        delay = random.uniform(0.0, 0.5)
+        schedule(delay, on_fire, loop.time() + delay)
+    await done
+    lateness.sort()
+
+    print(
+        f"{name:<10} {scheduled / TIMERS * 1e6:>6.2f} us/schedule "
+        f"{cancelled / TIMERS * 1e6:>6.2f} us/cancel "
+        f"{size / TIMERS:>7.1f} bytes/timer "
+        f"p50 {lateness[FIRED // 2] * 1e3:>5.2f} ms p99 {lateness[FIRED * 99 // 100] * 1e3:>5.2f} ms late"
+    )
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+    wheel = TimingWheel.of(loop)
+    await measure("call_later", loop.call_later, lambda handle: handle.cancel())
+    await measure("wheel", wheel.schedule, lambda timer: timer.cancel())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
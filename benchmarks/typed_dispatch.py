@@ -0,0 +1,172 @@
+"""
+Compares message dispatch of `Behaviors.receive_typed` with a `match` statement and an
+`isinstance` chain over dataclass messages, calling the handlers of a behavior directly:
+- the first case, where `match` is fastest
+- the last case, where `match` has to try every other case first
+- a subclass of the last case, which `receive_typed` resolves once and then caches
+
+    python -m benchmarks.typed_dispatch
+"""
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from felis.actor import Behavior, Behaviors
+
+MESSAGES = 500_000
+
+
+class Message:
+    pass
+
+
+@dataclass
+class Message0(Message):
+    value: int
+
+
+@dataclass
+class Message1(Message):
+    value: int
+
+
+@dataclass
+class Message2(Message):
+    value: int
+
+
+@dataclass
+class Message3(Message):
+    value: int
+
+
+@dataclass
+class Message4(Message):
+    value: int
+
+
+@dataclass
+class Message5(Message):
+    value: int
+
+
+@dataclass
+class Message6(Message):
+    value: int
+
+
+@dataclass
+class Message7(Message):
+    value: int
+
+
+@dataclass
+class Message8(Message):
+    value: int
+
+
+@dataclass
+class Message9(Message):
+    value: int
+
+
+@dataclass
+class Message10(Message):
+    value: int
+
+
+@dataclass
+class Message11(Message):
+    value: int
+
+
+@dataclass
+class Derived(Message11):
+    pass
+
+
+TYPES = [
+    Message0,
+    Message1,
+    Message2,
+    Message3,
+    Message4,
+    Message5,
+    Message6,
+    Message7,
+    Message8,
+    Message9,
+    Message10,
+    Message11,
+]
+
+
+def handle(_, message: Any) -> Any:
+    return Behaviors.same
+
+
+def on_match(context: Any, message: Message) -> Any:
+    match message:
+        case Message0(value=value):
+            return handle(context, value)
+        case Message1(value=value):
+            return handle(context, value)
+        case Message2(value=value):
+            return handle(context, value)
+        case Message3(value=value):
+            return handle(context, value)
+        case Message4(value=value):
+            return handle(context, value)
+        case Message5(value=value):
+            return handle(context, value)
+        case Message6(value=value):
+            return handle(context, value)
+        case Message7(value=value):
+            return handle(context, value)
+        case Message8(value=value):
+            return handle(context, value)
+        case Message9(value=value):
+            return handle(context, value)
+        case Message10(value=value):
+            return handle(context, value)
+        case Message11(value=value):
+            return handle(context, value)
+    return Behaviors.same
+
+
+def on_isinstance(context: Any, message: Message) -> Any:
+    for cls in TYPES:
+        if isinstance(message, cls):
+            return handle(context, message)
+    return Behaviors.same
+
+
+BEHAVIORS: dict[str, Behavior[Message]] = {
+    "match": Behaviors.receive_message(on_match),
+    "isinstance": Behaviors.receive_message(on_isinstance),
+    "typed": Behaviors.receive_typed({cls: handle for cls in TYPES}),
+}
+
+
+def measure(behavior: Behavior[Message], message: Message) -> float:
+    on_receive = behavior.on_receive
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        on_receive(None, message)  # type: ignore
+    return (time.perf_counter() - start) / MESSAGES * 1e9
+
+
+def main() -> None:
+    messages = {
+        "first": Message0(1),
+        "last": Message11(1),
+        "subclass": Derived(1),
+    }
+    print(f"{'':<12}" + "".join(f"{name:>12}" for name in messages))
+    for name, behavior in BEHAVIORS.items():
+        timings = [measure(behavior, message) for message in messages.values()]
+        print(f"{name:<12}" + "".join(f"{t:>9.0f} ns" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
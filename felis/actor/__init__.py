@@ -1,33 +1,95 @@
 from .actor import Actor, ActorRef
 from .behavior import Behavior, Behaviors
 from .context import ActorContext
-from .future import Future
-from .signals import Signal, Terminated
+from .future import Future, Reply, Replies
+from .dispatcher import Dispatcher, Dispatchers, ProcessContext
+from .placement import Placement, Placements
+from .stash import StashBuffer
+from .timers import TimerScheduler, TimingWheel
+from .mailbox import (
+    Mailbox,
+    DequeMailbox,
+    QueueMailbox,
+    PriorityMailbox,
+    MailboxSpec,
+    Mailboxes,
+    OverflowPolicy,
+)
+from .metrics import ActorMetrics, MetricsSnapshot, Histogram, HistogramSnapshot
+from .signals import Signal, Terminated, Passivate
 from .system import ActorSystem
+from .event_stream import EventStream
+from .shutdown import CoordinatedShutdown, ShutdownPhase, ShutdownReport
+from .persistence import Persistence, RecoveryCompleted, Storage, Storages
+from .remote import RemoteConfig, Remoting, RemoteActorRef
 from .internal.receptionist import (
     ServiceKey,
     Receptionist,
     ReceptionistRequest,
     ListingResponse,
+    ListingUpdate,
+    Listing,
 )
-from .internal.router import Routers, Executor
+from .internal.dead_letters import DeadLetter
+from .internal.router import Routers, Executor, Executors
+from .internal.resizer import Resizer
 from .internal.forwarder import Forwarders
+from .internal.sharding import Sharding
 
 __all__ = [
     "Actor",
     "ActorRef",
     "ActorSystem",
+    "EventStream",
+    "CoordinatedShutdown",
+    "ShutdownPhase",
+    "ShutdownReport",
+    "Persistence",
+    "RecoveryCompleted",
+    "Storage",
+    "Storages",
+    "RemoteConfig",
+    "Remoting",
+    "RemoteActorRef",
     "Behavior",
     "Behaviors",
     "ActorContext",
     "Future",
+    "Reply",
+    "Replies",
+    "Dispatcher",
+    "Dispatchers",
+    "ProcessContext",
+    "Placement",
+    "Placements",
+    "StashBuffer",
+    "TimerScheduler",
+    "TimingWheel",
+    "Mailbox",
+    "DequeMailbox",
+    "QueueMailbox",
+    "PriorityMailbox",
+    "MailboxSpec",
+    "Mailboxes",
+    "OverflowPolicy",
+    "ActorMetrics",
+    "MetricsSnapshot",
+    "Histogram",
+    "HistogramSnapshot",
     "Signal",
     "Terminated",
+    "Passivate",
     "ServiceKey",
     "Receptionist",
     "ReceptionistRequest",
     "ListingResponse",
+    "ListingUpdate",
+    "Listing",
+    "DeadLetter",
     "Routers",
     "Executor",
+    "Executors",
+    "Resizer",
     "Forwarders",
+    "Sharding",
 ]
@@ -1,24 +1,86 @@
 import asyncio
 import os
-from typing import TYPE_CHECKING, Any, Generic, TypeVar
+import threading
+import weakref
+from collections import deque
+from functools import partial
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Generic, Mapping, Sequence, TypeVar
 
 from .behavior import Behavior, Behaviors
+from .mailbox import MailboxSpec, OverflowPolicy
+from .metrics import ActorMetrics, MetricsSnapshot
 from ..utils import LoggerLevel
 
 if TYPE_CHECKING:
     from .context import ActorContext
+    from .dispatcher import Dispatcher
 from .signals import Signal
 
 T = TypeVar("T")
 
+DEFAULT_BATCH_SIZE = 32
+
+_ASYNC_DISPATCHER_ERROR = (
+    "Async handlers run on the event loop and can't use a dispatcher"
+)
+
+# live refs by path, used to restore refs that were pickled for a process dispatcher
+_refs = weakref.WeakValueDictionary[str, "ActorRef[Any]"]()
+# set in process dispatcher workers, where unpickled refs only record outgoing messages
+_in_worker = False
+worker_outbox: "list[tuple[ActorPathRef, Any]] | None" = None
+
+
+def enter_worker_process() -> None:
+    global _in_worker
+    _in_worker = True
+
+
+def resolve_ref(path: str) -> "ActorRef[Any] | ActorPathRef":
+    if not _in_worker:
+        ref = _refs.get(path)
+        if ref is not None:
+            return ref
+    return ActorPathRef(path)
+
+
+class ActorPathRef:
+    """A ref known only by its path, as seen by handlers on a process dispatcher."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    def tell(self, message: Any) -> None:
+        if worker_outbox is not None:
+            worker_outbox.append((self, message))
+            return
+        ref = _refs.get(self.path)
+        if ref is None:
+            raise RuntimeError(f"Actor {self.path} not found")
+        ref.tell(message)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return resolve_ref, (self.path,)
+
+    def __repr__(self) -> str:
+        return f"ActorPathRef[path={self.path}]"
+
 
 class ActorRef(Generic[T]):
+    __slots__ = ("_actor", "_base_url", "__weakref__")
+
     def __init__(self, actor: "Actor[T]", parent: "ActorContext[Any] | None") -> None:
         self._actor = actor
         if parent is None:
             self._base_url = "/"
         else:
             self._base_url = parent.self.path
+        _refs[self.path] = self
 
     @property
     def path(self) -> str:
@@ -41,47 +103,276 @@ class ActorRef(Generic[T]):
     def tell(self, message: T) -> None:
         self._actor.tell(message)
 
+    async def tell_async(self, message: T) -> None:
+        await self._actor.tell_async(message)
+
     def receive_signal(self, signal: Signal) -> None:
-        self._actor.tell(signal)
+        self._actor.tell_signal(signal)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return resolve_ref, (self.path,)
 
     def __repr__(self) -> str:
         return f"ActorRef[path={self.path}]"
 
 
 class Actor(Generic[T]):
+    __slots__ = (
+        "_name",
+        "_mailbox",
+        "_batch_size",
+        "_behavior",
+        "_context",
+        "_stopped",
+        "_unprocessed",
+        "_processed",
+        "_unstashed",
+        "_metrics",
+        "_tasks",
+        "_dispatcher",
+        "_loop",
+        "_thread",
+    )
+
     def __init__(
-        self, name: str, behavior: Behavior[T], context: "ActorContext[T]"
+        self,
+        name: str,
+        behavior: Behavior[T],
+        context: "ActorContext[T]",
+        mailbox: MailboxSpec | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        metrics: bool = False,
+        dispatcher: "Dispatcher | None" = None,
+        loop: asyncio.AbstractEventLoop | None = None,
     ) -> None:
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
         self._name = name
-        self._mailbox = asyncio.Queue[T | Signal]()
+        self._mailbox = (mailbox or MailboxSpec()).create()
+        self._batch_size = batch_size
         self._behavior = behavior
         self._context = context
         self._stopped = False
+        self._unprocessed = 0
+        self._processed = 0
+        self._unstashed: "deque[T | Signal] | None" = None
+        self._tasks = set[asyncio.Task[None]]()
+        if dispatcher is not None and dispatcher.inline:
+            dispatcher = None
+        if dispatcher is not None and behavior.on_receive_async is not None:
+            raise TypeError(_ASYNC_DISPATCHER_ERROR)
+        self._dispatcher = dispatcher
+        running = asyncio.get_running_loop()
+        self._loop = loop or running
+        # the loop thread is only known up front if the actor lives on the current loop
+        self._thread = threading.get_ident() if self._loop is running else None
+        self._metrics: ActorMetrics | None = None
+        if metrics:
+            self._metrics = ActorMetrics()
+            self._mailbox.track(self._metrics)
 
     async def _start(self):
+        self._thread = threading.get_ident()
         try:
             current = self._behavior.apply(self._context)
             while current is not Behaviors.stop:
-                msg = await self._mailbox.get()
-                next = current.on_receive(self._context, msg)
-                self._mailbox.task_done()
-                if next is Behaviors.same:
-                    continue
-                current = next
+                batch = await self._mailbox.get_batch(self._batch_size)
+                current = await self._process(current, batch)
+                if len(self._mailbox) > 0:
+                    # give other actors a chance to run before draining the next batch
+                    await asyncio.sleep(0)
         except asyncio.CancelledError:
             self._context.log(f"Actor {self._name} is cancelled.")
+        finally:
             self._stopped = True
-        if not self._mailbox.empty():
+            self._mailbox.close()
+            for task in list(self._tasks):
+                task.cancel()
+        remaining = len(self._mailbox) + self._unprocessed
+        if remaining > 0:
             self._context.log(
-                f"Actor {self._name} stopped, but there are still {self._mailbox.qsize()} messages in the mailbox.",
+                f"Actor {self._name} stopped, but there are still {remaining} messages in the mailbox.",
                 LoggerLevel.WARNING,
             )
 
+    async def _process(
+        self, current: Behavior[T], batch: Sequence[T | Signal]
+    ) -> Behavior[T]:
+        metrics = self._metrics
+        index = 0
+        while True:
+            if self._unstashed is not None:
+                # unstashed messages go before the rest of the batch
+                batch = [*self._unstashed, *batch[index:]]
+                index = 0
+                self._unstashed = None
+            if index >= len(batch):
+                break
+            if current.on_receive_async is not None:
+                if self._dispatcher is not None:
+                    raise TypeError(_ASYNC_DISPATCHER_ERROR)
+                await self._dispatch(current, batch[index])
+                index += 1
+                continue
+            start = index
+            if metrics is not None:
+                started_at = perf_counter()
+            if current.on_receive_batch is not None:
+                messages = batch[index:]
+                index = len(batch)
+                if self._dispatcher is None:
+                    next = current.on_receive_batch(self._context, messages)
+                else:
+                    next = await self._dispatcher.invoke(
+                        current.on_receive_batch, self._context, messages
+                    )
+            else:
+                message = batch[index]
+                index += 1
+                if self._dispatcher is None:
+                    next = current.on_receive(self._context, message)
+                else:
+                    next = await self._dispatcher.invoke(
+                        current.on_receive, self._context, message
+                    )
+            self._processed += index - start
+            if metrics is not None:
+                metrics.on_processed(index - start, perf_counter() - started_at)
+            if next is Behaviors.same:
+                continue
+            current = next
+            if current is Behaviors.stop:
+                self._unprocessed = len(batch) - index + len(self._unstashed or ())
+                break
+        return current
+
+    async def _dispatch(self, current: Behavior[T], message: T | Signal) -> None:
+        assert current.on_receive_async is not None
+        awaitable = current.on_receive_async(self._context, message)
+        if awaitable is None:
+            self._processed += 1
+            return
+        tasks = self._tasks
+        try:
+            while len(tasks) >= current.concurrency:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            # stopped while waiting for a free slot, the handler never runs
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise
+        task = asyncio.ensure_future(awaitable)
+        tasks.add(task)
+        if self._metrics is not None:
+            self._metrics.increment("async_started")
+            task.add_done_callback(partial(self._on_task_done, perf_counter()))
+        else:
+            task.add_done_callback(partial(self._on_task_done, None))
+
+    def _on_task_done(self, started_at: float | None, task: asyncio.Task[None]) -> None:
+        self._tasks.discard(task)
+        metrics = self._metrics
+        if task.cancelled():
+            if metrics is not None:
+                metrics.increment("async_cancelled")
+            return
+        self._processed += 1
+        error = task.exception()
+        if error is not None:
+            self._context.log(
+                f"Async handler failed: [exception={error.__class__.__name__},message={error}]",
+                LoggerLevel.ERROR,
+            )
+        if metrics is not None and started_at is not None:
+            metrics.increment(
+                "async_failed" if error is not None else "async_completed"
+            )
+            metrics.on_processed(1, perf_counter() - started_at)
+
+    def _unstash(self, messages: "deque[T | Signal]") -> None:
+        if self._unstashed is None:
+            self._unstashed = messages
+        else:
+            self._unstashed.extend(messages)
+
     @property
     def is_alive(self) -> bool:
         return not self._stopped
 
+    @property
+    def mailbox_depth(self) -> int:
+        """Number of messages waiting in the mailbox."""
+        return len(self._mailbox)
+
+    @property
+    def pending(self) -> int:
+        """Number of messages in the mailbox or being handled by async handlers."""
+        return len(self._mailbox) + len(self._tasks)
+
+    @property
+    def processed(self) -> int:
+        """Number of messages handled so far, counting async handlers once they finish."""
+        return self._processed
+
+    @property
+    def dropped(self) -> Mapping[OverflowPolicy, int]:
+        return self._mailbox.dropped
+
+    @property
+    def metrics(self) -> ActorMetrics | None:
+        """Runtime metrics of this actor, or None if collection is disabled."""
+        return self._metrics
+
+    def snapshot(self) -> MetricsSnapshot | None:
+        if self._metrics is None:
+            return None
+        counters = {
+            f"dropped_{policy.value}": count
+            for policy, count in self._mailbox.dropped.items()
+            if count > 0
+        }
+        if len(self._tasks) > 0:
+            counters["async_in_flight"] = len(self._tasks)
+        return self._metrics.snapshot(
+            self._context.self.path, len(self._mailbox), counters
+        )
+
     def tell(self, message: T | Signal):
+        if self._stopped:
+            raise RuntimeError("Actor is already stopped")
+        if threading.get_ident() != self._thread:
+            # mailboxes are not thread-safe, so hand messages from other threads to the loop
+            self._loop.call_soon_threadsafe(self._offer, message)
+            return
+        self._offer(message)
+
+    def _offer(self, message: T | Signal) -> None:
+        # the actor may have stopped while a message from another thread was on its way
+        if self._stopped or not self._mailbox.offer(message):
+            self._context.system.dead_letter(message, self._context.self)
+
+    def tell_signal(self, signal: Signal):
+        if self._stopped:
+            raise RuntimeError("Actor is already stopped")
+        if threading.get_ident() != self._thread:
+            self._loop.call_soon_threadsafe(self._offer_signal, signal)
+            return
+        self._offer_signal(signal)
+
+    def _offer_signal(self, signal: Signal) -> None:
+        if self._stopped:
+            self._context.system.dead_letter(signal, self._context.self)
+            return
+        self._mailbox.offer_signal(signal)
+
+    async def tell_async(self, message: T | Signal):
+        if threading.get_ident() != self._thread:
+            future = asyncio.run_coroutine_threadsafe(
+                self.tell_async(message), self._loop
+            )
+            await asyncio.wrap_future(future)
+            return
         if not self.is_alive:
             raise RuntimeError("Actor is already stopped")
-        self._mailbox.put_nowait(message)
+        if not await self._mailbox.offer_async(message):
+            self._context.system.dead_letter(message, self._context.self)
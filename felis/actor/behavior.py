@@ -1,13 +1,29 @@
-from typing import TYPE_CHECKING, Callable, Generic, TypeVar
+import asyncio
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    Mapping,
+    Sequence,
+    TypeVar,
+)
 from typing_extensions import Self
 
 if TYPE_CHECKING:
     from .context import ActorContext
 from .signals import Signal
+from .persistence import DEFAULT_SNAPSHOT_EVERY, Persistence, RecoveryCompleted, Storage
+from .stash import DEFAULT_STASH_CAPACITY, StashBuffer
+from .timers import TimerScheduler
 from ..utils import cast, LoggerLevel
 
 T = TypeVar("T")
 U = TypeVar("U")
+S = TypeVar("S")
+E = TypeVar("E")
 
 
 class Behavior(Generic[T]):
@@ -16,9 +32,19 @@ class Behavior(Generic[T]):
         *,
         apply: "Callable[[ActorContext[T]], Self] | None" = None,
         on_receive: "Callable[[ActorContext[T], T | Signal], Self] | None" = None,
+        on_receive_batch: "Callable[[ActorContext[T], Sequence[T | Signal]], Self] | None" = None,
+        on_receive_async: "Callable[[ActorContext[T], T | Signal], Awaitable[None] | None] | None" = None,
+        concurrency: int = 1,
     ) -> None:
+        if concurrency <= 0:
+            raise ValueError("Concurrency must be positive")
         self.apply = apply or (lambda _: self)
         self.on_receive = on_receive or (lambda _, __: self)
+        # if set, the actor hands every drained batch of messages to this handler at once
+        self.on_receive_batch = on_receive_batch
+        # if set, the actor runs the returned coroutines with at most `concurrency` in flight
+        self.on_receive_async = on_receive_async
+        self.concurrency = concurrency
 
     @classmethod
     def from_apply(cls, apply: "Callable[[ActorContext[T]], Self]") -> Self:
@@ -30,27 +56,39 @@ class Behavior(Generic[T]):
     ) -> Self:
         return cls(on_receive=on_receive)
 
+    # the wrappers below are partials of module level functions, so they can be pickled
+    # whenever the user handler can, which `Dispatchers.process` relies on.
     @classmethod
     def from_receive_message(
         cls, on_receive: "Callable[[ActorContext[T], T], Self]"
     ) -> Self:
-        def _on_receive(context: "ActorContext[T]", msg: T | Signal) -> Self:
-            if isinstance(msg, Signal):
-                return cls.same
-            return on_receive(context, msg)
-
-        return cls(on_receive=_on_receive)
+        return cls(on_receive=partial(_receive_message, on_receive))
 
     @classmethod
     def from_receive_signal(
         cls, on_receive: "Callable[[ActorContext[T], Signal], Self]"
     ) -> Self:
-        def _on_receive(context: "ActorContext[T]", msg: T | Signal) -> Self:
-            if isinstance(msg, Signal):
-                return on_receive(context, msg)
-            return cls.same
+        return cls(on_receive=partial(_receive_signal, on_receive))
+
+    @classmethod
+    def from_receive_batch(
+        cls, on_receive: "Callable[[ActorContext[T], list[T]], Self]"
+    ) -> Self:
+        return cls(
+            on_receive=partial(_receive_one_as_batch, on_receive),
+            on_receive_batch=partial(_receive_batch, on_receive),
+        )
 
-        return cls(on_receive=_on_receive)
+    @classmethod
+    def from_receive_async(
+        cls,
+        on_receive: "Callable[[ActorContext[T], T], Awaitable[None]]",
+        concurrency: int = 1,
+    ) -> Self:
+        return cls(
+            on_receive_async=partial(_receive_async, on_receive),
+            concurrency=concurrency,
+        )
 
     # since Python < 3.12 doesn't support generic function, `Behaviors.same` and `Behaviors.stop`
     # are defined in `Behavior` instead of `Behaviors`.
@@ -88,23 +126,260 @@ class Behaviors:
     ) -> Behavior[U]:
         return Behavior.from_receive_signal(on_receive)
 
+    @staticmethod
+    def receive_typed(
+        handlers: "Mapping[type, Callable[[ActorContext, Any], Behavior[U]]]",
+        on_signal: "Callable[[ActorContext, Signal], Behavior[U]] | None" = None,
+        otherwise: "Callable[[ActorContext, Any], Behavior[U]] | None" = None,
+    ) -> Behavior[U]:
+        """
+        Handles messages and signals with the handler of their class, looked up in a dict
+        instead of trying the cases of a `match` in turn. Subclasses use the handler of
+        their nearest base class, which is resolved once per class and cached. Signals
+        without a handler go to `on_signal` and other messages to `otherwise`; both are
+        ignored by default.
+        """
+        return Behavior.from_receive(_TypedDispatch(handlers, on_signal, otherwise))
+
+    @staticmethod
+    def receive_batch(
+        on_receive: "Callable[[ActorContext, list[U]], Behavior[U]]",
+    ) -> Behavior[U]:
+        return Behavior.from_receive_batch(on_receive)
+
+    @staticmethod
+    def receive_async(
+        on_receive: "Callable[[ActorContext, U], Awaitable[None]]",
+        concurrency: int = 1,
+    ) -> Behavior[U]:
+        """
+        Handles messages with coroutines. With `concurrency=1` messages are handled one at a
+        time in order; larger values allow that many handlers to run at once.
+        """
+        return Behavior.from_receive_async(on_receive, concurrency)
+
+    @staticmethod
+    def with_stash(
+        capacity: int,
+        factory: "Callable[[ActorContext, StashBuffer[U]], Behavior[U]]",
+    ) -> Behavior[U]:
+        """
+        Sets up an actor with a `StashBuffer` of `capacity` messages, for actors that have
+        to put messages aside until they are ready, see `StashBuffer.unstash_all`.
+        """
+        return Behavior.from_apply(
+            lambda context: factory(context, StashBuffer(context, capacity))
+        )
+
+    @staticmethod
+    def with_timers(
+        factory: "Callable[[ActorContext, TimerScheduler[U]], Behavior[U]]",
+    ) -> Behavior[U]:
+        """
+        Sets up an actor with a `TimerScheduler` for keyed single and periodic timers that
+        send messages to the actor.
+        """
+        return Behavior.from_apply(
+            lambda context: factory(context, TimerScheduler(context))
+        )
+
+    @staticmethod
+    def with_persistence(
+        persistence_id: str,
+        storage: Storage,
+        empty: S,
+        on_event: "Callable[[S, E], S]",
+        factory: "Callable[[ActorContext, Persistence[S, E]], Behavior[U]]",
+        snapshot_every: int | None = DEFAULT_SNAPSHOT_EVERY,
+    ) -> Behavior[U]:
+        """
+        Sets up an actor whose state is recovered from `storage` when it starts, see
+        `Persistence`. Messages received while recovering are stashed and handled by the
+        behavior from `factory` afterwards. The actor stops if recovery fails.
+        """
+
+        def _setup(context: "ActorContext[U]") -> Behavior[U]:
+            persistence = Persistence(
+                context, persistence_id, storage, empty, on_event, snapshot_every
+            )
+            stash = StashBuffer[U](context, DEFAULT_STASH_CAPACITY)
+            recovery = context.loop.create_task(persistence.recover())
+
+            def _recovered(task: "asyncio.Task[None]") -> None:
+                if not context.self.ref.is_alive:
+                    return
+                error = (
+                    asyncio.CancelledError(
+                        f"Recovery of {persistence_id} was cancelled"
+                    )
+                    if task.cancelled()
+                    else task.exception()
+                )
+                context.self.receive_signal(RecoveryCompleted(error))
+
+            recovery.add_done_callback(_recovered)
+
+            def _recovering(context: "ActorContext[U]", msg: U | Signal) -> Behavior[U]:
+                if not isinstance(msg, RecoveryCompleted):
+                    stash.stash(msg)
+                    return Behaviors.same
+                if msg.error is not None:
+                    context.log(
+                        f"Recovery of {persistence_id} failed: [exception={msg.error.__class__.__name__},message={msg.error}]",
+                        LoggerLevel.ERROR,
+                    )
+                    return Behaviors.stop
+                context.log(
+                    f"Recovered {persistence_id} at sequence number {persistence.sequence_nr}."
+                )
+                return stash.unstash_all(factory(context, persistence))
+
+            return Behavior.from_receive(_recovering)
+
+        return Behavior.from_apply(_setup)
+
     @staticmethod
     def supervise(
         behavior: Behavior[U],
         on_failure: "Callable[[ActorContext, Exception], Behavior[U]]",
         except_type: type[Exception] | tuple[type[Exception], ...] = Exception,
     ) -> Behavior[U]:
+        def _on_failure(context: "ActorContext[U]", e: Exception) -> Behavior[U]:
+            context.log(
+                f"Supervised actor failed: [exception={e.__class__.__name__},message={e}]",
+                LoggerLevel.ERROR,
+            )
+            return on_failure(context, e)
+
         def _on_receive(context: "ActorContext[U]", msg: U | Signal) -> Behavior[U]:
             try:
                 return behavior.on_receive(context, msg)
             except except_type as e:
-                context.log(
-                    f"Supervised actor failed: [exception={e.__class__.__name__},message={e}]",
-                    LoggerLevel.ERROR,
-                )
-                return on_failure(context, e)
+                return _on_failure(context, e)
+
+        on_receive_async = behavior.on_receive_async
+        if on_receive_async is not None:
+
+            async def _supervised(
+                context: "ActorContext[U]", awaitable: Awaitable[None]
+            ) -> None:
+                try:
+                    await awaitable
+                except except_type as e:
+                    # later messages may already be running, so the returned behavior is
+                    # not applied to async handlers
+                    _on_failure(context, e)
+
+            def _on_receive_async(
+                context: "ActorContext[U]", msg: U | Signal
+            ) -> Awaitable[None] | None:
+                awaitable = on_receive_async(context, msg)
+                if awaitable is None:
+                    return None
+                return _supervised(context, awaitable)
+
+            return Behavior(
+                on_receive=_on_receive,
+                on_receive_async=_on_receive_async,
+                concurrency=behavior.concurrency,
+            )
 
-        return Behavior.from_receive(_on_receive)
+        on_receive_batch = behavior.on_receive_batch
+        if on_receive_batch is None:
+            return Behavior.from_receive(_on_receive)
+
+        def _on_receive_batch(
+            context: "ActorContext[U]", messages: Sequence[U | Signal]
+        ) -> Behavior[U]:
+            try:
+                return on_receive_batch(context, messages)
+            except except_type as e:
+                return _on_failure(context, e)
+
+        return Behavior(on_receive=_on_receive, on_receive_batch=_on_receive_batch)
 
     same = object()
     stop = object()
+
+
+class _TypedDispatch:
+    def __init__(
+        self,
+        handlers: "Mapping[type, Callable[[ActorContext[Any], Any], Any]]",
+        on_signal: "Callable[[ActorContext[Any], Signal], Any] | None",
+        otherwise: "Callable[[ActorContext[Any], Any], Any] | None",
+    ) -> None:
+        self._handlers = dict(handlers)
+        self._on_signal = on_signal or _ignore
+        self._otherwise = otherwise or _ignore
+        # handler per class of received messages, filled on first use
+        self._cache = dict[type, "Callable[[ActorContext[Any], Any], Any]"](handlers)
+
+    def __call__(self, context: "ActorContext[Any]", msg: Any) -> Any:
+        handler = self._cache.get(msg.__class__)
+        if handler is None:
+            handler = self._resolve(msg.__class__)
+        return handler(context, msg)
+
+    def _resolve(self, cls: type) -> "Callable[[ActorContext[Any], Any], Any]":
+        for base in cls.__mro__:
+            handler = self._handlers.get(base)
+            if handler is not None:
+                break
+        else:
+            handler = self._on_signal if issubclass(cls, Signal) else self._otherwise
+        self._cache[cls] = handler
+        return handler
+
+
+def _ignore(context: "ActorContext[Any]", msg: Any) -> Any:
+    return Behaviors.same
+
+
+def _receive_message(
+    on_receive: "Callable[[ActorContext[Any], Any], Any]",
+    context: "ActorContext[Any]",
+    msg: Any,
+) -> Any:
+    if isinstance(msg, Signal):
+        return Behaviors.same
+    return on_receive(context, msg)
+
+
+def _receive_signal(
+    on_receive: "Callable[[ActorContext[Any], Signal], Any]",
+    context: "ActorContext[Any]",
+    msg: Any,
+) -> Any:
+    if isinstance(msg, Signal):
+        return on_receive(context, msg)
+    return Behaviors.same
+
+
+def _receive_batch(
+    on_receive: "Callable[[ActorContext[Any], list[Any]], Any]",
+    context: "ActorContext[Any]",
+    messages: Sequence[Any],
+) -> Any:
+    batch = [msg for msg in messages if not isinstance(msg, Signal)]
+    if len(batch) == 0:
+        return Behaviors.same
+    return on_receive(context, batch)
+
+
+def _receive_one_as_batch(
+    on_receive: "Callable[[ActorContext[Any], list[Any]], Any]",
+    context: "ActorContext[Any]",
+    msg: Any,
+) -> Any:
+    return _receive_batch(on_receive, context, [msg])
+
+
+def _receive_async(
+    on_receive: "Callable[[ActorContext[Any], Any], Awaitable[None]]",
+    context: "ActorContext[Any]",
+    msg: Any,
+) -> Awaitable[None] | None:
+    if isinstance(msg, Signal):
+        return None
+    return on_receive(context, msg)
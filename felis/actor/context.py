@@ -1,14 +1,18 @@
-from typing import TYPE_CHECKING, Any, Callable, Generic, Iterable, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Generic, Iterable, Sequence, TypeVar
+from concurrent.futures import Future as ConcurrentFuture
 import asyncio
 
 from .signals import Terminated
-from .future import Future
-from .actor import Actor, ActorRef
+from .future import Future, Replies
+from .actor import Actor, ActorRef, DEFAULT_BATCH_SIZE
+from .mailbox import MailboxSpec
 from ..utils import Logger, LoggerLevel
 
 if TYPE_CHECKING:
     from .system import ActorSystem
     from .behavior import Behavior
+    from .dispatcher import Dispatcher
+    from .placement import Placement
 
 T = TypeVar("T")
 U = TypeVar("U")
@@ -21,13 +25,30 @@ class ActorContext(Generic[T]):
         behavior: "Behavior[T]",
         system: "ActorSystem[Any]",
         parent: "ActorContext[Any] | None",
+        mailbox: MailboxSpec | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        metrics: bool | None = None,
+        dispatcher: "Dispatcher | None" = None,
+        placement: "Placement | None" = None,
     ) -> None:
-        actor = Actor(name, behavior, self)
+        if metrics is None:
+            metrics = system.metrics_enabled
+        self._loop = (placement or system.placement).select(system, parent)
+        actor = Actor(
+            name, behavior, self, mailbox, batch_size, metrics, dispatcher, self._loop
+        )
         self._self = ActorRef(actor, parent)
         self._children = dict[str, ActorContext[Any]]()
         self._system = system
-        self._task = asyncio.create_task(actor._start())
-        self._loop = asyncio.get_event_loop()
+        self._task: asyncio.Task[None] | ConcurrentFuture[None]
+        if self._loop is asyncio.get_running_loop():
+            self._task = self._loop.create_task(actor._start())
+        else:
+            self._task = asyncio.run_coroutine_threadsafe(actor._start(), self._loop)
+        if dispatcher is not None:
+            dispatcher.attach()
+            # also runs for actors cancelled before they started
+            self._task.add_done_callback(lambda _: dispatcher.detach())
 
     @classmethod
     def of(
@@ -36,23 +57,68 @@ class ActorContext(Generic[T]):
         behavior: "Behavior[T]",
         system: "ActorSystem[Any]",
         parent: "ActorContext[Any] | None" = None,
+        mailbox: MailboxSpec | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        metrics: bool | None = None,
+        dispatcher: "Dispatcher | None" = None,
+        placement: "Placement | None" = None,
     ) -> "ActorContext[T]":
-        return cls(name, behavior, system, parent)
+        return cls(
+            name,
+            behavior,
+            system,
+            parent,
+            mailbox,
+            batch_size,
+            metrics,
+            dispatcher,
+            placement,
+        )
 
-    def spawn(self, behavior: "Behavior[U]", name: str) -> ActorRef[U]:
+    def spawn(
+        self,
+        behavior: "Behavior[U]",
+        name: str,
+        mailbox: MailboxSpec | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        metrics: bool | None = None,
+        dispatcher: "Dispatcher | None" = None,
+        placement: "Placement | None" = None,
+    ) -> ActorRef[U]:
+        """
+        Spawns a child actor. `batch_size` is the maximum number of ready messages the
+        actor drains from its mailbox per wakeup before yielding to other actors.
+        `metrics` overrides whether the actor collects runtime metrics, which defaults to
+        the setting of the actor system. `dispatcher` decides where the handlers of the
+        actor run, see `Dispatchers`; the returned ref is the same for every dispatcher.
+        Actors with async handlers raise `TypeError` with a dispatcher other than the loop.
+        `placement` selects the event loop of the actor and defaults to the placement of
+        the actor system, see `Placements`.
+        """
         if name in self._children:
             self.log(f"Actor {name} already exists, ignoring.", LoggerLevel.ERROR)
-        context = ActorContext(name, behavior, self._system, self)
+        context = ActorContext(
+            name,
+            behavior,
+            self._system,
+            self,
+            mailbox,
+            batch_size,
+            metrics,
+            dispatcher,
+            placement,
+        )
         actor_ref = context.self
         self._children[name] = context
+        context._task.add_done_callback(lambda _: self._remove_child(name, context))
         self.log(f"Spawned actor {name} at {actor_ref.path}.")
         return actor_ref
 
     def stop(self, actor: ActorRef[Any]) -> None:
-        if self._children.get(actor.name) != actor:
+        if self.get_child(actor.name) != actor:
             self.log(f"Actor {actor.path} doesn't exist, ignoring.", LoggerLevel.ERROR)
-        context = self._children[actor.name]
-        context._task.cancel()
+            return
+        self._children[actor.name]._cancel()
 
     @property
     def self(self) -> ActorRef[T]:
@@ -79,27 +145,85 @@ class ActorContext(Generic[T]):
         on_error: Callable[[Exception], Any] | None = None,
         timeout: float = 5.0,
     ) -> Future:
-        loop = asyncio.get_event_loop()
-        future = Future.of(loop, timeout).then(on_result).catch(on_error)
-        message = message_func(future)
-        actor.tell(message)
+        """
+        Sends the message made by `message_func` from a new `Future`, which the receiver
+        completes. The future fails with `asyncio.TimeoutError` after `timeout` seconds.
+        """
+        future = Future(loop=self._loop, timeout=timeout)
+        if on_result is not None:
+            future.then(on_result)
+        if on_error is not None:
+            future.catch(on_error)
+        actor.tell(message_func(future))
         return future
 
+    def ask_many(
+        self,
+        actors: Iterable[ActorRef[U]],
+        message_func: Callable[[Future], U],
+        timeout: float = 5.0,
+    ) -> Replies:
+        """
+        Asks every actor in `actors` at once, with a single timeout for all of them. See
+        `Replies` for collecting the replies, including partial failures.
+        """
+        refs: Sequence[ActorRef[U]] = list(actors)
+        futures = list[Future]()
+        for actor in refs:
+            future = Future(loop=self._loop)
+            futures.append(future)
+            try:
+                actor.tell(message_func(future))
+            except Exception as e:
+                future.set_exception(e)
+        return Replies(refs, futures, timeout)
+
     async def wait(self) -> None:
         await asyncio.gather(*map(lambda f: f.wait(), self._children.values()))
-        await self._task
+        await self._stopped()
+
+    async def _stopped(self) -> None:
+        """Waits until this actor stopped, from any loop."""
+        task = self._task
+        if isinstance(task, ConcurrentFuture):
+            # the actor runs on another loop
+            await _stopped(asyncio.wrap_future(task))
+        elif task.get_loop() is not asyncio.get_running_loop():
+            # the actor was spawned by a parent on another loop
+            await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(_stopped(task), task.get_loop())
+            )
+        else:
+            await _stopped(task)
+
+    def _cancel(self) -> None:
+        """Cancels the task of this actor, from any thread."""
+        task = self._task
+        if isinstance(task, asyncio.Task) and task.get_loop() is not _running_loop():
+            task.get_loop().call_soon_threadsafe(task.cancel)
+        else:
+            task.cancel()
 
     @property
     def loop(self) -> asyncio.AbstractEventLoop:
         return self._loop
 
     def watch(self, actor: ActorRef[Any]) -> None:
-        if self.get_child(actor.name) != actor:
-            raise ValueError("Actor is not a child of this actor")
-        context = self._children[actor.name]
-        context._task.add_done_callback(
-            lambda _: self.self.receive_signal(Terminated(actor))
-        )
+        """
+        Sends `Terminated(actor)` to this actor when `actor` stops, or right away if it has
+        already stopped. Any actor of this system can be watched, not only children.
+        """
+        context = actor.ref._context
+        context._task.add_done_callback(lambda _: self._on_terminated(actor))
+
+    def _remove_child(self, name: str, context: "ActorContext[Any]") -> None:
+        if self._children.get(name) is context:
+            del self._children[name]
+
+    def _on_terminated(self, actor: ActorRef[Any]) -> None:
+        # the watcher may stop first, e.g. children are cancelled along with their parent
+        if self.self.ref.is_alive:
+            self.self.receive_signal(Terminated(actor))
 
     def log(self, msg: str, level: LoggerLevel = LoggerLevel.INFO) -> None:
         msg = f"{self.self}: {msg}"
@@ -117,3 +241,17 @@ class ActorContext(Generic[T]):
             assert False, "Critical error, exiting."
         else:
             raise ValueError("Invalid log level")
+
+
+async def _stopped(task: "asyncio.Future[None]") -> None:
+    # a cancelled actor counts as stopped, failures are raised
+    await asyncio.wait([task])
+    if not task.cancelled():
+        task.result()
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
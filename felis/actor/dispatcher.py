@@ -0,0 +1,181 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+
+from . import actor as _actor
+from .behavior import Behaviors
+from ..utils import LoggerLevel
+
+if TYPE_CHECKING:
+    from .context import ActorContext
+
+
+class Dispatcher(ABC):
+    """
+    Dispatcher decides where the synchronous handlers of an actor run. The mailbox and the
+    behavior transitions of the actor always stay on its event loop. Async handlers always
+    run on the loop, so actors with them can't have a dispatcher other than the loop.
+    """
+
+    # inline dispatchers run handlers on the loop, so actors call them directly
+    inline = False
+
+    @abstractmethod
+    async def invoke(
+        self,
+        handler: "Callable[[ActorContext[Any], Any], Any]",
+        context: "ActorContext[Any]",
+        message: Any,
+    ) -> Any:
+        raise NotImplementedError()
+
+    def attach(self) -> None:
+        """Called for every actor spawned with this dispatcher."""
+        pass
+
+    def detach(self) -> None:
+        """Called once an actor spawned with this dispatcher stopped."""
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+class LoopDispatcher(Dispatcher):
+    """Runs handlers directly on the event loop of the actor."""
+
+    inline = True
+
+    async def invoke(
+        self,
+        handler: "Callable[[ActorContext[Any], Any], Any]",
+        context: "ActorContext[Any]",
+        message: Any,
+    ) -> Any:
+        return handler(context, message)
+
+
+class ExecutorDispatcher(Dispatcher):
+    """
+    Runs handlers on an executor, which is shut down once the last actor spawned with the
+    dispatcher stopped; actors spawned later need a new dispatcher.
+    """
+
+    def __init__(self, executor: Executor) -> None:
+        self._executor = executor
+        # actors may stop on different loops
+        self._lock = threading.Lock()
+        self._actors = 0
+
+    def attach(self) -> None:
+        with self._lock:
+            self._actors += 1
+
+    def detach(self) -> None:
+        with self._lock:
+            self._actors -= 1
+            last = self._actors == 0
+        if last:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ThreadDispatcher(ExecutorDispatcher):
+    """
+    Runs handlers on a thread pool, for actors doing blocking I/O. Each actor still handles
+    one message at a time. Handlers may tell other actors and log from the pool, but must
+    not spawn or ask there.
+    """
+
+    def __init__(self, workers: int) -> None:
+        super().__init__(
+            ThreadPoolExecutor(workers, thread_name_prefix="felis-dispatcher")
+        )
+
+    async def invoke(
+        self,
+        handler: "Callable[[ActorContext[Any], Any], Any]",
+        context: "ActorContext[Any]",
+        message: Any,
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, handler, context, message)
+
+
+class ProcessDispatcher(ExecutorDispatcher):
+    """
+    Runs handlers on a process pool, for CPU bound work. The handler and the message are
+    pickled, so the handler has to be a module level function passed to
+    `Behaviors.receive_message`, `Behaviors.receive_signal` or `Behaviors.receive_batch`.
+    In the worker the handler gets a `ProcessContext` and refs are replaced by path
+    proxies; tells and logs are replayed on the event loop after the handler returns.
+    The handler must return `Behaviors.same` or `Behaviors.stop`.
+    """
+
+    def __init__(self, workers: int | None) -> None:
+        super().__init__(
+            ProcessPoolExecutor(workers, initializer=_actor.enter_worker_process)
+        )
+
+    async def invoke(
+        self,
+        handler: "Callable[[ActorContext[Any], Any], Any]",
+        context: "ActorContext[Any]",
+        message: Any,
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        stop, outbox, logs = await loop.run_in_executor(
+            self._executor, _run_in_process, handler, context.self.path, message
+        )
+        for ref, outgoing in outbox:
+            ref.tell(outgoing)
+        for line, level in logs:
+            context.log(line, level)
+        return Behaviors.stop if stop else Behaviors.same
+
+
+class ProcessContext:
+    """Stand-in for `ActorContext` inside a process dispatcher worker."""
+
+    def __init__(self, path: str) -> None:
+        self.self = _actor.ActorPathRef(path)
+        self.outbox = list[tuple[_actor.ActorPathRef, Any]]()
+        self.logs = list[tuple[str, LoggerLevel]]()
+
+    def log(self, msg: str, level: LoggerLevel = LoggerLevel.INFO) -> None:
+        self.logs.append((msg, level))
+
+
+def _run_in_process(
+    handler: "Callable[[ProcessContext, Any], Any]", path: str, message: Any
+) -> tuple[bool, list[tuple[Any, Any]], list[tuple[str, LoggerLevel]]]:
+    context = ProcessContext(path)
+    _actor.worker_outbox = context.outbox
+    try:
+        result = handler(context, message)
+    finally:
+        _actor.worker_outbox = None
+    if result is not Behaviors.same and result is not Behaviors.stop:
+        raise TypeError("Handlers on a process dispatcher must return same or stop")
+    return result is Behaviors.stop, context.outbox, context.logs
+
+
+class Dispatchers:
+    _loop = LoopDispatcher()
+
+    @classmethod
+    def loop(cls) -> Dispatcher:
+        return cls._loop
+
+    @staticmethod
+    def thread(workers: int = 1) -> Dispatcher:
+        return ThreadDispatcher(workers)
+
+    @staticmethod
+    def process(workers: int | None = None) -> Dispatcher:
+        """A process pool with `workers` processes, one per core by default."""
+        return ProcessDispatcher(workers)
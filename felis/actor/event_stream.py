@@ -0,0 +1,140 @@
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+from .actor import ActorRef
+from ..utils import Logger
+
+E = TypeVar("E")
+
+
+@dataclass(frozen=True)
+class Subscription(Generic[E]):
+    subscriber: ActorRef[Any]
+    channel: type[E] | str
+    predicate: Callable[[E], bool] | None = None
+    adapter: Callable[[E], Any] | None = None
+
+    def deliver(self, event: E) -> bool:
+        if self.predicate is not None and not self.predicate(event):
+            return False
+        self.subscriber.tell(event if self.adapter is None else self.adapter(event))
+        return True
+
+
+class EventStream:
+    """
+    EventStream: publish/subscribe for the events of an actor system. Actors subscribe to
+    an event class, which also matches its subclasses, or to a topic that publishers pass
+    along with events, optionally with a predicate and an adapter that wraps events into
+    messages of the subscriber. Subscriptions are indexed by class and topic, so
+    publishing only looks at the subscriptions that match. Predicates and adapters run on
+    the thread of the publisher and should be cheap. Subscriptions of local actors are
+    removed when the actor stops, and those of actors on other nodes when the node leaves.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._channels = dict[type | str, dict[Hashable, Subscription[Any]]]()
+        # copy-on-write views for publishers: the subscriptions per topic and per event
+        # class, including the ones of its base classes
+        self._resolved = dict[type | str, tuple[Subscription[Any], ...]]()
+        self._watched = set[ActorRef[Any]]()
+
+    def subscribe(
+        self,
+        subscriber: ActorRef[Any],
+        channel: type[E] | str,
+        predicate: Callable[[E], bool] | None = None,
+        adapter: Callable[[E], Any] | None = None,
+    ) -> None:
+        """Subscribes `subscriber` to `channel`, replacing its previous subscription to it."""
+        subscription = Subscription(subscriber, channel, predicate, adapter)
+        with self._lock:
+            self._channels.setdefault(channel, {})[subscriber] = subscription
+            self._invalidate(channel)
+            watch = subscriber not in self._watched
+            self._watched.add(subscriber)
+        actor = getattr(subscriber, "ref", None)
+        if watch and actor is not None:
+            # refs to actors on other nodes can't be watched and stay until unsubscribed
+            actor._context._task.add_done_callback(
+                lambda _: self.unsubscribe(subscriber)
+            )
+
+    def unsubscribe(
+        self, subscriber: ActorRef[Any], channel: type | str | None = None
+    ) -> None:
+        """Removes the subscription of `subscriber` to `channel`, or all of them."""
+        with self._lock:
+            channels = list(self._channels) if channel is None else [channel]
+            for key in channels:
+                subscriptions = self._channels.get(key)
+                if subscriptions is None or subscriptions.pop(subscriber, None) is None:
+                    continue
+                if len(subscriptions) == 0:
+                    del self._channels[key]
+                self._invalidate(key)
+            if channel is None:
+                self._watched.discard(subscriber)
+
+    def unsubscribe_node(self, node: str) -> None:
+        """Removes the subscriptions of the actors on the remote `node`."""
+        with self._lock:
+            subscribers = [
+                subscriber
+                for subscriber in self._watched
+                if getattr(subscriber, "node", None) == node
+            ]
+        for subscriber in subscribers:
+            self.unsubscribe(subscriber)
+
+    def publish(self, event: Any, topic: str | None = None) -> int:
+        """
+        Publishes `event` to the subscribers of its class and of `topic`. Returns the number
+        of deliveries.
+        """
+        delivered = 0
+        for channel in (type(event), topic):
+            if channel is None:
+                continue
+            subscriptions = self._resolved.get(channel)
+            if subscriptions is None:
+                subscriptions = self._resolve(channel)
+            for subscription in subscriptions:
+                delivered += self._deliver(subscription, event)
+        return delivered
+
+    def _deliver(self, subscription: Subscription[Any], event: Any) -> bool:
+        try:
+            return subscription.deliver(event)
+        except RuntimeError:
+            # the subscriber stopped, its subscriptions are being removed
+            return False
+        except Exception as e:
+            Logger.instance.error(
+                f"Event delivery to {subscription.subscriber} failed: [exception={e.__class__.__name__},message={e}]"
+            )
+            return False
+
+    def _resolve(self, channel: type | str) -> tuple[Subscription[Any], ...]:
+        with self._lock:
+            bases = (channel,) if isinstance(channel, str) else channel.__mro__
+            subscriptions = tuple(
+                subscription
+                for base in bases
+                for subscription in self._channels.get(base, {}).values()
+            )
+            self._resolved[channel] = subscriptions
+        return subscriptions
+
+    def _invalidate(self, channel: type | str) -> None:
+        if isinstance(channel, str):
+            self._resolved.pop(channel, None)
+            return
+        for cls in [
+            cls
+            for cls in self._resolved
+            if isinstance(cls, type) and issubclass(cls, channel)
+        ]:
+            del self._resolved[cls]
@@ -1,70 +1,197 @@
 import asyncio
-from typing import Callable, Generic, TypeVar
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Generator, Generic, Sequence, TypeVar
 from typing_extensions import Self
 
-from ..utils import Logger
+from .timers import TimingWheel, WheelTimer
 
 T = TypeVar("T")
 
 
-class Future(Generic[T]):
-    def __init__(self, future: asyncio.Future, timeout: float) -> None:
-        self._future = future
-        self._done_callbacks: list[Callable[[T], None]] = []
-        self._error_callbacks: list[Callable[[Exception], None]] = []
-        if timeout > 0:
-            self._timeout = future.get_loop().call_later(timeout, lambda: self.cancel())
+class Future(asyncio.Future, Generic[T]):
+    """
+    Future: the reply of an ask. It is an `asyncio.Future` that can be completed from any
+    thread, ignores completions after the first one, and fails with `asyncio.TimeoutError`
+    after `timeout` seconds. Timeouts are tracked by the timing wheel of the loop.
+    """
+
+    def __init__(
+        self, *, loop: asyncio.AbstractEventLoop, timeout: float = 0.0
+    ) -> None:
+        super().__init__(loop=loop)
+        self._timer: WheelTimer | None = None
+        if timeout <= 0:
+            return
+        if _on_loop(loop):
+            self._arm(timeout)
         else:
-            self._timeout = None
-        self._future.add_done_callback(lambda _: self.on_done())
+            # the wheel belongs to the loop of the future, like its callbacks
+            loop.call_soon_threadsafe(self._arm, timeout)
 
     @classmethod
     def of(cls, loop: asyncio.AbstractEventLoop, timeout: float) -> Self:
-        future = loop.create_future()
-        return cls.from_future(future, timeout)
+        return cls(loop=loop, timeout=timeout)
 
     @classmethod
     def from_future(cls, future: asyncio.Future, timeout: float) -> Self:
-        return cls(future, timeout)
+        """A `Future` completed with the outcome of `future`."""
+        result = cls(loop=future.get_loop(), timeout=timeout)
+        future.add_done_callback(result._copy)
+        return result
 
     def set_result(self, result: T) -> None:
-        if self._future.done():
+        if not _on_loop(self.get_loop()):
+            # the future is completed by an actor on another loop
+            self.get_loop().call_soon_threadsafe(self.set_result, result)
+            return
+        if self.done():
             return
-        self._future.set_result(result)
-        if self._timeout is not None:
-            self._timeout.cancel()
+        super().set_result(result)
+        if self._timer is not None:
+            self._timer.cancel()
 
-    def set_exception(self, exception: Exception) -> None:
-        if self._future.done():
+    def set_exception(self, exception: BaseException) -> None:
+        if not _on_loop(self.get_loop()):
+            self.get_loop().call_soon_threadsafe(self.set_exception, exception)
             return
-        self._future.set_exception(exception)
-        if self._timeout is not None:
-            self._timeout.cancel()
-
-    def on_done(self):
-        try:
-            result = self._future.result()
-        except asyncio.CancelledError as e:
-            Logger.instance.error(f"Future cancelled: {e}")
-        except Exception as e:
-            for callback in self._error_callbacks:
-                callback(e)
-        else:
-            for callback in self._done_callbacks:
-                callback(result)
+        if self.done():
+            return
+        super().set_exception(exception)
+        if self._timer is not None:
+            self._timer.cancel()
 
-    def then(self, callback: Callable[[T], None] | None) -> Self:
+    def then(self, callback: Callable[[T], Any] | None) -> Self:
         if callback is not None:
-            self._done_callbacks.append(callback)
+            self.add_done_callback(partial(_on_result, callback))
         return self
 
-    def catch(self, callback: Callable[[Exception], None] | None) -> Self:
+    def catch(self, callback: Callable[[BaseException], Any] | None) -> Self:
         if callback is not None:
-            self._error_callbacks.append(callback)
+            self.add_done_callback(partial(_on_error, callback))
         return self
 
-    def cancel(self):
-        self.set_exception(asyncio.TimeoutError())
+    def _arm(self, timeout: float) -> None:
+        if not self.done():
+            self._timer = TimingWheel.of(self.get_loop()).schedule(
+                timeout, self._expire
+            )
+
+    def _expire(self) -> None:
+        if self.done():
+            return
+        super().set_exception(asyncio.TimeoutError())
+        # timeouts are routine, so don't warn if nobody looks at them
+        self._log_traceback = False
+
+    def _copy(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            self.cancel()
+        elif future.exception() is not None:
+            self.set_exception(future.exception())  # type: ignore
+        else:
+            self.set_result(future.result())
+
+
+def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def _on_result(callback: Callable[[Any], Any], future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        callback(future.result())
+
+
+def _on_error(callback: Callable[[BaseException], Any], future: asyncio.Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        callback(future.exception())  # type: ignore
+
+
+@dataclass
+class Reply(Generic[T]):
+    """The outcome of asking `ref`, either a result or an error."""
+
+    ref: Any
+    result: T | None = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Replies(Generic[T]):
+    """
+    Replies: the outcome of `ActorContext.ask_many`. Await it for the replies of all refs
+    in order, or iterate it with `async for` to get them as they arrive. Failures, such as
+    timeouts, are replies with `error` set, so one failed ask doesn't hide the others.
+    All asks share a single timeout.
+    """
+
+    def __init__(
+        self, refs: Sequence[Any], futures: Sequence[Future[T]], timeout: float
+    ) -> None:
+        self._refs = refs
+        self._futures = futures
+        self._arrived = deque[int]()
+        self._completed = 0
+        self._waiter: asyncio.Future[None] | None = None
+        self._timer: WheelTimer | None = None
+        if len(futures) == 0:
+            return
+        loop = futures[0].get_loop()
+        if timeout > 0:
+            if _on_loop(loop):
+                self._arm(timeout)
+            else:
+                loop.call_soon_threadsafe(self._arm, timeout)
+        for index, future in enumerate(futures):
+            future.add_done_callback(lambda _, index=index: self._on_done(index))
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def reply(self, index: int) -> Reply[T]:
+        ref, future = self._refs[index], self._futures[index]
+        if future.cancelled():
+            return Reply(ref, error=asyncio.CancelledError())
+        error = future.exception()
+        if error is not None:
+            return Reply(ref, error=error)
+        return Reply(ref, future.result())
+
+    def __await__(self) -> Generator[Any, None, list[Reply[T]]]:
+        return self._all().__await__()
+
+    async def _all(self) -> list[Reply[T]]:
+        if len(self._futures) > 0:
+            await asyncio.wait(self._futures)
+        return [self.reply(index) for index in range(len(self._futures))]
+
+    async def __aiter__(self) -> AsyncIterator[Reply[T]]:
+        for _ in range(len(self._futures)):
+            while len(self._arrived) == 0:
+                self._waiter = self._futures[0].get_loop().create_future()
+                await self._waiter
+            yield self.reply(self._arrived.popleft())
+
+    def _on_done(self, index: int) -> None:
+        self._arrived.append(index)
+        self._completed += 1
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+        if self._timer is not None and self._completed == len(self._futures):
+            self._timer.cancel()
+
+    def _arm(self, timeout: float) -> None:
+        if self._completed < len(self._futures):
+            loop = self._futures[0].get_loop()
+            self._timer = TimingWheel.of(loop).schedule(timeout, self._expire)
 
-    def __await__(self):
-        return self._future.__await__()
+    def _expire(self) -> None:
+        for future in self._futures:
+            future._expire()
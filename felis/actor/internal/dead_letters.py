@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import Any
+
+from ..context import ActorContext
+from ..behavior import Behavior, Behaviors
+from ..actor import ActorRef
+from ...utils import LoggerLevel
+
+
+@dataclass
+class DeadLetter:
+    message: Any
+    recipient: ActorRef[Any]
+
+
+class DeadLetters:
+    """Sink for messages rejected by full mailboxes or sent to actors that stopped."""
+
+    @classmethod
+    def apply(cls) -> Behavior[DeadLetter]:
+        return Behaviors.receive_message(cls.on_message)
+
+    @classmethod
+    def on_message(
+        cls, context: ActorContext[DeadLetter], message: DeadLetter
+    ) -> Behavior[DeadLetter]:
+        context.log(
+            f"Dead letter to {message.recipient.path}: {message.message}",
+            LoggerLevel.DEBUG,
+        )
+        return Behavior[DeadLetter].same
@@ -1,22 +1,33 @@
 from typing import Generic, Type, TypeVar
 
-from ...actor import ActorRef, ActorContext, Behavior, Behaviors, Signal
-from .receptionist import ServiceKey, ListingResponse, ReceptionistRequest
+from ...actor import ActorContext, Behavior, Behaviors, Signal
+from .receptionist import ServiceKey, Listing, ListingResponse, ListingUpdate
+from .receptionist import ReceptionistRequest
+from ..stash import DEFAULT_STASH_CAPACITY, StashBuffer
 
 T = TypeVar("T")
 
 
 class GroupForwarder(Generic[T]):
-    def __init__(self, key: ServiceKey[T]) -> None:
+    """
+    GroupForwarder: forwards every message to all actors registered with a service key.
+    Messages received while no actor is registered are stashed, up to `stash_capacity`.
+    """
+
+    def __init__(self, key: ServiceKey[T], stash_capacity: int) -> None:
         self._key = key
-        self._workers: list[ActorRef[T]] = []
+        self._stash_capacity = stash_capacity
+        self._workers = Listing[T]()
 
     def apply(self) -> Behavior[T | ListingResponse[T]]:
-        return Behaviors.setup(self.setup)
+        return Behaviors.with_stash(self._stash_capacity, self.setup)
 
     def setup(
-        self, context: ActorContext[T | ListingResponse[T]]
+        self,
+        context: ActorContext[T | ListingResponse[T]],
+        stash: StashBuffer[T | ListingResponse[T]],
     ) -> Behavior[T | ListingResponse[T]]:
+        self._stash = stash
         context.system.receptionist.tell(
             ReceptionistRequest.subscribe(self._key, context.self)  # type: ignore
         )
@@ -25,10 +36,16 @@ class GroupForwarder(Generic[T]):
     def on_receive(
         self,
         context: ActorContext[T | ListingResponse[T]],
-        message: T | ListingResponse[T] | Signal,
+        message: T | ListingResponse[T] | ListingUpdate[T] | Signal,
     ) -> Behavior[T | ListingResponse[T]]:
-        if isinstance(message, ListingResponse):
-            self._workers = list(message.actors)
+        if isinstance(message, (ListingResponse, ListingUpdate)):
+            self._workers.apply(message)
+            if len(self._workers) > 0:
+                return self._stash.unstash_all(Behavior[T | ListingResponse[T]].same)
+            return Behavior[T | ListingResponse[T]].same
+
+        if len(self._workers) == 0:
+            self._stash.stash(message)
             return Behavior[T | ListingResponse[T]].same
 
         if isinstance(message, Signal):
@@ -42,5 +59,7 @@ class GroupForwarder(Generic[T]):
 
 class Forwarders:
     @staticmethod
-    def group(key: ServiceKey[T]) -> GroupForwarder[T]:
-        return GroupForwarder(key)
+    def group(
+        key: ServiceKey[T], stash_capacity: int = DEFAULT_STASH_CAPACITY
+    ) -> GroupForwarder[T]:
+        return GroupForwarder(key, stash_capacity)
@@ -1,19 +1,44 @@
 from dataclasses import dataclass
-from typing import Callable, TypeVar, Generic
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+    TypeVar,
+    Generic,
+    overload,
+)
 
 from ..context import ActorContext
 from ..behavior import Behavior, Behaviors
 from ..actor import ActorRef
+from ..signals import Signal, Terminated
 
 T = TypeVar("T")
 U = TypeVar("U")
 
 
 class ServiceKey(Generic[T]):
-    def __init__(self) -> None:
-        self.key = object()
+    """
+    ServiceKey: a key to register actors with. Anonymous keys are only known to the actor
+    system they were created in, while named keys are equal by name and shared across
+    nodes by remoting.
+    """
+
+    def __init__(self, name: str | None = None) -> None:
+        self.name = name
+        self.key = object() if name is None else name
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ServiceKey) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
 
     def __repr__(self) -> str:
+        if self.name is not None:
+            return f"ServiceKey[{self.name}]"
         return f"ServiceKey[{id(self.key)}]"
 
 
@@ -25,6 +50,83 @@ class ListingResponse(Generic[T]):
         return len(self.actors)
 
 
+class ListingUpdate(Generic[T]):
+    """
+    ListingUpdate: the actors added to and removed from a service key, sent to subscribers
+    after the `ListingResponse` they get when subscribing.
+    """
+
+    def __init__(
+        self, added: Sequence[ActorRef[T]], removed: Sequence[ActorRef[T]]
+    ) -> None:
+        self.added = added
+        self.removed = removed
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed)
+
+
+class Listing(Sequence[ActorRef[T]]):
+    """
+    Listing: the actors registered with a service key as seen by a subscriber. Applying a
+    `ListingResponse` replaces the listing; applying a `ListingUpdate` costs O(changes) but
+    doesn't keep the order of the actors. `version` changes whenever the listing does.
+    """
+
+    def __init__(self) -> None:
+        self._actors: list[ActorRef[T]] = []
+        self._index = dict[ActorRef[T], int]()
+        self.version = 0
+
+    def apply(self, message: ListingResponse[T] | ListingUpdate[T]) -> None:
+        self.version += 1
+        if isinstance(message, ListingResponse):
+            self._actors = []
+            self._index.clear()
+            for actor in message.actors:
+                self._add(actor)
+            return
+        for actor in message.removed:
+            self._remove(actor)
+        for actor in message.added:
+            self._add(actor)
+
+    def _add(self, actor: ActorRef[T]) -> None:
+        if actor not in self._index:
+            self._index[actor] = len(self._actors)
+            self._actors.append(actor)
+
+    def _remove(self, actor: ActorRef[T]) -> None:
+        index = self._index.pop(actor, None)
+        if index is None:
+            return
+        # move the last actor into the gap
+        last = self._actors.pop()
+        if index < len(self._actors):
+            self._actors[index] = last
+            self._index[last] = index
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+    @overload
+    def __getitem__(self, index: int) -> ActorRef[T]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[ActorRef[T]]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        return self._actors[index]
+
+    def __iter__(self) -> Iterator[ActorRef[T]]:
+        return iter(self._actors)
+
+    def __contains__(self, actor: object) -> bool:
+        return actor in self._index
+
+
 class ReceptionistRequest:
     @staticmethod
     def register(key: ServiceKey[T], actor: ActorRef[T]) -> "Register[T]":
@@ -44,8 +146,12 @@ class ReceptionistRequest:
 
     @staticmethod
     def subscribe(
-        key: ServiceKey[T], actor: ActorRef[ListingResponse[T]]
+        key: ServiceKey[T], actor: ActorRef[ListingResponse[T] | ListingUpdate[T]]
     ) -> "Subscribe[T]":
+        """
+        Subscribes `actor` to `key`. It gets the current `ListingResponse` right away and a
+        `ListingUpdate` after every change.
+        """
         return Subscribe(key, actor)
 
 
@@ -71,51 +177,194 @@ class Find(Generic[T, U], ReceptionistRequest):
 @dataclass
 class Subscribe(Generic[T], ReceptionistRequest):
     key: ServiceKey[T]
-    actor: ActorRef[ListingResponse[T]]
+    actor: ActorRef[ListingResponse[T] | ListingUpdate[T]]
+
+
+@dataclass
+class Replicate(Generic[T], ReceptionistRequest):
+    """The actors registered with `key` on `node`, sent between receptionists."""
+
+    node: str
+    key: ServiceKey[T]
+    actors: tuple[ActorRef[T], ...]
+
+
+@dataclass
+class PeerJoined(ReceptionistRequest):
+    node: str
+    receptionist: ActorRef[ReceptionistRequest]
+
+
+@dataclass
+class PeerLeft(ReceptionistRequest):
+    node: str
 
 
 class Receptionist:
-    # since type hints holds no runtime information, ServiceKey and ActorRef stored in
-    # `actor_map` are not type checked.
-    actor_map = dict[ServiceKey, list[ActorRef]]()
-    subscription_map = dict[ServiceKey, list[ActorRef]]()
+    """
+    Receptionist: keeps track of the actors registered with each service key. Registered
+    actors and subscribers are watched and removed when they stop. Subscribers get the
+    changes of a listing instead of the whole listing. With remoting enabled,
+    registrations with named keys are replicated to the receptionists of all peers, so
+    listings contain the actors of every node.
+    """
+
+    def __init__(self) -> None:
+        # since type hints holds no runtime information, ServiceKey and ActorRef stored in
+        # `actor_map` are not type checked. dicts are used as sets that keep the order of
+        # registration.
+        self.actor_map = dict[ServiceKey, dict[ActorRef, None]]()
+        self.remote_map = dict[ServiceKey, dict[str, tuple[ActorRef, ...]]]()
+        self.subscription_map = dict[ServiceKey, dict[ActorRef, None]]()
+        # the keys of each watched actor, as registered actor and as subscriber
+        self.registrations = dict[ActorRef, set[ServiceKey]]()
+        self.subscriptions = dict[ActorRef, set[ServiceKey]]()
+        self.peers = dict[str, ActorRef[ReceptionistRequest]]()
 
     @classmethod
     def apply(cls) -> Behavior[ReceptionistRequest]:
-        return Behaviors.setup(cls._setup)
+        return Behaviors.setup(cls()._setup)
 
-    @classmethod
     def _setup(
-        cls, context: ActorContext[ReceptionistRequest]
+        self, context: ActorContext[ReceptionistRequest]
     ) -> Behavior[ReceptionistRequest]:
-        return Behaviors.receive_message(cls.on_message)
+        return Behaviors.receive(self.on_receive)
+
+    def listing(self, key: ServiceKey[T]) -> ListingResponse[T]:
+        actors = list(self.actor_map.get(key, ()))
+        for remote in self.remote_map.get(key, {}).values():
+            actors.extend(remote)
+        return ListingResponse(*actors)
+
+    def on_receive(
+        self,
+        context: ActorContext[ReceptionistRequest],
+        message: ReceptionistRequest | Signal,
+    ) -> Behavior[ReceptionistRequest]:
+        if isinstance(message, Terminated):
+            self.on_terminated(context, message.ref)
+            return Behavior[ReceptionistRequest].same
+        if isinstance(message, Signal):
+            return Behavior[ReceptionistRequest].same
+        return self.on_message(context, message)
 
-    @classmethod
     def on_message(
-        cls, context: ActorContext[ReceptionistRequest], message: ReceptionistRequest
+        self, context: ActorContext[ReceptionistRequest], message: ReceptionistRequest
     ) -> Behavior[ReceptionistRequest]:
         match message:
             case Register(key, actor):
-                if key not in cls.actor_map:
-                    cls.actor_map[key] = []
-                cls.actor_map[key].append(actor)
+                actors = self.actor_map.setdefault(key, {})
+                if actor in actors:
+                    return Behavior[ReceptionistRequest].same
+                actors[actor] = None
+                self.watch(context, actor, self.registrations).add(key)
                 context.log(f"Registered actor {actor.path} with {key}.")
-                for subscription in cls.subscription_map.get(key, []):
-                    subscription.tell(ListingResponse(*cls.actor_map[key]))
+                self.replicate(context, key)
+                self.publish(key, ListingUpdate((actor,), ()))
             case Deregister(key, actor):
-                if key in cls.actor_map:
-                    cls.actor_map[key].remove(actor)
-                context.log(f"Deregistered actor {actor.path} with {key}.")
-                for subscription in cls.subscription_map.get(key, []):
-                    subscription.tell(ListingResponse(*cls.actor_map[key]))
+                self.deregister(context, key, actor)
             case Find(key, adapter, reply_to):
-                response = ListingResponse(*cls.actor_map.get(key, []))
+                response = self.listing(key)
                 context.log(f"Found {len(response)} with {key}, sending to {reply_to}.")
                 reply_to.tell(adapter(response))
             case Subscribe(key, actor):
-                if key not in cls.subscription_map:
-                    cls.subscription_map[key] = []
-                cls.subscription_map[key].append(actor)
+                subscriptions = self.subscription_map.setdefault(key, {})
+                if actor in subscriptions:
+                    return Behavior[ReceptionistRequest].same
+                subscriptions[actor] = None
+                self.watch(context, actor, self.subscriptions).add(key)
                 context.log(f"Added subscription for {actor.path} with topic {key}.")
-                actor.tell(ListingResponse(*cls.actor_map.get(key, [])))
+                actor.tell(self.listing(key))
+            case Replicate(node, key, actors):
+                remote = self.remote_map.setdefault(key, {})
+                previous = remote.get(node, ())
+                remote[node] = actors
+                context.log(f"Received {len(actors)} actors with {key} from {node}.")
+                self.publish(key, _diff(previous, actors))
+            case PeerJoined(node, receptionist):
+                self.peers[node] = receptionist
+                context.log(f"Joined receptionist {receptionist.path} of {node}.")
+                remoting = context.system.remoting
+                assert remoting is not None
+                for key, actors in self.actor_map.items():
+                    if key.name is not None:
+                        receptionist.tell(Replicate(remoting.node, key, tuple(actors)))
+            case PeerLeft(node):
+                self.peers.pop(node, None)
+                context.log(f"Receptionist of {node} left.")
+                for key, remote in self.remote_map.items():
+                    previous = remote.pop(node, None)
+                    if previous is not None:
+                        self.publish(key, ListingUpdate((), previous))
         return Behavior[ReceptionistRequest].same
+
+    def deregister(
+        self,
+        context: ActorContext[ReceptionistRequest],
+        key: ServiceKey[Any],
+        actor: ActorRef[Any],
+    ) -> None:
+        actors = self.actor_map.get(key)
+        if actors is None or actor not in actors:
+            return
+        del actors[actor]
+        if len(actors) == 0:
+            del self.actor_map[key]
+        self.registrations.get(actor, set()).discard(key)
+        context.log(f"Deregistered actor {actor.path} with {key}.")
+        self.replicate(context, key)
+        self.publish(key, ListingUpdate((), (actor,)))
+
+    def watch(
+        self,
+        context: ActorContext[ReceptionistRequest],
+        actor: ActorRef[Any],
+        watched: dict[ActorRef, set[ServiceKey]],
+    ) -> set[ServiceKey]:
+        keys = watched.get(actor)
+        if keys is None:
+            # actors are watched once, whether they are registered, subscribed or both.
+            # refs to actors on other nodes can't be watched, their node removes them.
+            watching = actor in self.registrations or actor in self.subscriptions
+            if not watching and getattr(actor, "ref", None) is not None:
+                context.watch(actor)
+            keys = watched[actor] = set()
+        return keys
+
+    def on_terminated(
+        self, context: ActorContext[ReceptionistRequest], actor: ActorRef[Any]
+    ) -> None:
+        for key in self.registrations.pop(actor, ()):
+            self.deregister(context, key, actor)
+        for key in self.subscriptions.pop(actor, ()):
+            subscriptions = self.subscription_map.get(key)
+            if subscriptions is not None:
+                subscriptions.pop(actor, None)
+                if len(subscriptions) == 0:
+                    del self.subscription_map[key]
+
+    def replicate(
+        self, context: ActorContext[ReceptionistRequest], key: ServiceKey[Any]
+    ) -> None:
+        remoting = context.system.remoting
+        if key.name is None or remoting is None or len(self.peers) == 0:
+            return
+        message = Replicate(remoting.node, key, tuple(self.actor_map.get(key, ())))
+        for receptionist in self.peers.values():
+            receptionist.tell(message)
+
+    def publish(self, key: ServiceKey[Any], update: ListingUpdate[Any]) -> None:
+        if len(update) == 0:
+            return
+        for subscription in self.subscription_map.get(key, ()):
+            subscription.tell(update)
+
+
+def _diff(
+    previous: Iterable[ActorRef[T]], current: Iterable[ActorRef[T]]
+) -> ListingUpdate[T]:
+    before, after = dict.fromkeys(previous), dict.fromkeys(current)
+    return ListingUpdate(
+        tuple(actor for actor in after if actor not in before),
+        tuple(actor for actor in before if actor not in after),
+    )
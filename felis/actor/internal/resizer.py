@@ -0,0 +1,59 @@
+import math
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Resizer:
+    """
+    Resizer: the policy of a pool router that grows and shrinks its pool between `lower`
+    and `upper` workers. Every `interval` seconds the router measures the mean number of
+    pending messages per worker, including the ones still queued at the router, and, if
+    the workers collect metrics, the mean time messages waited in their mailboxes since
+    the last check.
+
+    The pool grows by `rampup` of its size when the mean depth exceeds `max_depth` or
+    the mean queue time exceeds `max_queue_time`. It shrinks by `backoff` of its size
+    once the mean depth stayed at or below `idle_depth` for `idle_timeout` seconds.
+    Retired workers get no new messages and stop when their mailboxes are drained.
+    """
+
+    lower: int = 1
+    upper: int = 16
+    interval: float = 1.0
+    max_depth: float = 8.0
+    max_queue_time: float | None = None
+    rampup: float = 0.5
+    idle_depth: float = 1.0
+    idle_timeout: float = 30.0
+    backoff: float = 0.25
+
+    def __post_init__(self) -> None:
+        if self.lower < 1 or self.upper < self.lower:
+            raise ValueError("Pool bounds must satisfy 1 <= lower <= upper")
+        if self.interval <= 0:
+            raise ValueError("Interval must be positive")
+        if self.rampup <= 0 or self.backoff <= 0:
+            raise ValueError("Rampup and backoff must be positive")
+
+    def clamp(self, size: int) -> int:
+        return min(max(size, self.lower), self.upper)
+
+    def is_pressured(self, depth: float, queue_time: float | None) -> bool:
+        if depth > self.max_depth:
+            return True
+        return (
+            self.max_queue_time is not None
+            and queue_time is not None
+            and queue_time > self.max_queue_time
+        )
+
+    def is_idle(self, depth: float) -> bool:
+        return depth <= self.idle_depth
+
+    def grow(self, size: int) -> int:
+        """The size of the pool after scaling up from `size` workers."""
+        return self.clamp(size + math.ceil(size * self.rampup))
+
+    def shrink(self, size: int) -> int:
+        """The size of the pool after scaling down from `size` workers."""
+        return self.clamp(size - math.ceil(size * self.backoff))
@@ -1,18 +1,28 @@
 from abc import abstractmethod
-from typing import Generic, Sequence, Type, TypeVar
+from bisect import bisect
+from hashlib import md5
+from typing import Any, Callable, Generic, Hashable, Sequence, Type, TypeVar
 import random
 
-from .receptionist import ListingResponse, ReceptionistRequest, ServiceKey
+from .receptionist import Listing, ListingResponse, ListingUpdate
+from .receptionist import ReceptionistRequest, ServiceKey
 from ..signals import Signal, Terminated
 from ..actor import ActorRef
 from ..context import ActorContext
 from ..behavior import Behavior, Behaviors
+from ..stash import DEFAULT_STASH_CAPACITY, StashBuffer
+from ..timers import TimerScheduler
+from .resizer import Resizer
 
 T = TypeVar("T")
 
 
 class Executor(Generic[T]):
-    """Executor selects a worker from a pool of workers."""
+    """
+    Executor selects a worker from a pool of workers. Stateless executors implement
+    `get_worker`; executors that look at the message or keep state between messages
+    override `select`. Routers take an executor class or an instance.
+    """
 
     @classmethod
     @abstractmethod
@@ -21,6 +31,17 @@ class Executor(Generic[T]):
     ) -> ActorRef[T] | None:
         raise NotImplementedError()
 
+    def select(
+        self, workers: Sequence[ActorRef[T]], context: ActorContext[T], message: object
+    ) -> ActorRef[T] | None:
+        return self.get_worker(workers, context)
+
+
+def _is_alive(worker: ActorRef[Any]) -> bool:
+    # refs to actors on other nodes are assumed to be alive
+    actor = getattr(worker, "ref", None)
+    return actor is None or actor.is_alive
+
 
 class DefaultExecutor(Executor[T]):
     """Default executor for routers. It randomly selects a worker from the list."""
@@ -32,62 +53,326 @@ class DefaultExecutor(Executor[T]):
         if len(workers) == 0:
             return None
         choice = random.choice(workers)
-        while not choice.ref.is_alive:
-            choice = random.choice(workers)
-        return choice
+        if _is_alive(choice):
+            return choice
+        alive = [worker for worker in workers if _is_alive(worker)]
+        if len(alive) == 0:
+            return None
+        return random.choice(alive)
+
+
+class RoundRobinExecutor(Executor[T]):
+    """Selects the workers in turn, skipping dead ones."""
+
+    def __init__(self) -> None:
+        self._next = 0
+
+    def select(
+        self, workers: Sequence[ActorRef[T]], context: ActorContext[T], message: object
+    ) -> ActorRef[T] | None:
+        for _ in range(len(workers)):
+            worker = workers[self._next % len(workers)]
+            self._next += 1
+            if _is_alive(worker):
+                return worker
+        return None
+
+
+class SmallestMailboxExecutor(Executor[T]):
+    """
+    Selects the live worker with the fewest pending messages, queued or being handled,
+    preferring the first one on ties. Workers on other nodes have no known depth and are
+    only used if no local worker is alive.
+    """
+
+    def select(
+        self, workers: Sequence[ActorRef[T]], context: ActorContext[T], message: object
+    ) -> ActorRef[T] | None:
+        best: ActorRef[T] | None = None
+        best_depth = 0
+        fallback: ActorRef[T] | None = None
+        for worker in workers:
+            actor = getattr(worker, "ref", None)
+            if actor is None:
+                fallback = fallback or worker
+                continue
+            if not actor.is_alive:
+                continue
+            depth = actor.pending
+            if depth == 0:
+                return worker
+            if best is None or depth < best_depth:
+                best, best_depth = worker, depth
+        return best or fallback
+
+
+class ConsistentHashExecutor(Executor[T]):
+    """
+    Selects workers by hashing a key of the message onto a ring of `virtual_nodes` points
+    per worker, so messages with the same key go to the same worker and keep their order,
+    and a changed pool only moves the keys of the added or removed workers. Messages
+    without a key, for which `key` returns None, are spread in round robin.
+
+    The order of a key only holds while its worker stays in the pool. Once a pool shrinks,
+    the keys of retired workers move to the remaining ones right away, while the retirees
+    still handle the messages they had queued, so a message sent after the move may be
+    handled before an earlier one with the same key; the same goes for workers leaving a
+    group. Handlers that need a strict order per key should not rely on a resizing pool.
+
+        Executors.consistent_hash(lambda message: message.event.session_id)
+    """
+
+    def __init__(
+        self, key: Callable[[Any], Hashable | None], virtual_nodes: int = 100
+    ) -> None:
+        self._key = key
+        self._virtual_nodes = virtual_nodes
+        self._members: tuple[str, ...] = ()
+        # the workers the ring was built for and their version, see `_changed`
+        self._source: Sequence[ActorRef[T]] | None = None
+        self._version: int | None = None
+        self._points: list[int] = []
+        self._owners: list[ActorRef[T]] = []
+        self._fallback = RoundRobinExecutor[T]()
+
+    def select(
+        self, workers: Sequence[ActorRef[T]], context: ActorContext[T], message: object
+    ) -> ActorRef[T] | None:
+        key = None if isinstance(message, Signal) else self._key(message)
+        if key is None:
+            return self._fallback.select(workers, context, message)
+        if self._changed(workers):
+            members = tuple(worker.path for worker in workers)
+            if members != self._members:
+                self._build(workers, members)
+        if len(self._points) == 0:
+            return None
+        index = bisect(self._points, _hash(str(key)))
+        for offset in range(len(self._points)):
+            worker = self._owners[(index + offset) % len(self._points)]
+            if _is_alive(worker):
+                return worker
+        return None
+
+    def _changed(self, workers: Sequence[ActorRef[T]]) -> bool:
+        # the workers of routers carry a version, other sequences are compared in full
+        version = getattr(workers, "version", None)
+        if version is not None and workers is self._source and version == self._version:
+            return False
+        self._source, self._version = workers, version
+        return True
+
+    def _build(self, workers: Sequence[ActorRef[T]], members: tuple[str, ...]) -> None:
+        ring = sorted(
+            (
+                (_hash(f"{worker.path}#{i}"), worker)
+                for worker in workers
+                for i in range(self._virtual_nodes)
+            ),
+            key=lambda point: point[0],
+        )
+        self._members = members
+        self._points = [point for point, _ in ring]
+        self._owners = [worker for _, worker in ring]
+
+
+def _hash(value: str) -> int:
+    # stable across processes, unlike `hash` of a string
+    return int.from_bytes(md5(value.encode()).digest()[:8], "big")
+
+
+class _Resize(Signal):
+    """Resize tick, a signal so that it is not queued behind the backlog it checks."""
+
+    pass
+
+
+class _Pool(list[ActorRef[T]]):
+    """The workers of a pool, with a `version` that changes whenever they do."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.version = 0
+
+    def append(self, worker: ActorRef[T]) -> None:
+        self.version += 1
+        super().append(worker)
+
+    def remove(self, worker: ActorRef[T]) -> None:
+        self.version += 1
+        super().remove(worker)
+
+    def __delitem__(self, index: Any) -> None:
+        self.version += 1
+        super().__delitem__(index)
 
 
 class PoolRouter(Generic[T]):
+    """
+    PoolRouter: spawns a pool of workers and routes messages to them with an executor.
+    With a `Resizer` the pool grows under pressure and shrinks when idle; otherwise it
+    keeps `size` workers until they stop. If the router collects metrics, it records
+    `pool_size`, `resize_up`, `resize_down` and `workers_retired` counters.
+    """
+
     def __init__(
         self,
         size: int,
         behavior: Behavior[T],
-        executor: Type[Executor],
+        executor: Type[Executor] | Executor,
+        resizer: Resizer | None = None,
     ) -> None:
         self._behavior = behavior
-        self._size = size
-        self._executor = executor
-        self._workers: list[ActorRef[T]] = []
+        self._size = resizer.clamp(size) if resizer is not None else size
+        self._executor = _instance(executor)
+        self._resizer = resizer
+        self._workers = _Pool[T]()
+        self._retiring: list[ActorRef[T]] = []
+        self._spawned = 0
+        self._idle_since: float | None = None
+        self._queue_times = dict[str, tuple[int, float]]()
 
     def apply(self) -> Behavior[T]:
-        return Behaviors.setup(self.setup)
+        if self._resizer is None:
+            return Behaviors.setup(self.setup)
+        return Behaviors.with_timers(self.setup_resizer)
 
     def setup(self, context: ActorContext[T]) -> Behavior[T]:
-        for i in range(self._size):
-            ref = context.spawn(self._behavior, f"worker_{i}")
-            context.watch(ref)
-            self._workers.append(ref)
+        self._resize(context, self._size)
         return Behaviors.receive(self.on_receive)
 
+    def setup_resizer(
+        self, context: ActorContext[T], timers: TimerScheduler[T]
+    ) -> Behavior[T]:
+        assert self._resizer is not None
+        timers.start_periodic("resize", _Resize(), self._resizer.interval)  # type: ignore
+        return self.setup(context)
+
     def on_receive(self, context: ActorContext[T], message: T | Signal) -> Behavior[T]:
-        worker = self._executor.get_worker(self._workers, context)
-        if worker is None:
-            return Behavior[T].stop
+        if isinstance(message, _Resize):
+            self._check(context)
+            return Behavior[T].same
         if isinstance(message, Terminated):
+            if message.ref in self._retiring:
+                self._retiring.remove(message.ref)
             if message.ref in self._workers:
                 self._workers.remove(message.ref)
+                self._record_size(context)
             if len(self._workers) == 0:
                 return Behavior[T].stop
-        elif isinstance(message, Signal):
+            return Behavior[T].same
+        worker = self._executor.select(self._workers, context, message)
+        if worker is None:
+            return Behavior[T].stop
+        if isinstance(message, Signal):
             worker.receive_signal(message)
         else:
             worker.tell(message)
         return Behavior[T].same
 
+    def _check(self, context: ActorContext[T]) -> None:
+        assert self._resizer is not None
+        for worker in list(self._retiring):
+            if worker.ref.pending == 0:
+                # stopped workers are removed when their Terminated arrives
+                context.stop(worker)
+        if len(self._workers) == 0:
+            return
+        # messages queued at the router wait for the pool as well
+        pending = sum(worker.ref.pending for worker in self._workers)
+        depth = (pending + context.self.ref.mailbox_depth) / len(self._workers)
+        size = len(self._workers)
+        now = context.loop.time()
+        if self._resizer.is_pressured(depth, self._queue_time()):
+            self._idle_since = None
+            self._resize(context, self._resizer.grow(size))
+        elif not self._resizer.is_idle(depth):
+            self._idle_since = None
+        elif self._idle_since is None:
+            self._idle_since = now
+        elif now - self._idle_since >= self._resizer.idle_timeout:
+            self._idle_since = now
+            self._resize(context, self._resizer.shrink(size))
+
+    def _queue_time(self) -> float | None:
+        """Mean queue time of the messages the workers took since the last check."""
+        count, total = 0, 0.0
+        queue_times = dict[str, tuple[int, float]]()
+        for worker in self._workers:
+            metrics = worker.ref.metrics
+            if metrics is None:
+                continue
+            snapshot = metrics.queue_time.snapshot()
+            last_count, last_total = self._queue_times.get(worker.path, (0, 0.0))
+            count += snapshot.count - last_count
+            total += snapshot.total - last_total
+            queue_times[worker.path] = (snapshot.count, snapshot.total)
+        self._queue_times = queue_times
+        return total / count if count > 0 else None
+
+    def _resize(self, context: ActorContext[T], size: int) -> None:
+        current = len(self._workers)
+        if size > current:
+            for _ in range(size - current):
+                ref = context.spawn(self._behavior, f"worker_{self._spawned}")
+                self._spawned += 1
+                context.watch(ref)
+                self._workers.append(ref)
+            if current > 0:
+                self._increment(context, "resize_up")
+        elif size < current:
+            # retire the newest workers, each of them holds an equal share of the
+            # consistent hash keys, which move to the remaining workers right away
+            retired = self._workers[size:]
+            del self._workers[size:]
+            self._retiring.extend(retired)
+            self._increment(context, "resize_down")
+            self._increment(context, "workers_retired", len(retired))
+        else:
+            return
+        if current > 0:
+            context.log(f"Resized pool from {current} to {size} workers.")
+        self._record_size(context)
+
+    def _increment(
+        self, context: ActorContext[T], counter: str, count: int = 1
+    ) -> None:
+        metrics = context.self.ref.metrics
+        if metrics is not None:
+            metrics.increment(counter, count)
+
+    def _record_size(self, context: ActorContext[T]) -> None:
+        metrics = context.self.ref.metrics
+        if metrics is not None:
+            metrics.counters["pool_size"] = len(self._workers)
+
 
 class GroupRouter(Generic[T]):
-    def __init__(self, key: ServiceKey[T], executor: Type[Executor]) -> None:
+    """
+    GroupRouter: routes messages to the actors registered with a service key. Messages
+    received while there are no workers are stashed, up to `stash_capacity`.
+    """
+
+    def __init__(
+        self,
+        key: ServiceKey[T],
+        executor: Type[Executor] | Executor,
+        stash_capacity: int,
+    ) -> None:
         self._key = key
-        self._executor = executor
-        self._stashed: list[T | Signal] = []
-        self._workers: list[ActorRef[T]] = []
+        self._executor = _instance(executor)
+        self._stash_capacity = stash_capacity
+        self._workers = Listing[T]()
 
     def apply(self) -> Behavior[T | ListingResponse[T]]:
-        return Behaviors.setup(self.setup)
+        return Behaviors.with_stash(self._stash_capacity, self.setup)
 
     def setup(
-        self, context: ActorContext[T | ListingResponse[T]]
+        self,
+        context: ActorContext[T | ListingResponse[T]],
+        stash: StashBuffer[T | ListingResponse[T]],
     ) -> Behavior[T | ListingResponse[T]]:
+        self._stash = stash
         context.system.receptionist.tell(
             ReceptionistRequest.subscribe(self._key, context.self)  # type: ignore
         )
@@ -96,16 +381,17 @@ class GroupRouter(Generic[T]):
     def on_receive(
         self,
         context: ActorContext[T | ListingResponse[T]],
-        message: T | ListingResponse[T] | Signal,
+        message: T | ListingResponse[T] | ListingUpdate[T] | Signal,
     ) -> Behavior[T | ListingResponse[T]]:
-        if isinstance(message, ListingResponse):
-            self._workers = list(message.actors)
-            self.handle_stashed(context)
+        if isinstance(message, (ListingResponse, ListingUpdate)):
+            self._workers.apply(message)
+            if len(self._workers) > 0:
+                return self._stash.unstash_all(Behavior[T | ListingResponse[T]].same)
             return Behavior[T | ListingResponse[T]].same
 
-        worker = self._executor.get_worker(self._workers, context)
+        worker = self._executor.select(self._workers, context, message)
         if worker is None:
-            self._stashed.append(message)
+            self._stash.stash(message)
             return Behavior[T | ListingResponse[T]].same
 
         if isinstance(message, Signal):
@@ -114,27 +400,49 @@ class GroupRouter(Generic[T]):
             worker.tell(message)
         return Behavior[T | ListingResponse[T]].same
 
-    def handle_stashed(self, context: ActorContext[T | ListingResponse[T]]) -> None:
-        for message in self._stashed:
-            worker = self._executor.get_worker(self._workers, context)
-            if worker is None:
-                return
-            if isinstance(message, Signal):
-                worker.receive_signal(message)
-            else:
-                worker.tell(message)
-        self._stashed = []
+
+def _instance(executor: Type[Executor] | Executor) -> Executor:
+    return executor() if isinstance(executor, type) else executor
+
+
+class Executors:
+    @staticmethod
+    def random() -> Executor[Any]:
+        return DefaultExecutor()
+
+    @staticmethod
+    def round_robin() -> Executor[Any]:
+        return RoundRobinExecutor()
+
+    @staticmethod
+    def smallest_mailbox() -> Executor[Any]:
+        return SmallestMailboxExecutor()
+
+    @staticmethod
+    def consistent_hash(
+        key: Callable[[Any], Hashable | None], virtual_nodes: int = 100
+    ) -> Executor[Any]:
+        return ConsistentHashExecutor(key, virtual_nodes)
 
 
 class Routers:
     @staticmethod
     def pool(
-        size: int, behavior: Behavior[T], executor: Type[Executor] = DefaultExecutor
+        size: int,
+        behavior: Behavior[T],
+        executor: Type[Executor] | Executor = DefaultExecutor,
+        resizer: Resizer | None = None,
     ) -> PoolRouter[T]:
-        return PoolRouter(size, behavior, executor)
+        """
+        A pool of `size` workers running `behavior`. With a `resizer` the pool adapts its
+        size to the load, starting from `size` clamped to the bounds of the resizer.
+        """
+        return PoolRouter(size, behavior, executor, resizer)
 
     @staticmethod
     def group(
-        key: ServiceKey[T], executor: Type[Executor] = DefaultExecutor
+        key: ServiceKey[T],
+        executor: Type[Executor] | Executor = DefaultExecutor,
+        stash_capacity: int = DEFAULT_STASH_CAPACITY,
     ) -> GroupRouter[T]:
-        return GroupRouter(key, executor)
+        return GroupRouter(key, executor, stash_capacity)
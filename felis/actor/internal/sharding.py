@@ -0,0 +1,224 @@
+from collections import OrderedDict, deque
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+from ..signals import Passivate, Signal, Terminated
+from ..actor import ActorRef
+from ..context import ActorContext
+from ..behavior import Behavior, Behaviors
+from ..stash import DEFAULT_STASH_CAPACITY
+from ..timers import TimerScheduler
+from ...utils import LoggerLevel
+
+T = TypeVar("T")
+
+
+class _Check:
+    pass
+
+
+class _Entity(Generic[T]):
+    __slots__ = ("ref", "last_seen", "buffer")
+
+    def __init__(self, ref: ActorRef[T], last_seen: float) -> None:
+        self.ref = ref
+        self.last_seen = last_seen
+        # messages for the next incarnation, received while passivating
+        self.buffer = deque[T]()
+
+
+class EntityRegion(Generic[T]):
+    """
+    EntityRegion: routes messages to child entities by the key that `key` extracts from
+    each message, creating the entity of a key with `factory(key)` on its first message.
+    Entities idle for `idle_timeout` seconds are passivated, and so is the least recently
+    used entity when a new one would exceed `max_entities`. Passivated entities get a
+    `Passivate` signal, where they can save a snapshot of their state and stop, and are
+    stopped once their mailbox is drained. Messages that arrive in the meantime are
+    buffered and delivered to a new incarnation of the entity. Passivating entities count
+    toward `max_entities`, so new entities wait with their messages until evicted ones
+    stopped. Keys are compared as they are, not by their string, which only names the
+    entity actors.
+    If the region collects metrics, it records `entities`, `entities_started`,
+    `entities_passivated` and `entities_evicted` counters.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[Any], Behavior[T]],
+        key: Callable[[T], Hashable | None],
+        idle_timeout: float | None,
+        max_entities: int | None,
+        check_interval: float,
+    ) -> None:
+        if max_entities is not None and max_entities <= 0:
+            raise ValueError("Max entities must be positive")
+        self._factory = factory
+        self._key = key
+        self._idle_timeout = idle_timeout
+        self._max_entities = max_entities
+        self._check_interval = check_interval
+        # live entities in least recently used order
+        self._entities = OrderedDict[Hashable, _Entity[T]]()
+        self._passivating = dict[Hashable, _Entity[T]]()
+        # messages of entities waiting for room below `max_entities`, in arrival order
+        self._waiting = OrderedDict[Hashable, deque[T]]()
+        self._keys = dict[ActorRef[T], Hashable]()
+        self._spawned = 0
+
+    def apply(self) -> Behavior[T]:
+        return Behaviors.with_timers(self.setup)
+
+    def setup(self, context: ActorContext[T], timers: TimerScheduler[T]) -> Behavior[T]:
+        timers.start_periodic("check", _Check(), self._check_interval)  # type: ignore
+        return Behaviors.receive(self.on_receive)
+
+    def on_receive(self, context: ActorContext[T], message: T | Signal) -> Behavior[T]:
+        if isinstance(message, _Check):
+            self._check(context)
+            return Behavior[T].same
+        if isinstance(message, Terminated):
+            self._on_terminated(context, message.ref)
+            return Behavior[T].same
+        if isinstance(message, Signal):
+            return Behavior[T].same
+
+        key = self._key(message)
+        if key is None:
+            context.log(f"No entity key for {message}.", LoggerLevel.WARNING)
+            context.system.dead_letter(message, context.self)
+            return Behavior[T].same
+        entity = self._entities.get(key)
+        if entity is not None and not entity.ref.ref.is_alive:
+            # the entity stopped by itself, buffer until its `Terminated` arrives
+            del self._entities[key]
+            self._passivating[key] = entity
+            self._record_size(context)
+            entity = None
+        if entity is not None:
+            entity.last_seen = context.loop.time()
+            self._entities.move_to_end(key)
+            entity.ref.tell(message)
+            return Behavior[T].same
+        if key in self._passivating:
+            self._buffer(context, self._passivating[key].buffer, message)
+        elif key in self._waiting:
+            self._buffer(context, self._waiting[key], message)
+        elif self._has_room():
+            self._start(context, key).ref.tell(message)
+        else:
+            self._waiting[key] = deque([message])
+            self._evict(context)
+        return Behavior[T].same
+
+    def _buffer(self, context: ActorContext[T], buffer: deque[T], message: T) -> None:
+        if len(buffer) >= DEFAULT_STASH_CAPACITY:
+            context.system.dead_letter(message, context.self)
+        else:
+            buffer.append(message)
+
+    def _has_room(self) -> bool:
+        if self._max_entities is None:
+            return True
+        return len(self._entities) + len(self._passivating) < self._max_entities
+
+    def _evict(self, context: ActorContext[T]) -> None:
+        """Passivates the least recently used entities to make room for waiting ones."""
+        assert self._max_entities is not None
+        # passivating entities leave room for waiting ones once they stopped, unless they
+        # buffered messages, then they wait themselves
+        while (
+            len(self._entities) > 0
+            and len(self._entities) + len(self._waiting) > self._max_entities
+        ):
+            self._passivate(context, next(iter(self._entities)))
+            self._increment(context, "entities_evicted")
+
+    def _admit(self, context: ActorContext[T]) -> None:
+        """Starts waiting entities while there is room for them."""
+        while len(self._waiting) > 0 and self._has_room():
+            key, messages = self._waiting.popitem(last=False)
+            entity = self._start(context, key)
+            for message in messages:
+                entity.ref.tell(message)
+        if len(self._waiting) > 0:
+            self._evict(context)
+
+    def _start(self, context: ActorContext[T], key: Hashable) -> _Entity[T]:
+        name = "entity_" + str(key).replace("/", "%2F")
+        if context.get_child(name) is not None:
+            # another key with the same string, or an incarnation that is not removed yet
+            name = f"{name}_{self._spawned}"
+        self._spawned += 1
+        ref = context.spawn(self._factory(key), name)
+        context.watch(ref)
+        entity = _Entity(ref, context.loop.time())
+        self._entities[key] = entity
+        self._keys[ref] = key
+        self._increment(context, "entities_started")
+        self._record_size(context)
+        return entity
+
+    def _passivate(self, context: ActorContext[T], key: Hashable) -> None:
+        entity = self._entities.pop(key)
+        self._passivating[key] = entity
+        entity.ref.receive_signal(Passivate())
+        self._increment(context, "entities_passivated")
+        self._record_size(context)
+
+    def _check(self, context: ActorContext[T]) -> None:
+        for entity in self._passivating.values():
+            actor = entity.ref.ref
+            if actor.is_alive and actor.pending == 0:
+                # the entity handled `Passivate` without stopping itself
+                context.stop(entity.ref)
+        if self._idle_timeout is None:
+            return
+        deadline = context.loop.time() - self._idle_timeout
+        # entities are in least recently used order, so stop at the first active one
+        while len(self._entities) > 0:
+            key, entity = next(iter(self._entities.items()))
+            if entity.last_seen > deadline:
+                break
+            self._passivate(context, key)
+
+    def _on_terminated(self, context: ActorContext[T], ref: ActorRef[Any]) -> None:
+        key = self._keys.pop(ref, None)
+        if key is None:
+            return
+        entity = self._passivating.pop(key, None)
+        if entity is None:
+            # the entity stopped by itself
+            self._entities.pop(key, None)
+            self._record_size(context)
+        elif len(entity.buffer) > 0:
+            # the new incarnation goes before entities that waited for room
+            self._waiting[key] = entity.buffer
+            self._waiting.move_to_end(key, last=False)
+        self._admit(context)
+
+    def _increment(self, context: ActorContext[T], counter: str) -> None:
+        metrics = context.self.ref.metrics
+        if metrics is not None:
+            metrics.increment(counter)
+
+    def _record_size(self, context: ActorContext[T]) -> None:
+        metrics = context.self.ref.metrics
+        if metrics is not None:
+            metrics.counters["entities"] = len(self._entities)
+
+
+class Sharding:
+    @staticmethod
+    def entities(
+        factory: Callable[[Any], Behavior[T]],
+        key: Callable[[T], Hashable | None],
+        idle_timeout: float | None = 300.0,
+        max_entities: int | None = 10_000,
+        check_interval: float = 1.0,
+    ) -> EntityRegion[T]:
+        """
+        A region of entities keyed by `key`, such as the session of an event:
+
+            Sharding.entities(Dialog.of, lambda message: message.event.session_id)
+        """
+        return EntityRegion(factory, key, idle_timeout, max_entities, check_interval)
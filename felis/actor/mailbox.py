@@ -0,0 +1,394 @@
+import asyncio
+import heapq
+from abc import abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from itertools import count
+from time import perf_counter
+from typing import Any, Callable, Generic, Mapping, TypeVar
+
+from .metrics import ActorMetrics
+from .signals import Signal
+
+T = TypeVar("T")
+
+
+class OverflowPolicy(Enum):
+    """Decides what happens to a message sent to a full mailbox."""
+
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+    DEAD_LETTERS = "dead_letters"
+    BLOCK = "block"
+
+
+class Mailbox(Generic[T]):
+    """
+    Mailbox: the message queue of an actor. An optional capacity bounds the number of
+    queued messages, and the overflow policy decides how messages beyond it are handled.
+    Signals are never rejected, so lifecycle notifications are always delivered.
+
+    Subclasses provide the storage through `_push`, `_evict`, `get_batch` and `__len__`,
+    and may override `_push_signal` to give signals a lane of their own. Once `track` is
+    called, they also record how long each ordinary message stayed queued.
+    """
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+    ) -> None:
+        if capacity is not None and capacity <= 0:
+            raise ValueError("Mailbox capacity must be positive")
+        self._capacity = capacity
+        self._policy = policy
+        self._putters = deque[asyncio.Future[None]]()
+        self._closed = False
+        self._dropped = dict.fromkeys(OverflowPolicy, 0)
+        self._metrics: ActorMetrics | None = None
+
+    @property
+    def capacity(self) -> int | None:
+        return self._capacity
+
+    @property
+    def policy(self) -> OverflowPolicy:
+        return self._policy
+
+    @property
+    def dropped(self) -> Mapping[OverflowPolicy, int]:
+        """Number of messages each overflow policy has dropped or rejected."""
+        return self._dropped
+
+    def track(self, metrics: ActorMetrics) -> None:
+        """Starts recording mailbox depth and queueing time into `metrics`."""
+        self._metrics = metrics
+
+    def is_full(self) -> bool:
+        return self._capacity is not None and self._backlog() >= self._capacity
+
+    def offer(self, message: T | Signal) -> bool:
+        """
+        Enqueues a message without waiting. Returns False if the mailbox rejects the
+        message, in which case the caller should send it to dead letters.
+        """
+        if self._closed:
+            return False
+        if (
+            self._capacity is None
+            or self._backlog() < self._capacity
+            or isinstance(message, Signal)
+        ):
+            self._push(message)
+            if self._metrics is not None:
+                self._metrics.on_enqueue(len(self))
+            return True
+        self._dropped[self._policy] += 1
+        match self._policy:
+            case OverflowPolicy.DROP_NEWEST:
+                return True
+            case OverflowPolicy.DROP_OLDEST:
+                self._evict()
+                self._push(message)
+                return True
+        # both `DEAD_LETTERS` and `BLOCK` reject here since `offer` is not allowed to wait
+        return False
+
+    def offer_signal(self, signal: Signal) -> bool:
+        """Enqueues a signal regardless of the capacity."""
+        if self._closed:
+            return False
+        self._push_signal(signal)
+        return True
+
+    async def offer_async(self, message: T | Signal) -> bool:
+        """Like `offer`, but waits for free space if the policy is `BLOCK`."""
+        if self._policy is OverflowPolicy.BLOCK:
+            while self.is_full() and not self._closed:
+                putter = asyncio.get_running_loop().create_future()
+                self._putters.append(putter)
+                try:
+                    await putter
+                finally:
+                    if not putter.done():
+                        putter.cancel()
+        return self.offer(message)
+
+    async def get(self) -> T | Signal:
+        batch = await self.get_batch(1)
+        return batch[0]
+
+    def close(self) -> None:
+        """Rejects further messages and releases all blocked senders."""
+        self._closed = True
+        self._wakeup_putters(len(self._putters))
+
+    def _wakeup_putters(self, count: int) -> None:
+        while count > 0 and self._putters:
+            putter = self._putters.popleft()
+            if not putter.done():
+                putter.set_result(None)
+                count -= 1
+
+    @abstractmethod
+    def _push(self, message: T | Signal) -> None:
+        raise NotImplementedError()
+
+    def _push_signal(self, signal: Signal) -> None:
+        self._push(signal)
+
+    def _backlog(self) -> int:
+        """Number of queued messages that count towards the capacity."""
+        return len(self)
+
+    @abstractmethod
+    def _evict(self) -> None:
+        """Drops a queued message to make room for a new one."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_batch(self, limit: int) -> list[T | Signal]:
+        """Waits for a message, then drains up to `limit` messages that are ready."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+
+class LaneMailbox(Mailbox[T]):
+    """
+    Base of mailboxes with a separate lane for signals. Signals are delivered before any
+    ordinary message, so a `Terminated` is not stuck behind a backlog of work.
+    The owning actor waits on a single wakeup future that exists only while it is idle.
+    """
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+    ) -> None:
+        super().__init__(capacity, policy)
+        self._signals = deque[Signal]()
+        self._waiter: asyncio.Future[None] | None = None
+
+    def _wakeup(self) -> None:
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _push_signal(self, signal: Signal) -> None:
+        self._signals.append(signal)
+        self._wakeup()
+
+    def _backlog(self) -> int:
+        return len(self) - len(self._signals)
+
+    async def get_batch(self, limit: int) -> list[T | Signal]:
+        while len(self) == 0:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        batch = list[T | Signal]()
+        signals = self._signals
+        while signals and len(batch) < limit:
+            batch.append(signals.popleft())
+        self._drain(batch, limit)
+        if self._putters:
+            self._wakeup_putters(len(batch))
+        return batch
+
+    @abstractmethod
+    def _drain(self, batch: list[T | Signal], limit: int) -> None:
+        """Moves ordinary messages into `batch` until it holds `limit` messages."""
+        raise NotImplementedError()
+
+
+class DequeMailbox(LaneMailbox[T]):
+    """Default mailbox: a FIFO deque for ordinary messages behind the signal lane."""
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+    ) -> None:
+        super().__init__(capacity, policy)
+        self._messages = deque[T | Signal]()
+        self._enqueued_at: deque[float] | None = None
+
+    def track(self, metrics: ActorMetrics) -> None:
+        super().track(metrics)
+        self._enqueued_at = deque(perf_counter() for _ in self._messages)
+
+    def _push(self, message: T | Signal) -> None:
+        self._messages.append(message)
+        if self._enqueued_at is not None:
+            self._enqueued_at.append(perf_counter())
+        if self._waiter is not None:
+            self._wakeup()
+
+    def _evict(self) -> None:
+        self._messages.popleft()
+        if self._enqueued_at is not None:
+            self._enqueued_at.popleft()
+
+    def _drain(self, batch: list[T | Signal], limit: int) -> None:
+        messages = self._messages
+        space = limit - len(batch)
+        if self._enqueued_at is not None and self._metrics is not None:
+            now = perf_counter()
+            observe = self._metrics.queue_time.observe
+            for _ in range(min(space, len(messages))):
+                observe(now - self._enqueued_at.popleft())
+        if len(messages) <= space:
+            batch.extend(messages)
+            messages.clear()
+        else:
+            batch.extend(messages.popleft() for _ in range(space))
+
+    def __len__(self) -> int:
+        return len(self._messages) + len(self._signals)
+
+
+class PriorityMailbox(LaneMailbox[T]):
+    """
+    Delivers ordinary messages in ascending order of `key(message)`, and in arrival order
+    among equal keys. When full, `DROP_OLDEST` evicts the message that would be delivered
+    last, which takes O(n).
+    """
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+        *,
+        key: Callable[[Any], Any],
+    ) -> None:
+        super().__init__(capacity, policy)
+        self._key = key
+        self._heap = list[tuple[Any, int, float, T | Signal]]()
+        self._seq = count()
+        self._timed = False
+
+    def track(self, metrics: ActorMetrics) -> None:
+        super().track(metrics)
+        self._timed = True
+
+    def _push(self, message: T | Signal) -> None:
+        enqueued_at = perf_counter() if self._timed else 0.0
+        entry = (self._key(message), next(self._seq), enqueued_at, message)
+        heapq.heappush(self._heap, entry)
+        if self._waiter is not None:
+            self._wakeup()
+
+    def _evict(self) -> None:
+        heap = self._heap
+        last = max(range(len(heap)), key=lambda i: heap[i][:2])
+        heap[last] = heap[-1]
+        heap.pop()
+        heapq.heapify(heap)
+
+    def _drain(self, batch: list[T | Signal], limit: int) -> None:
+        heap = self._heap
+        metrics = self._metrics if self._timed else None
+        now = perf_counter()
+        while heap and len(batch) < limit:
+            _, _, enqueued_at, message = heapq.heappop(heap)
+            if metrics is not None and enqueued_at > 0.0:
+                metrics.queue_time.observe(now - enqueued_at)
+            batch.append(message)
+
+    def __len__(self) -> int:
+        return len(self._heap) + len(self._signals)
+
+
+class QueueMailbox(Mailbox[T]):
+    """Mailbox backed by an `asyncio.Queue`. Signals share the FIFO with messages."""
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+    ) -> None:
+        super().__init__(capacity, policy)
+        self._queue = asyncio.Queue[T | Signal]()
+        self._enqueued_at: deque[float] | None = None
+
+    def track(self, metrics: ActorMetrics) -> None:
+        super().track(metrics)
+        self._enqueued_at = deque(perf_counter() for _ in range(len(self)))
+
+    def _push(self, message: T | Signal) -> None:
+        self._queue.put_nowait(message)
+        if self._enqueued_at is not None:
+            self._enqueued_at.append(perf_counter())
+
+    def _evict(self) -> None:
+        self._queue.get_nowait()
+        self._queue.task_done()
+        if self._enqueued_at is not None:
+            self._enqueued_at.popleft()
+
+    async def get_batch(self, limit: int) -> list[T | Signal]:
+        batch = [await self._queue.get()]
+        self._queue.task_done()
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+            self._queue.task_done()
+        if self._enqueued_at is not None and self._metrics is not None:
+            now = perf_counter()
+            for _ in batch:
+                self._metrics.queue_time.observe(now - self._enqueued_at.popleft())
+        if self._putters:
+            self._wakeup_putters(len(batch))
+        return batch
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+
+@dataclass(frozen=True)
+class MailboxSpec:
+    """Describes the mailbox to create for a spawned actor."""
+
+    capacity: int | None = None
+    policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST
+    factory: Callable[[int | None, OverflowPolicy], Mailbox] = DequeMailbox
+
+    def create(self) -> Mailbox:
+        return self.factory(self.capacity, self.policy)
+
+
+class Mailboxes:
+    @staticmethod
+    def unbounded() -> MailboxSpec:
+        return MailboxSpec()
+
+    @staticmethod
+    def bounded(
+        capacity: int, policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST
+    ) -> MailboxSpec:
+        return MailboxSpec(capacity, policy)
+
+    @staticmethod
+    def queue(
+        capacity: int | None = None,
+        policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+    ) -> MailboxSpec:
+        """The `asyncio.Queue` based mailbox used before `DequeMailbox` became the default."""
+        return MailboxSpec(capacity, policy, QueueMailbox)
+
+    @staticmethod
+    def priority(
+        key: Callable[[Any], Any],
+        capacity: int | None = None,
+        policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+    ) -> MailboxSpec:
+        """Messages with smaller keys are delivered first; signals always come first."""
+        return MailboxSpec(capacity, policy, partial(PriorityMailbox, key=key))
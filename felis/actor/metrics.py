@@ -0,0 +1,126 @@
+import math
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Mapping
+
+# upper bounds in seconds, from 1us to 10s in a 1-2.5-5 series
+BUCKET_BOUNDS = tuple(
+    base * scale
+    for scale in (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+    for base in (1.0, 2.5, 5.0)
+) + (10.0, math.inf)
+
+
+@dataclass
+class HistogramSnapshot:
+    count: int
+    total: float
+    max: float
+    buckets: list[tuple[float, int]]
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket that holds the `q`-quantile."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in self.buckets:
+            seen += count
+            if count > 0 and seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Histogram:
+    """Histogram of durations in seconds with fixed logarithmic buckets."""
+
+    def __init__(self) -> None:
+        self._counts = [0] * len(BUCKET_BOUNDS)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(BUCKET_BOUNDS, value)] += 1
+        self._count += 1
+        self._total += value
+        if value > self._max:
+            self._max = value
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(
+            self._count,
+            self._total,
+            self._max,
+            list(zip(BUCKET_BOUNDS, self._counts)),
+        )
+
+
+@dataclass
+class MetricsSnapshot:
+    path: str
+    mailbox_depth: int
+    mailbox_high_water: int
+    processed: int
+    throughput: float
+    handler_time: HistogramSnapshot
+    queue_time: HistogramSnapshot
+    counters: dict[str, int] = field(default_factory=dict)
+
+
+class ActorMetrics:
+    """
+    Runtime metrics of a single actor. An actor only owns an instance if metrics are enabled,
+    so disabled collection costs a `None` check per tell and per batch.
+    `counters` is open for extensions to record their own events.
+    """
+
+    def __init__(self, window: float = 1.0) -> None:
+        self.high_water = 0
+        self.processed = 0
+        self.handler_time = Histogram()
+        self.queue_time = Histogram()
+        self.counters = dict[str, int]()
+        self._window = window
+        self._window_start = time.perf_counter()
+        self._window_processed = 0
+        self._throughput = 0.0
+
+    def on_enqueue(self, depth: int) -> None:
+        if depth > self.high_water:
+            self.high_water = depth
+
+    def on_processed(self, count: int, elapsed: float) -> None:
+        self.processed += count
+        self.handler_time.observe(elapsed)
+
+    def increment(self, counter: str, count: int = 1) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + count
+
+    @property
+    def throughput(self) -> float:
+        """Messages processed per second over the last complete window."""
+        now = time.perf_counter()
+        elapsed = now - self._window_start
+        if elapsed >= self._window:
+            self._throughput = (self.processed - self._window_processed) / elapsed
+            self._window_start = now
+            self._window_processed = self.processed
+        return self._throughput
+
+    def snapshot(
+        self, path: str, depth: int, counters: Mapping[str, int] | None = None
+    ) -> MetricsSnapshot:
+        return MetricsSnapshot(
+            path,
+            depth,
+            self.high_water,
+            self.processed,
+            self.throughput,
+            self.handler_time.snapshot(),
+            self.queue_time.snapshot(),
+            {**self.counters, **(counters or {})},
+        )
@@ -0,0 +1,382 @@
+import asyncio
+import os
+import pickle
+import sqlite3
+import struct
+import zlib
+from abc import ABC, abstractmethod
+from concurrent.futures import Future as ConcurrentFuture, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Generic, Iterable, TypeVar
+from urllib.parse import quote
+
+from .shutdown import ShutdownPhase
+from .signals import Signal
+from ..utils import Logger
+
+if TYPE_CHECKING:
+    from .context import ActorContext
+
+S = TypeVar("S")
+E = TypeVar("E")
+R = TypeVar("R")
+
+DEFAULT_SNAPSHOT_EVERY = 1000
+
+
+class Storage(ABC):
+    """
+    Storage: where persistent actors keep their journal of events and their latest
+    snapshot, as pickled payloads numbered by sequence number. Storages are blocking and
+    run every call on a single thread of their own, which keeps the calls in order.
+    """
+
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="felis-storage")
+
+    def submit(self, fn: Callable[..., R], *args: Any) -> ConcurrentFuture[R]:
+        return self._executor.submit(fn, *args)
+
+    async def flush(self) -> None:
+        """Waits until the calls submitted so far are done."""
+        await asyncio.wrap_future(self.submit(_noop))
+
+    @abstractmethod
+    def write_events(
+        self, persistence_id: str, events: list[tuple[int, bytes]]
+    ) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def read_events(
+        self, persistence_id: str, after: int
+    ) -> Iterable[tuple[int, bytes]]:
+        """The events with a sequence number greater than `after`, in order."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def delete_events(self, persistence_id: str, until: int) -> None:
+        """Deletes the events up to and including sequence number `until`."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def save_snapshot(self, persistence_id: str, sequence_nr: int, data: bytes) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def load_snapshot(self, persistence_id: str) -> tuple[int, bytes] | None:
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+
+def _noop() -> None:
+    pass
+
+
+class SqliteStorage(Storage):
+    """
+    Keeps journals and snapshots in a SQLite database. Written events survive a crash of
+    the process; the last ones may be lost in a crash of the system.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        super().__init__()
+        # the connection is only used from the storage thread
+        self._connection = self.submit(self._connect, str(path)).result()
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS journal "
+            "(persistence_id TEXT, sequence_nr INTEGER, payload BLOB, "
+            "PRIMARY KEY (persistence_id, sequence_nr)) WITHOUT ROWID"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots "
+            "(persistence_id TEXT PRIMARY KEY, sequence_nr INTEGER, payload BLOB)"
+        )
+        connection.commit()
+        return connection
+
+    def write_events(
+        self, persistence_id: str, events: list[tuple[int, bytes]]
+    ) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO journal VALUES (?, ?, ?)",
+                [(persistence_id, seq, payload) for seq, payload in events],
+            )
+
+    def read_events(
+        self, persistence_id: str, after: int
+    ) -> Iterable[tuple[int, bytes]]:
+        return self._connection.execute(
+            "SELECT sequence_nr, payload FROM journal "
+            "WHERE persistence_id = ? AND sequence_nr > ? ORDER BY sequence_nr",
+            (persistence_id, after),
+        ).fetchall()
+
+    def delete_events(self, persistence_id: str, until: int) -> None:
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM journal WHERE persistence_id = ? AND sequence_nr <= ?",
+                (persistence_id, until),
+            )
+
+    def save_snapshot(self, persistence_id: str, sequence_nr: int, data: bytes) -> None:
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)",
+                (persistence_id, sequence_nr, data),
+            )
+
+    def load_snapshot(self, persistence_id: str) -> tuple[int, bytes] | None:
+        return self._connection.execute(
+            "SELECT sequence_nr, payload FROM snapshots WHERE persistence_id = ?",
+            (persistence_id,),
+        ).fetchone()
+
+    def close(self) -> None:
+        self.submit(self._connection.close).result()
+        super().close()
+
+
+# sequence number, payload size and CRC32 of the payload of a journal record
+_RECORD = struct.Struct(">QII")
+
+
+def _scan(data: bytes) -> tuple[list[tuple[int, bytes]], int]:
+    """The complete records of a journal and the offset where they end."""
+    events = list[tuple[int, bytes]]()
+    offset = 0
+    while offset + _RECORD.size <= len(data):
+        seq, size, checksum = _RECORD.unpack_from(data, offset)
+        start = offset + _RECORD.size
+        payload = data[start : start + size]
+        if len(payload) < size or zlib.crc32(payload) != checksum:
+            break
+        events.append((seq, payload))
+        offset = start + size
+    return events, offset
+
+
+class FileStorage(Storage):
+    """
+    Keeps a journal file and a snapshot file per persistent actor in `directory`. A record
+    torn by a crash is cut off the journal when it is first opened, before anything is
+    appended to it. Written events survive a crash of the process; with `fsync` set, they
+    also survive a crash of the system, at the cost of a sync per write.
+    """
+
+    def __init__(self, directory: str | Path, fsync: bool = False) -> None:
+        super().__init__()
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._fsync = fsync
+        # journals checked for torn records since the storage was opened
+        self._checked = set[str]()
+
+    def _path(self, persistence_id: str, suffix: str) -> Path:
+        return self._directory / f"{quote(persistence_id, safe='')}.{suffix}"
+
+    def _journal(self, persistence_id: str) -> Path:
+        path = self._path(persistence_id, "journal")
+        if persistence_id not in self._checked:
+            self._checked.add(persistence_id)
+            if path.exists():
+                size = path.stat().st_size
+                _, end = _scan(path.read_bytes())
+                if end < size:
+                    Logger.instance.warning(
+                        f"Cut {size - end} bytes of a torn record off journal {path}."
+                    )
+                    os.truncate(path, end)
+        return path
+
+    def write_events(
+        self, persistence_id: str, events: list[tuple[int, bytes]]
+    ) -> None:
+        records = b"".join(
+            _RECORD.pack(seq, len(payload), zlib.crc32(payload)) + payload
+            for seq, payload in events
+        )
+        with open(self._journal(persistence_id), "ab") as file:
+            file.write(records)
+            if self._fsync:
+                file.flush()
+                os.fsync(file.fileno())
+
+    def read_events(
+        self, persistence_id: str, after: int
+    ) -> Iterable[tuple[int, bytes]]:
+        path = self._journal(persistence_id)
+        if not path.exists():
+            return []
+        events, _ = _scan(path.read_bytes())
+        return [(seq, payload) for seq, payload in events if seq > after]
+
+    def delete_events(self, persistence_id: str, until: int) -> None:
+        remaining = self.read_events(persistence_id, until)
+        path = self._journal(persistence_id)
+        temp = path.with_name(path.name + ".tmp")
+        with open(temp, "wb") as file:
+            for seq, payload in remaining:
+                file.write(
+                    _RECORD.pack(seq, len(payload), zlib.crc32(payload)) + payload
+                )
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp, path)
+
+    def save_snapshot(self, persistence_id: str, sequence_nr: int, data: bytes) -> None:
+        path = self._path(persistence_id, "snapshot")
+        temp = path.with_name(path.name + ".tmp")
+        with open(temp, "wb") as file:
+            file.write(struct.pack(">Q", sequence_nr) + data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp, path)
+
+    def load_snapshot(self, persistence_id: str) -> tuple[int, bytes] | None:
+        path = self._path(persistence_id, "snapshot")
+        if not path.exists():
+            return None
+        data = path.read_bytes()
+        return struct.unpack_from(">Q", data)[0], data[8:]
+
+
+class Storages:
+    @staticmethod
+    def sqlite(path: str | Path) -> SqliteStorage:
+        return SqliteStorage(path)
+
+    @staticmethod
+    def files(directory: str | Path, fsync: bool = False) -> FileStorage:
+        return FileStorage(directory, fsync)
+
+
+class RecoveryCompleted(Signal):
+    """Sent to a persistent actor once its state is recovered, or recovery failed."""
+
+    def __init__(self, error: BaseException | None = None) -> None:
+        self.error = error
+
+
+class Persistence(Generic[S, E]):
+    """
+    Persistence: the state of a persistent actor, changed only by persisting events.
+    `persist` applies an event to the state right away and queues it for the journal;
+    queued events are written in one batch after the actor handled the messages at hand.
+    The state is saved as a snapshot every `snapshot_every` events, after which the
+    journal is truncated, so recovery loads the snapshot and replays the events after it.
+    Queued events are written when the actor stops, and a shutdown of the actor system
+    waits for the storage to finish writing. Events of the last batch may be lost if the
+    process crashes.
+    """
+
+    def __init__(
+        self,
+        context: "ActorContext[Any]",
+        persistence_id: str,
+        storage: Storage,
+        empty: S,
+        on_event: Callable[[S, E], S],
+        snapshot_every: int | None = DEFAULT_SNAPSHOT_EVERY,
+    ) -> None:
+        self._context = context
+        self._persistence_id = persistence_id
+        self._storage = storage
+        self._on_event = on_event
+        self._snapshot_every = snapshot_every
+        self._state = empty
+        self._sequence_nr = 0
+        self._snapshot_nr = 0
+        self._pending = list[tuple[int, bytes]]()
+        context._task.add_done_callback(lambda _: self._flush())
+        context.system.coordinated_shutdown.add_task(
+            ShutdownPhase.FLUSH, f"storage-{id(storage)}", storage.flush
+        )
+
+    @property
+    def persistence_id(self) -> str:
+        return self._persistence_id
+
+    @property
+    def state(self) -> S:
+        return self._state
+
+    @property
+    def sequence_nr(self) -> int:
+        """The sequence number of the last persisted event."""
+        return self._sequence_nr
+
+    def persist(self, event: E) -> S:
+        """Applies `event` to the state and queues it for the journal."""
+        self._state = self._on_event(self._state, event)
+        self._sequence_nr += 1
+        if len(self._pending) == 0:
+            self._context.loop.call_soon(self._flush)
+        self._pending.append((self._sequence_nr, pickle.dumps(event)))
+        if (
+            self._snapshot_every is not None
+            and self._sequence_nr - self._snapshot_nr >= self._snapshot_every
+        ):
+            self.snapshot()
+        return self._state
+
+    def snapshot(self) -> None:
+        """Saves the current state and truncates the journal up to it."""
+        self._flush()
+        self._snapshot_nr = self._sequence_nr
+        self._submit(
+            self._save_snapshot,
+            self._persistence_id,
+            self._sequence_nr,
+            pickle.dumps(self._state),
+        )
+
+    def _save_snapshot(
+        self, persistence_id: str, sequence_nr: int, data: bytes
+    ) -> None:
+        self._storage.save_snapshot(persistence_id, sequence_nr, data)
+        self._storage.delete_events(persistence_id, sequence_nr)
+
+    def _flush(self) -> None:
+        if len(self._pending) == 0:
+            return
+        events, self._pending = self._pending, []
+        self._submit(self._storage.write_events, self._persistence_id, events)
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        self._storage.submit(fn, *args).add_done_callback(self._on_written)
+
+    def _on_written(self, future: ConcurrentFuture[Any]) -> None:
+        error = future.exception()
+        if error is not None:
+            Logger.instance.error(
+                f"Persisting {self._persistence_id} failed: [exception={error.__class__.__name__},message={error}]"
+            )
+
+    async def recover(self) -> None:
+        """Loads the latest snapshot and replays the events after it."""
+        loop = asyncio.get_running_loop()
+        snapshot, events = await asyncio.wrap_future(
+            self._storage.submit(self._load), loop=loop
+        )
+        if snapshot is not None:
+            self._snapshot_nr, data = snapshot
+            self._sequence_nr = self._snapshot_nr
+            self._state = pickle.loads(data)
+        for sequence_nr, data in events:
+            self._state = self._on_event(self._state, pickle.loads(data))
+            self._sequence_nr = sequence_nr
+
+    def _load(self) -> tuple[tuple[int, bytes] | None, list[tuple[int, bytes]]]:
+        snapshot = self._storage.load_snapshot(self._persistence_id)
+        after = 0 if snapshot is None else snapshot[0]
+        return snapshot, list(self._storage.read_events(self._persistence_id, after))
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from itertools import count
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .context import ActorContext
+    from .system import ActorSystem
+
+
+class EventLoopThread:
+    """An event loop running forever on a daemon thread."""
+
+    def __init__(self, name: str) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._started.set)
+        try:
+            self.loop.run_forever()
+            # cancel the actors still running on this loop and let them finish up
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            if len(tasks) > 0:
+                self.loop.run_until_complete(
+                    asyncio.gather(*tasks, return_exceptions=True)
+                )
+        finally:
+            self.loop.close()
+
+    def stop(self) -> None:
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+
+class Placement(ABC):
+    """Placement selects the event loop a spawned actor runs on."""
+
+    @abstractmethod
+    def select(
+        self, system: "ActorSystem[Any]", parent: "ActorContext[Any] | None"
+    ) -> asyncio.AbstractEventLoop:
+        raise NotImplementedError()
+
+
+class InheritPlacement(Placement):
+    """Places actors on the loop of their parent."""
+
+    def select(
+        self, system: "ActorSystem[Any]", parent: "ActorContext[Any] | None"
+    ) -> asyncio.AbstractEventLoop:
+        if parent is None:
+            return system.io_loop
+        return parent.loop
+
+
+class IOPlacement(Placement):
+    """Places actors on the loop the actor system was started on."""
+
+    def select(
+        self, system: "ActorSystem[Any]", parent: "ActorContext[Any] | None"
+    ) -> asyncio.AbstractEventLoop:
+        return system.io_loop
+
+
+class RoundRobinPlacement(Placement):
+    """Spreads actors over the isolated loops, or uses the I/O loop if there are none."""
+
+    def __init__(self) -> None:
+        self._next = count()
+
+    def select(
+        self, system: "ActorSystem[Any]", parent: "ActorContext[Any] | None"
+    ) -> asyncio.AbstractEventLoop:
+        loops = system.isolated_loops
+        if len(loops) == 0:
+            return system.io_loop
+        return loops[next(self._next) % len(loops)]
+
+
+class IsolatedPlacement(Placement):
+    """Places actors on a fixed isolated loop, or on the I/O loop if there are none."""
+
+    def __init__(self, index: int) -> None:
+        self._index = index
+
+    def select(
+        self, system: "ActorSystem[Any]", parent: "ActorContext[Any] | None"
+    ) -> asyncio.AbstractEventLoop:
+        loops = system.isolated_loops
+        if len(loops) == 0:
+            return system.io_loop
+        return loops[self._index % len(loops)]
+
+
+class Placements:
+    @staticmethod
+    def inherit() -> Placement:
+        return InheritPlacement()
+
+    @staticmethod
+    def io() -> Placement:
+        return IOPlacement()
+
+    @staticmethod
+    def round_robin() -> Placement:
+        return RoundRobinPlacement()
+
+    @staticmethod
+    def isolated(index: int) -> Placement:
+        return IsolatedPlacement(index)
@@ -0,0 +1,546 @@
+import asyncio
+import hashlib
+import hmac
+import io
+import os
+import pickle
+import struct
+import threading
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+from typing import TYPE_CHECKING, Any, Iterator
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel
+
+from .actor import ActorRef
+from .future import Future
+from .signals import Signal
+from .internal.receptionist import PeerJoined, PeerLeft, ReceptionistRequest
+from ..utils import Logger
+
+if TYPE_CHECKING:
+    from .system import ActorSystem
+
+SCHEME = "felis"
+
+_LENGTH = struct.Struct("!I")
+
+CHALLENGE_SIZE = 32
+HANDSHAKE_TIMEOUT = 5.0
+
+
+class RemoteConfig(BaseModel):
+    node: str
+    # "tcp://host:port" or "unix:///path/to/socket", port 0 picks a free port
+    address: str = "tcp://127.0.0.1:25570"
+    # addresses of the nodes to join on startup, by node name
+    peers: dict[str, str] = {}
+    # connections per peer, messages to the same actor always share a connection
+    connections: int = 1
+    # maximum number of messages written in one frame
+    batch_size: int = 256
+    # messages buffered per connection while the peer is unreachable
+    buffer_size: int = 10000
+    max_frame_size: int = 16 * 1024 * 1024
+    retry_interval: float = 1.0
+    # shared by all nodes, which prove they know it before their messages are read
+    secret: str | None = None
+
+
+def format_address(node: str, path: str) -> str:
+    return f"{SCHEME}://{node}{path}"
+
+
+def parse_address(address: str) -> tuple[str, str]:
+    """Splits `felis://node/path` into the node and the actor path on that node."""
+    url = urlsplit(address)
+    if url.scheme != SCHEME or not url.netloc:
+        raise ValueError(f"Invalid actor address: {address}")
+    return url.netloc, url.path
+
+
+@dataclass
+class Hello:
+    node: str
+    address: str
+    receptionist: ActorRef[ReceptionistRequest]
+
+
+@dataclass
+class Completion:
+    token: int
+    result: Any
+    error: Exception | None
+
+
+class RemoteActorRef:
+    """A ref to an actor on another node, addressed as `felis://node/path`."""
+
+    __slots__ = ("_remoting", "_node", "_path")
+
+    def __init__(self, remoting: "Remoting", node: str, path: str) -> None:
+        self._remoting = remoting
+        self._node = node
+        self._path = path
+
+    @property
+    def node(self) -> str:
+        return self._node
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def address(self) -> str:
+        return format_address(self._node, self._path)
+
+    @property
+    def name(self) -> str:
+        return self._path.rsplit("/", 1)[-1]
+
+    def tell(self, message: Any) -> None:
+        self._remoting.send(self._node, self._path, message)
+
+    async def tell_async(self, message: Any) -> None:
+        self.tell(message)
+
+    def receive_signal(self, signal: Signal) -> None:
+        """Sends `signal`, which is delivered as a signal on the other node."""
+        self._remoting.send(self._node, self._path, signal)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, RemoteActorRef)
+            and self._node == other._node
+            and self._path == other._path
+        )
+
+    def __hash__(self) -> int:
+        return hash((self._node, self._path))
+
+    def __repr__(self) -> str:
+        return f"RemoteActorRef[address={self.address}]"
+
+
+class RemoteFuture:
+    """Stand-in for a `Future` of another node, completing it over the connection."""
+
+    def __init__(self, remoting: "Remoting", node: str, token: int) -> None:
+        self._remoting = remoting
+        self._node = node
+        self._token = token
+
+    def set_result(self, result: Any) -> None:
+        self._remoting.send(self._node, "", Completion(self._token, result, None))
+
+    def set_exception(self, exception: Exception) -> None:
+        self._remoting.send(self._node, "", Completion(self._token, None, exception))
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file: io.BytesIO, remoting: "Remoting") -> None:
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._remoting = remoting
+
+    def persistent_id(self, obj: Any) -> Any:
+        return self._remoting._persistent_id(obj)
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, remoting: "Remoting") -> None:
+        super().__init__(file)
+        self._remoting = remoting
+
+    def persistent_load(self, pid: Any) -> Any:
+        return self._remoting._persistent_load(pid)
+
+
+def _digest(secret: str, challenge: bytes) -> bytes:
+    return hmac.new(secret.encode(), challenge, hashlib.sha256).digest()
+
+
+def encode_frame(records: list[bytes]) -> bytes:
+    body = b"".join(_LENGTH.pack(len(record)) + record for record in records)
+    return _LENGTH.pack(len(body)) + body
+
+
+async def read_frame(reader: asyncio.StreamReader, limit: int) -> Iterator[memoryview]:
+    (size,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    if size > limit:
+        raise ConnectionError(f"Frame of {size} bytes exceeds {limit} bytes")
+    body = memoryview(await reader.readexactly(size))
+    return _records(body)
+
+
+def _records(body: memoryview) -> Iterator[memoryview]:
+    offset = 0
+    while offset < len(body):
+        (length,) = _LENGTH.unpack_from(body, offset)
+        offset += _LENGTH.size
+        yield body[offset : offset + length]
+        offset += length
+
+
+class _Connection:
+    """
+    An outgoing connection to a peer. Messages are queued and written by a single task,
+    which packs everything queued since its last write into one frame.
+    """
+
+    def __init__(self, remoting: "Remoting", node: str) -> None:
+        self._remoting = remoting
+        self._node = node
+        self._pending = deque[tuple[str, Any]]()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def send(self, path: str, message: Any) -> None:
+        if len(self._pending) >= self._remoting.config.buffer_size:
+            self._remoting.dead_letter(self._node, path, message)
+            return
+        self._pending.append((path, message))
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        remoting = self._remoting
+        config = remoting.config
+        while True:
+            try:
+                reader, writer = await remoting._connect(self._node)
+            except (OSError, ValueError) as e:
+                Logger.instance.debug(f"Failed to connect to {self._node}: {e}")
+                await asyncio.sleep(config.retry_interval)
+                continue
+            try:
+                await remoting._respond(reader, writer)
+                writer.write(encode_frame([remoting._encode("", remoting._hello())]))
+                while True:
+                    if len(self._pending) == 0:
+                        self._wakeup.clear()
+                        await self._wakeup.wait()
+                    records = list[bytes]()
+                    while len(self._pending) > 0 and len(records) < config.batch_size:
+                        path, message = self._pending.popleft()
+                        record = remoting._encode_message(self._node, path, message)
+                        if record is not None:
+                            records.append(record)
+                    if len(records) > 0:
+                        writer.write(encode_frame(records))
+                        await writer.drain()
+            except ConnectionError as e:
+                Logger.instance.warning(f"Lost connection to {self._node}: {e}")
+            finally:
+                writer.close()
+            await asyncio.sleep(config.retry_interval)
+
+    def close(self) -> None:
+        self._task.cancel()
+        for path, message in self._pending:
+            self._remoting.dead_letter(self._node, path, message)
+        self._pending.clear()
+
+
+class Remoting:
+    """
+    Remoting: sends messages to actors of other actor systems, called nodes, over TCP or
+    Unix sockets. Refs inside messages are sent as `felis://node/path` addresses and
+    become `RemoteActorRef`s on the receiving node, futures become `RemoteFuture`s, and
+    everything else is pickled. Unpickling runs code of the sender's choosing, so with
+    `secret` set a node only reads messages from connections that answered a random
+    challenge with its HMAC under the secret. Without one, anything that reaches the
+    address is trusted; only leave it unset on a trusted network.
+    Delivery is at most once: messages in flight when a connection breaks are lost, and
+    messages that cannot be sent or delivered go to dead letters.
+    """
+
+    def __init__(self, system: "ActorSystem[Any]", config: RemoteConfig) -> None:
+        self._system = system
+        self._config = config
+        self._address = config.address
+        self._addresses = dict(config.peers)
+        self._connections = dict[str, list[_Connection]]()
+        self._inbound = dict[str, int]()
+        self._writers = set[asyncio.StreamWriter]()
+        self._futures = dict[int, Future[Any]]()
+        self._tokens = count()
+        self._server: asyncio.AbstractServer | None = None
+        self._loop = system.io_loop
+        self._thread = threading.get_ident()
+
+    @property
+    def node(self) -> str:
+        return self._config.node
+
+    @property
+    def address(self) -> str:
+        """The address this node listens on."""
+        return self._address
+
+    @property
+    def config(self) -> RemoteConfig:
+        return self._config
+
+    @property
+    def peers(self) -> list[str]:
+        return list(self._addresses)
+
+    async def start(self) -> None:
+        url = urlsplit(self._config.address)
+        if url.scheme == "unix":
+            self._server = await asyncio.start_unix_server(self._serve, url.path)
+        elif url.scheme == "tcp":
+            self._server = await asyncio.start_server(
+                self._serve, url.hostname, url.port
+            )
+            port = self._server.sockets[0].getsockname()[1]
+            self._address = f"tcp://{url.hostname}:{port}"
+        else:
+            raise ValueError(f"Unsupported address: {self._config.address}")
+        Logger.instance.info(f"Node {self.node} listening on {self._address}.")
+        if self._config.secret is None:
+            Logger.instance.warning(
+                f"Node {self.node} has no secret, it runs messages from anyone reaching {self._address}."
+            )
+        for node in self._addresses:
+            self._pool(node)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        for writer in self._writers:
+            writer.close()
+        for pool in self._connections.values():
+            for connection in pool:
+                connection.close()
+        self._connections.clear()
+
+    def address_of(self, ref: ActorRef[Any] | RemoteActorRef) -> str:
+        if isinstance(ref, RemoteActorRef):
+            return ref.address
+        return format_address(self.node, ref.path)
+
+    def ref(self, address: str) -> ActorRef[Any] | RemoteActorRef:
+        """Resolves an address to a local ref if it is on this node and alive."""
+        node, path = parse_address(address)
+        if node == self.node:
+            ref = self._system.find(path)
+            if ref is not None:
+                return ref
+        return RemoteActorRef(self, node, path)
+
+    def send(self, node: str, path: str, message: Any) -> None:
+        if threading.get_ident() != self._thread:
+            self._loop.call_soon_threadsafe(self.send, node, path, message)
+            return
+        if node == self.node:
+            self._deliver(path, message)
+            return
+        if node not in self._addresses:
+            Logger.instance.warning(f"Unknown node {node}, dropping message to {path}.")
+            self.dead_letter(node, path, message)
+            return
+        pool = self._pool(node)
+        pool[hash(path) % len(pool)].send(path, message)
+
+    def dead_letter(self, node: str, path: str, message: Any) -> None:
+        self._system.dead_letter(message, RemoteActorRef(self, node, path))
+
+    def _pool(self, node: str) -> list[_Connection]:
+        pool = self._connections.get(node)
+        if pool is None:
+            pool = [_Connection(self, node) for _ in range(self._config.connections)]
+            self._connections[node] = pool
+        return pool
+
+    async def _connect(
+        self, node: str
+    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        url = urlsplit(self._addresses[node])
+        if url.scheme == "unix":
+            return await asyncio.open_unix_connection(url.path)
+        if url.scheme == "tcp":
+            return await asyncio.open_connection(url.hostname, url.port)
+        raise ValueError(f"Unsupported address of {node}: {self._addresses[node]}")
+
+    async def _challenge(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> bool:
+        """Checks that the peer of an inbound connection knows the secret."""
+        secret = self._config.secret
+        if secret is None:
+            return True
+        challenge = os.urandom(CHALLENGE_SIZE)
+        writer.write(challenge)
+        await writer.drain()
+        try:
+            response = await asyncio.wait_for(
+                reader.readexactly(hashlib.sha256().digest_size), HANDSHAKE_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            return False
+        return hmac.compare_digest(response, _digest(secret, challenge))
+
+    async def _respond(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answers the challenge of the peer of an outbound connection."""
+        secret = self._config.secret
+        if secret is None:
+            return
+        try:
+            challenge = await asyncio.wait_for(
+                reader.readexactly(CHALLENGE_SIZE), HANDSHAKE_TIMEOUT
+            )
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            raise ConnectionError("No challenge from peer, is its secret set?") from e
+        writer.write(_digest(secret, challenge))
+
+    def _hello(self) -> Hello:
+        return Hello(self.node, self._address, self._system.receptionist)
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        node: str | None = None
+        self._writers.add(writer)
+        try:
+            if not await self._challenge(reader, writer):
+                peer = writer.get_extra_info("peername")
+                Logger.instance.warning(
+                    f"Rejected connection from {peer}: wrong or missing secret."
+                )
+                return
+            while True:
+                records = await read_frame(reader, self._config.max_frame_size)
+                for record in records:
+                    decoded = self._decode(record)
+                    if decoded is None:
+                        continue
+                    path, message = decoded
+                    if path != "":
+                        self._deliver(path, message)
+                    elif isinstance(message, Hello):
+                        node = message.node
+                        self._on_hello(message)
+                    elif isinstance(message, Completion):
+                        self._complete(message)
+        except (asyncio.IncompleteReadError, asyncio.CancelledError):
+            # the handler task is owned by the server, which fails on cancelled handlers
+            pass
+        except ConnectionError as e:
+            Logger.instance.warning(f"Connection from {node} failed: {e}")
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            if node is not None:
+                self._on_disconnect(node)
+
+    def _on_hello(self, hello: Hello) -> None:
+        self._addresses[hello.node] = hello.address
+        self._inbound[hello.node] = self._inbound.get(hello.node, 0) + 1
+        # connect back, so that the peer learns about this node as well
+        self._pool(hello.node)
+        receptionist = self._system.receptionist
+        if receptionist.ref.is_alive:
+            receptionist.tell(PeerJoined(hello.node, hello.receptionist))
+        Logger.instance.info(f"Node {hello.node} joined from {hello.address}.")
+
+    def _on_disconnect(self, node: str) -> None:
+        self._inbound[node] -= 1
+        if self._inbound[node] > 0:
+            return
+        del self._inbound[node]
+        receptionist = self._system.receptionist
+        if receptionist.ref.is_alive:
+            receptionist.tell(PeerLeft(node))
+        self._system.event_stream.unsubscribe_node(node)
+        Logger.instance.info(f"Node {node} left.")
+        if node not in self._config.peers:
+            # only configured peers are reconnected to
+            for connection in self._connections.pop(node, []):
+                connection.close()
+            self._addresses.pop(node, None)
+
+    def _deliver(self, path: str, message: Any) -> None:
+        ref = self._system.find(path)
+        if ref is None:
+            self.dead_letter(self.node, path, message)
+            return
+        try:
+            if isinstance(message, Signal):
+                ref.receive_signal(message)
+            else:
+                ref.tell(message)
+        except RuntimeError:
+            self.dead_letter(self.node, path, message)
+
+    def _complete(self, completion: Completion) -> None:
+        future = self._futures.get(completion.token)
+        if future is None:
+            return
+        if completion.error is not None:
+            future.set_exception(completion.error)
+        else:
+            future.set_result(completion.result)
+
+    def _encode(self, path: str, message: Any) -> bytes:
+        buffer = io.BytesIO()
+        _Pickler(buffer, self).dump((path, message))
+        return buffer.getvalue()
+
+    def _encode_message(self, node: str, path: str, message: Any) -> bytes | None:
+        try:
+            return self._encode(path, message)
+        except Exception as e:
+            Logger.instance.error(
+                f"Failed to serialize message to {format_address(node, path)}: "
+                f"[exception={e.__class__.__name__},message={e}]"
+            )
+            self.dead_letter(node, path, message)
+            return None
+
+    def _decode(self, record: memoryview) -> tuple[str, Any] | None:
+        try:
+            return _Unpickler(io.BytesIO(record), self).load()
+        except Exception as e:
+            Logger.instance.error(
+                f"Failed to deserialize message: "
+                f"[exception={e.__class__.__name__},message={e}]"
+            )
+            return None
+
+    def _persistent_id(self, obj: Any) -> Any:
+        if type(obj) is ActorRef:
+            return ("ref", self.node, obj.path)
+        if type(obj) is RemoteActorRef:
+            return ("ref", obj.node, obj.path)
+        if isinstance(obj, Future):
+            token = next(self._tokens)
+            self._futures[token] = obj
+            obj.add_done_callback(
+                lambda _: self._loop.call_soon_threadsafe(
+                    self._futures.pop, token, None
+                )
+            )
+            return ("future", self.node, token)
+        if type(obj) is RemoteFuture:
+            return ("future", obj._node, obj._token)
+        return None
+
+    def _persistent_load(self, pid: Any) -> Any:
+        kind, node, value = pid
+        if kind == "ref":
+            if node == self.node:
+                ref = self._system.find(value)
+                if ref is not None:
+                    return ref
+            return RemoteActorRef(self, node, value)
+        if kind == "future":
+            if node == self.node and value in self._futures:
+                return self._futures[value]
+            return RemoteFuture(self, node, value)
+        raise pickle.UnpicklingError(f"Unknown persistent id: {pid}")
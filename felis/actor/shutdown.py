@@ -0,0 +1,145 @@
+import asyncio
+from dataclasses import dataclass, field
+from enum import Enum
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from ..utils import Logger
+
+if TYPE_CHECKING:
+    from .actor import ActorRef
+    from .system import ActorSystem
+
+DEFAULT_DRAIN_TIMEOUT = 10.0
+DEFAULT_TASK_TIMEOUT = 5.0
+DRAIN_POLL_INTERVAL = 0.01
+
+
+class ShutdownPhase(Enum):
+    STOP_INGEST = "stop_ingest"
+    # runs after every actor stopped
+    FLUSH = "flush"
+    CLOSE = "close"
+
+
+@dataclass
+class ShutdownReport:
+    """
+    ShutdownReport: what happened to the messages of the actors during a shutdown.
+    `completed` messages were handled after the shutdown started; `dropped` ones were
+    still in mailboxes or async handlers when the actors were stopped.
+    """
+
+    completed: int = 0
+    dropped: int = 0
+    # whether the actors to drain went idle before the deadline
+    drained: bool = True
+    failed_tasks: list[str] = field(default_factory=list)
+
+
+class CoordinatedShutdown:
+    """
+    CoordinatedShutdown: stops an actor system in phases.
+    1. The tasks of `ShutdownPhase.STOP_INGEST` stop messages from coming in.
+    2. The actors added with `add_drain` are drained in the order they were added, until
+       all of them are idle or `drain_timeout` passed. Messages they send each other are
+       handled as well, since every pass checks all of them again.
+    3. Every actor of the system is stopped.
+    4. The tasks of `ShutdownPhase.FLUSH`, then of `ShutdownPhase.CLOSE` run.
+    Tasks of a phase run concurrently on the I/O loop, each within `task_timeout`.
+    """
+
+    def __init__(self, system: "ActorSystem[Any]") -> None:
+        self._system = system
+        self._tasks = {
+            phase: dict[str, Callable[[], Awaitable[None]]]() for phase in ShutdownPhase
+        }
+        self._drain: list["ActorRef[Any]"] = []
+        self._started: asyncio.Task[ShutdownReport] | None = None
+
+    def add_task(
+        self, phase: ShutdownPhase, name: str, task: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Adds `task` to `phase`, replacing a task of the same name."""
+        self._tasks[phase][name] = task
+
+    def remove_task(self, phase: ShutdownPhase, name: str) -> None:
+        self._tasks[phase].pop(name, None)
+
+    def add_drain(self, actor: "ActorRef[Any]") -> None:
+        """Drains `actor` after the actors added before it."""
+        if actor not in self._drain:
+            self._drain.append(actor)
+
+    @property
+    def is_started(self) -> bool:
+        return self._started is not None
+
+    def run(
+        self,
+        drain_timeout: float = DEFAULT_DRAIN_TIMEOUT,
+        task_timeout: float = DEFAULT_TASK_TIMEOUT,
+    ) -> "asyncio.Task[ShutdownReport]":
+        """Starts the shutdown once; later calls return the same task."""
+        if self._started is None:
+            self._started = self._system.io_loop.create_task(
+                self._run(drain_timeout, task_timeout)
+            )
+        return self._started
+
+    async def _run(self, drain_timeout: float, task_timeout: float) -> ShutdownReport:
+        report = ShutdownReport()
+        contexts = list(self._system._walk(self._system._context))
+        processed = {context: context.self.ref.processed for context in contexts}
+        await self._run_phase(ShutdownPhase.STOP_INGEST, task_timeout, report)
+        report.drained = await self._drain_all(monotonic() + drain_timeout)
+        for context in self._system._walk(self._system._context):
+            report.completed += context.self.ref.processed - processed.get(context, 0)
+        report.dropped = await self._stop_all()
+        await self._run_phase(ShutdownPhase.FLUSH, task_timeout, report)
+        await self._run_phase(ShutdownPhase.CLOSE, task_timeout, report)
+        Logger.instance.info(
+            f"Shut down actor system {self._system.root.path}: "
+            f"[completed={report.completed},dropped={report.dropped},drained={report.drained}]"
+        )
+        return report
+
+    async def _run_phase(
+        self, phase: ShutdownPhase, timeout: float, report: ShutdownReport
+    ) -> None:
+        tasks = list(self._tasks[phase].items())
+        results = await asyncio.gather(
+            *(asyncio.wait_for(task(), timeout) for _, task in tasks),
+            return_exceptions=True,
+        )
+        for (name, _), result in zip(tasks, results):
+            if isinstance(result, BaseException):
+                report.failed_tasks.append(name)
+                Logger.instance.error(
+                    f"Shutdown task {name} of phase {phase.value} failed: [exception={result.__class__.__name__},message={result}]"
+                )
+
+    async def _drain_all(self, deadline: float) -> bool:
+        # refs of actors on other nodes can't be drained from here
+        actors = [ref.ref for ref in self._drain if hasattr(ref, "ref")]
+        while True:
+            busy = False
+            for actor in actors:
+                while actor.is_alive and actor.pending > 0:
+                    busy = True
+                    if monotonic() >= deadline:
+                        return False
+                    await asyncio.sleep(DRAIN_POLL_INTERVAL)
+            if not busy:
+                return True
+
+    async def _stop_all(self) -> int:
+        dropped = 0
+        contexts = list(self._system._walk(self._system._context))
+        for context in reversed(contexts):
+            dropped += context.self.ref.pending
+            context._cancel()
+        await asyncio.gather(
+            *(context._stopped() for context in contexts), return_exceptions=True
+        )
+        return dropped
@@ -13,3 +13,9 @@ class Signal:
 class Terminated(Signal):
     def __init__(self, ref: "ActorRef[Any]") -> None:
         self.ref = ref
+
+
+class Passivate(Signal):
+    """Sent to an entity before it is stopped for being idle or evicted."""
+
+    pass
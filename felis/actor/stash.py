@@ -0,0 +1,65 @@
+from collections import deque
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from .signals import Signal
+
+if TYPE_CHECKING:
+    from .behavior import Behavior
+    from .context import ActorContext
+
+T = TypeVar("T")
+
+DEFAULT_STASH_CAPACITY = 1000
+
+
+class StashBuffer(Generic[T]):
+    """
+    StashBuffer: holds messages an actor is not ready to handle yet, up to `capacity`.
+    Messages stashed while the buffer is full go to dead letters and are counted as
+    `stash_overflow` in the metrics of the actor.
+    """
+
+    def __init__(self, context: "ActorContext[T]", capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("Stash capacity must be positive")
+        self._context = context
+        self._capacity = capacity
+        self._messages = deque[T | Signal]()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def is_empty(self) -> bool:
+        return len(self._messages) == 0
+
+    def is_full(self) -> bool:
+        return len(self._messages) >= self._capacity
+
+    def stash(self, message: T | Signal) -> bool:
+        """Stashes `message`, or returns False if the buffer is full."""
+        if len(self._messages) >= self._capacity:
+            actor = self._context.self.ref
+            if actor.metrics is not None:
+                actor.metrics.increment("stash_overflow")
+            self._context.system.dead_letter(message, self._context.self)
+            return False
+        self._messages.append(message)
+        return True
+
+    def unstash_all(self, behavior: "Behavior[T]") -> "Behavior[T]":
+        """
+        Empties the buffer and returns `behavior`, which can also be `Behaviors.same`. The
+        actor handles the stashed messages with it in stash order, before any message
+        that is still in its mailbox. Call it from a message handler and return the result.
+        """
+        if len(self._messages) > 0:
+            messages, self._messages = self._messages, deque()
+            self._context.self.ref._unstash(messages)
+        return behavior
+
+    def clear(self) -> None:
+        self._messages.clear()
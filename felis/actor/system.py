@@ -1,25 +1,147 @@
-from typing import Generic, TypeVar
+import asyncio
+from typing import Any, Generic, Iterator, Sequence, TypeVar
 
 from .actor import ActorRef
 from .context import ActorContext
 from .behavior import Behavior
+from .event_stream import EventStream
+from .metrics import MetricsSnapshot
+from .placement import EventLoopThread, Placement, Placements
+from .internal.dead_letters import DeadLetter, DeadLetters
+from .remote import RemoteConfig, Remoting
+from .shutdown import (
+    DEFAULT_DRAIN_TIMEOUT,
+    DEFAULT_TASK_TIMEOUT,
+    CoordinatedShutdown,
+    ShutdownReport,
+)
 from .internal.receptionist import Receptionist, ReceptionistRequest
 
 T = TypeVar("T")
 
 
 class ActorSystem(Generic[T]):
-    def __init__(self, behavior: Behavior[T], name: str) -> None:
+    """
+    ActorSystem: the root of an actor tree. It runs on the loop it is created on, the I/O
+    loop, and can start `isolated_loops` additional event loops on their own threads.
+    Actors are placed on loops by `placement`, which keeps them on the loop of their parent
+    unless configured otherwise. Isolated loops keep actors that hog their loop from
+    delaying the I/O of the system; they share the GIL with it, so they don't run actors in
+    parallel, and cost a thread hop for every message that crosses loops.
+    Actors publish and subscribe to events of the system with `event_stream`.
+    `shutdown` stops the system gracefully, see `CoordinatedShutdown`.
+    With `remote` set, the system becomes a node that exchanges messages with the actor
+    systems of other processes or hosts, see `Remoting`.
+    """
+
+    def __init__(
+        self,
+        behavior: Behavior[T],
+        name: str,
+        metrics: bool = False,
+        isolated_loops: int = 0,
+        placement: Placement | None = None,
+        remote: RemoteConfig | None = None,
+    ) -> None:
+        self._metrics_enabled = metrics
+        self._io_loop = asyncio.get_running_loop()
+        self._isolated = [
+            EventLoopThread(f"{name}-isolated-{i}") for i in range(isolated_loops)
+        ]
+        self._isolated_loops = [thread.loop for thread in self._isolated]
+        self._placement = placement or Placements.inherit()
+        self._remoting = None if remote is None else Remoting(self, remote)
+        self._event_stream = EventStream()
+        self._coordinated_shutdown = CoordinatedShutdown(self)
         context = ActorContext.of(name, behavior, self)
         self._context = context
         self._root = context.self
         self._receptionist = context.spawn(Receptionist.apply(), "system_receptionist")
+        self._dead_letters = context.spawn(DeadLetters.apply(), "system_dead_letters")
         context.log(
             f"Started actor system {self._root.path} with receptionist {self._receptionist.path}."
         )
+        if self._remoting is not None:
+            self._remoting_task = self._io_loop.create_task(self._remoting.start())
 
     async def wait(self) -> None:
-        await self._context.wait()
+        try:
+            await self._context.wait()
+        finally:
+            if self._remoting is not None:
+                await self._remoting.close()
+            for thread in self._isolated:
+                thread.stop()
+
+    async def shutdown(
+        self,
+        drain_timeout: float = DEFAULT_DRAIN_TIMEOUT,
+        task_timeout: float = DEFAULT_TASK_TIMEOUT,
+    ) -> ShutdownReport:
+        """
+        Drains and stops every actor of the system, reporting how many messages were
+        completed and dropped. Only the first call starts the shutdown.
+        """
+        return await self._coordinated_shutdown.run(drain_timeout, task_timeout)
+
+    @property
+    def coordinated_shutdown(self) -> CoordinatedShutdown:
+        return self._coordinated_shutdown
+
+    @property
+    def io_loop(self) -> asyncio.AbstractEventLoop:
+        return self._io_loop
+
+    @property
+    def isolated_loops(self) -> Sequence[asyncio.AbstractEventLoop]:
+        return self._isolated_loops
+
+    @property
+    def placement(self) -> Placement:
+        return self._placement
+
+    @property
+    def remoting(self) -> Remoting | None:
+        return self._remoting
+
+    @property
+    def metrics_enabled(self) -> bool:
+        return self._metrics_enabled
+
+    def metrics(self, path: str | None = None) -> dict[str, MetricsSnapshot]:
+        """
+        Collects metrics of all actors that record them, keyed by actor path.
+        If `path` is given, only the actor at `path` and its descendants are included.
+        """
+        snapshots = dict[str, MetricsSnapshot]()
+        for context in self._walk(self._context):
+            ref = context.self
+            if path is not None and not (
+                ref.path == path or ref.path.startswith(path.rstrip("/") + "/")
+            ):
+                continue
+            snapshot = ref.ref.snapshot()
+            if snapshot is not None:
+                snapshots[ref.path] = snapshot
+        return snapshots
+
+    def find(self, path: str) -> ActorRef[Any] | None:
+        """Looks up a live actor of this system by its path."""
+        names = path.strip("/").split("/")
+        context = self._context
+        if names[0] != context.self.name:
+            return None
+        for name in names[1:]:
+            child = context._children.get(name)
+            if child is None:
+                return None
+            context = child
+        return context.self
+
+    def _walk(self, context: ActorContext[Any]) -> Iterator[ActorContext[Any]]:
+        yield context
+        for child in list(context._children.values()):
+            yield from self._walk(child)
 
     @property
     def root(self) -> ActorRef[T]:
@@ -28,3 +150,15 @@ class ActorSystem(Generic[T]):
     @property
     def receptionist(self) -> ActorRef[ReceptionistRequest]:
         return self._receptionist
+
+    @property
+    def event_stream(self) -> EventStream:
+        return self._event_stream
+
+    @property
+    def dead_letters(self) -> ActorRef[DeadLetter]:
+        return self._dead_letters
+
+    def dead_letter(self, message: Any, recipient: ActorRef[Any]) -> None:
+        """Publishes a message that could not be delivered to `recipient`."""
+        self._dead_letters.tell(DeadLetter(message, recipient))
@@ -0,0 +1,252 @@
+import asyncio
+import math
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Generic, Hashable, TypeVar
+
+from .signals import Signal
+from ..utils import Logger
+
+if TYPE_CHECKING:
+    from .context import ActorContext
+
+T = TypeVar("T")
+
+# seconds per tick of the innermost wheel
+DEFAULT_RESOLUTION = 0.01
+# bits of the slot index per level: 256 ticks, then 64 slots per level, which covers
+# 2 ** 26 ticks, about 7.7 days at the default resolution
+_LEVEL_BITS = (8, 6, 6, 6)
+
+
+class WheelTimer:
+    """A timer scheduled on a `TimingWheel`."""
+
+    __slots__ = ("deadline", "callback", "args", "_slot")
+
+    def __init__(
+        self, deadline: int, callback: Callable[..., Any], args: tuple[Any, ...]
+    ) -> None:
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self._slot: set[WheelTimer] | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._slot is not None
+
+    def cancel(self) -> None:
+        if self._slot is not None:
+            self._slot.discard(self)
+            self._slot = None
+
+
+class TimingWheel:
+    """
+    TimingWheel: a hierarchical hashed timing wheel driven by a single handle on its event
+    loop. Scheduling and cancelling are O(1) regardless of the number of timers, and the
+    loop only wakes up once per tick while timers are due within the innermost wheel.
+    Timers fire on the first tick at or after their deadline, so they are late by at most
+    one `resolution`. Use `TimingWheel.of(loop)` to share the wheel of a loop.
+    """
+
+    _wheels = weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, "TimingWheel"]()
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, resolution: float = DEFAULT_RESOLUTION
+    ) -> None:
+        self._loop = loop
+        self._resolution = resolution
+        self._levels = [
+            [set[WheelTimer]() for _ in range(1 << bits)] for bits in _LEVEL_BITS
+        ]
+        self._shifts = [sum(_LEVEL_BITS[:level]) for level in range(len(_LEVEL_BITS))]
+        self._horizon = 1 << sum(_LEVEL_BITS)
+        # (ticks covered, shift, mask, slots) per level, for placing timers
+        self._placement = [
+            (1 << (shift + bits), shift, (1 << bits) - 1, slots)
+            for shift, bits, slots in zip(self._shifts, _LEVEL_BITS, self._levels)
+        ]
+        self._current = self._now()
+        self._handle: asyncio.TimerHandle | None = None
+        self._wakeup = 0
+        # set while `_run` advances, when callbacks may schedule timers
+        self._running = False
+
+    @classmethod
+    def of(cls, loop: asyncio.AbstractEventLoop) -> "TimingWheel":
+        wheel = cls._wheels.get(loop)
+        if wheel is None:
+            wheel = cls(loop)
+            cls._wheels[loop] = wheel
+        return wheel
+
+    @property
+    def resolution(self) -> float:
+        return self._resolution
+
+    def __len__(self) -> int:
+        return sum(len(slot) for level in self._levels for slot in level)
+
+    def schedule(
+        self, delay: float, callback: Callable[..., Any], *args: Any
+    ) -> WheelTimer:
+        """Calls `callback(*args)` on the loop after `delay` seconds."""
+        return self.schedule_at(self._loop.time() + delay, callback, *args)
+
+    def schedule_at(
+        self, when: float, callback: Callable[..., Any], *args: Any
+    ) -> WheelTimer:
+        """Calls `callback(*args)` on the loop at loop time `when`."""
+        if self._handle is None and not self._running:
+            # the wheel stands still while it is empty
+            self._current = self._now()
+        deadline = math.ceil(when / self._resolution)
+        timer = WheelTimer(max(deadline, self._current + 1), callback, args)
+        self._insert(timer)
+        self._schedule_wakeup(timer.deadline)
+        return timer
+
+    def _now(self) -> int:
+        return int(self._loop.time() / self._resolution)
+
+    def _insert(self, timer: WheelTimer) -> None:
+        # timers beyond the horizon wait in the outermost wheel and are placed again
+        # when it cascades
+        deadline = min(timer.deadline, self._current + self._horizon - 1)
+        ticks = deadline - self._current
+        for covered, shift, mask, slots in self._placement:
+            if ticks < covered:
+                break
+        slot = slots[(deadline >> shift) & mask]
+        slot.add(timer)
+        timer._slot = slot
+
+    def _schedule_wakeup(self, tick: int) -> None:
+        if self._running:
+            # `_run` schedules the next wakeup once it caught up
+            return
+        if self._handle is not None:
+            if self._wakeup <= tick:
+                return
+            self._handle.cancel()
+        self._wakeup = tick
+        self._handle = self._loop.call_at(tick * self._resolution, self._run)
+
+    def _run(self) -> None:
+        self._handle = None
+        self._running = True
+        try:
+            now = self._now()
+            while self._current < now:
+                self._advance()
+        finally:
+            self._running = False
+        self._schedule_next()
+
+    def _advance(self) -> None:
+        self._current += 1
+        current = self._current
+        # cascade outer wheels whose inner wheel wrapped around, outermost first
+        level = 0
+        while level < len(_LEVEL_BITS) - 1:
+            if (current >> self._shifts[level]) & ((1 << _LEVEL_BITS[level]) - 1) != 0:
+                break
+            level += 1
+        for outer in range(level, 0, -1):
+            shift = self._shifts[outer]
+            slot = self._levels[outer][
+                (current >> shift) & ((1 << _LEVEL_BITS[outer]) - 1)
+            ]
+            if len(slot) == 0:
+                continue
+            timers = list(slot)
+            slot.clear()
+            for timer in timers:
+                self._insert(timer)
+        slot = self._levels[0][current & ((1 << _LEVEL_BITS[0]) - 1)]
+        if len(slot) == 0:
+            return
+        timers = list(slot)
+        slot.clear()
+        for timer in timers:
+            timer._slot = None
+            try:
+                timer.callback(*timer.args)
+            except Exception as e:
+                Logger.instance.error(
+                    f"Timer callback failed: [exception={e.__class__.__name__},message={e}]"
+                )
+
+    def _schedule_next(self) -> None:
+        if any(self._levels[0]):
+            self._schedule_wakeup(self._current + 1)
+            return
+        for level in range(1, len(_LEVEL_BITS)):
+            if any(self._levels[level]):
+                # nothing is due before the innermost wheel wraps around
+                span = 1 << _LEVEL_BITS[0]
+                self._schedule_wakeup((self._current // span + 1) * span)
+                return
+
+
+class TimerScheduler(Generic[T]):
+    """
+    TimerScheduler: keyed timers that send messages to an actor. Starting a timer with the
+    key of an active timer replaces it. Timers are cancelled when the actor stops, but a
+    message sent just before a timer is cancelled may still be delivered. Signals are
+    delivered as signals, ahead of the queued messages.
+    """
+
+    def __init__(self, context: "ActorContext[T]") -> None:
+        self._context = context
+        self._wheel = TimingWheel.of(context.loop)
+        self._timers = dict[Hashable, WheelTimer]()
+
+    def start_single_timer(self, key: Hashable, message: T, delay: float) -> None:
+        self.cancel(key)
+        self._timers[key] = self._wheel.schedule(delay, self._fire, key, message, None)
+
+    def start_periodic(self, key: Hashable, message: T, interval: float) -> None:
+        """Sends `message` every `interval` seconds, at a fixed rate."""
+        if interval <= 0:
+            raise ValueError("Interval must be positive")
+        self.cancel(key)
+        when = self._context.loop.time() + interval
+        self._timers[key] = self._wheel.schedule_at(
+            when, self._fire, key, message, (when, interval)
+        )
+
+    def is_active(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def cancel(self, key: Hashable) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+    def cancel_all(self) -> None:
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+
+    def _fire(
+        self, key: Hashable, message: T, period: tuple[float, float] | None
+    ) -> None:
+        ref = self._context.self
+        if not ref.ref.is_alive:
+            self.cancel_all()
+            return
+        if period is None:
+            del self._timers[key]
+        else:
+            when, interval = period
+            # skip the periods that were missed while the loop was busy
+            when = max(when + interval, self._context.loop.time())
+            self._timers[key] = self._wheel.schedule_at(
+                when, self._fire, key, message, (when, interval)
+            )
+        if isinstance(message, Signal):
+            ref.receive_signal(message)
+        else:
+            ref.tell(message)
@@ -9,14 +9,18 @@ from ..messages.adapter import (
     AdapterTerminated,
     ClientAction,
     ServerData,
+    SubscribeEvents,
 )
 from ..messages.client import ClientMessage
 from ..messages.driver import DriverMessage
 from ..models.action import ActionResponse
+from ..models.event import BaseEvent
 from ..utils import LoggerLevel
 
-EVENT_KEY = ServiceKey[ClientMessage]()
-ACTION_KEY = ServiceKey[DriverMessage]()
+# deprecated: subscribe to `ActorSystem.event_stream` instead; events are still forwarded
+# to actors registered with it until the next release
+EVENT_KEY = ServiceKey[ClientMessage]("event")
+ACTION_KEY = ServiceKey[DriverMessage]("action")
 
 
 class AdapterConfig(BaseModel):
@@ -29,7 +33,10 @@ class AdapterActor:
     AdapterActor: A bridge between Driver and Client. It processes raw data from the server and
     sends them back to the client.
     It also receives action requests from the client and sends them to the server.
-    For extension, the events can be spread to other actors via event_router.
+    Events are published to the event stream of the actor system with their detail type as
+    topic. Actors on other nodes subscribe through the adapter with `SubscribeEvents`.
+    If the driver serves several bots, actions are sent on the connection the events of
+    the bot named by their `self_id` came from.
 
     +----------------+             +----------- -----+             +----------------+
     |                | Data -----> |                 | <-- Request |                |
@@ -42,6 +49,8 @@ class AdapterActor:
     def __init__(self, config: AdapterConfig) -> None:
         self.req_seq = 0
         self.future_store = dict[str, tuple[Future[ActionResponse], Type[BaseModel]]]()
+        # driver connections by the id of the bot that sent events on them
+        self.connections = dict[str, str]()
         self.config = config
         AdapterType = Adapters.get(config.adapter_type)
         if AdapterType is None:
@@ -60,47 +69,74 @@ class AdapterActor:
         return Behaviors.setup(self.setup)
 
     def setup(self, context: ActorContext[AdapterMessage]) -> Behavior[AdapterMessage]:
+        event_stream = context.system.event_stream
         event_forwarder = context.spawn(
             Forwarders.group(EVENT_KEY).apply(), "event_forwarder"
         )
+        event_stream.subscribe(
+            event_forwarder, BaseEvent, adapter=ClientMessage.of_event
+        )
         action_forwarder = context.spawn(
             Forwarders.group(ACTION_KEY).apply(), "action_forwarder"
         )
 
-        def _apply(
-            context: ActorContext[AdapterMessage], message: AdapterMessage
+        def on_action(
+            context: ActorContext[AdapterMessage], message: ClientAction
+        ) -> Behavior[AdapterMessage]:
+            action, future = message.action, message.future
+            context.log(f"Sending action: {action}")
+            seq = self.next_seq()
+            action.echo = seq
+            if future is not None:
+                self.future_store[seq] = future, type(action)
+            connection = None
+            if message.self_id is not None:
+                connection = self.connections.get(message.self_id)
+            action_forwarder.tell(DriverMessage.of_action(action.dict(), connection))
+            return Behavior[AdapterMessage].same
+
+        def on_data(
+            context: ActorContext[AdapterMessage], message: ServerData
         ) -> Behavior[AdapterMessage]:
-            match message:
-                case ClientAction(action, future):
-                    context.log(f"Sending action: {action}")
-                    seq = self.next_seq()
-                    action.echo = seq
-                    if future is not None:
-                        self.future_store[seq] = future, type(action)
-                    action_forwarder.tell(DriverMessage.of_action(action.dict()))
-                case ServerData(data):
-                    if self.adapter.is_response(data):
-                        seq = data["echo"]
-                        if seq not in self.future_store:
-                            context.log(
-                                f"Received data with seq={seq}, which is not found in future store.",
-                                LoggerLevel.WARNING,
-                            )
-                            return Behavior[AdapterMessage].same
-                        future, action_type = self.future_store.pop(seq)
-                        future.set_result(
-                            self.adapter.create_action_response(data, action_type)
-                        )
-                    else:
-                        # send event to actors that subscribes EVENT_KEY
-                        event = self.adapter.create_event(data)
-                        context.log(f"Received event: {event}")
-                        event_forwarder.tell(ClientMessage.of_event(event))
-                case AdapterTerminated():
-                    return Behavior[AdapterMessage].stop
+            data = message.data
+            if not self.adapter.is_response(data):
+                event = self.adapter.create_event(data)
+                context.log(f"Received event: {event}")
+                if message.connection is not None and event.self is not None:
+                    self.connections[event.self.user_id] = message.connection
+                event_stream.publish(event, event.detail_type)
+                return Behavior[AdapterMessage].same
+            seq = data["echo"]
+            if seq not in self.future_store:
+                context.log(
+                    f"Received data with seq={seq}, which is not found in future store.",
+                    LoggerLevel.WARNING,
+                )
+                return Behavior[AdapterMessage].same
+            future, action_type = self.future_store.pop(seq)
+            future.set_result(self.adapter.create_action_response(data, action_type))
             return Behavior[AdapterMessage].same
 
-        behavior = Behaviors.receive_message(_apply)
+        def on_subscribe(
+            context: ActorContext[AdapterMessage], message: SubscribeEvents
+        ) -> Behavior[AdapterMessage]:
+            for event_type in message.events:
+                event_stream.subscribe(
+                    message.subscriber, event_type, adapter=ClientMessage.of_event
+                )
+            context.log(
+                f"Subscribed {message.subscriber} to {len(message.events)} events."
+            )
+            return Behavior[AdapterMessage].same
+
+        behavior = Behaviors.receive_typed(
+            {
+                ServerData: on_data,
+                ClientAction: on_action,
+                SubscribeEvents: on_subscribe,
+                AdapterTerminated: lambda _, __: Behavior[AdapterMessage].stop,
+            }
+        )
         return Behaviors.supervise(
             behavior, lambda _, __: Behavior[AdapterMessage].same
         )
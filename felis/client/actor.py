@@ -1,4 +1,5 @@
-from typing import Sequence
+import asyncio
+from typing import Iterable, Sequence
 from typing_extensions import Self
 from pydantic import BaseModel
 
@@ -6,16 +7,17 @@ from .command import Command
 from .register import Commands
 from .resource import ResourceManager
 from .internal import internal_commands
-from ..actor import Behavior, Behaviors, ReceptionistRequest, ActorContext, ActorRef
-from ..adapter import EVENT_KEY
+from ..actor import Behavior, Behaviors, ActorContext, ActorRef
 from ..messages.adapter import AdapterMessage
 from ..messages.client import AdapterEvent, ClientMessage
+from ..models.event import BaseEvent
 from ..utils import LoggerLevel
 
 
 class ClientConfig(BaseModel):
     commands: list[str] = internal_commands
     resource_dir: str = "resources"
+    concurrency: int = 16
 
 
 class ClientActor:
@@ -33,9 +35,6 @@ class ClientActor:
     def setup(self, context: ActorContext[ClientMessage]) -> Behavior[ClientMessage]:
         commands = list[Command]()
         resources = ResourceManager(self._config.resource_dir, context)
-        context.system.receptionist.tell(
-            ReceptionistRequest.register(EVENT_KEY, context.self)
-        )
         for name in self.commands:
             context.log(f"Registering command {name}")
             command = Commands.get(name)
@@ -43,20 +42,49 @@ class ClientActor:
                 context.log(f"Command {name} not found.", LoggerLevel.ERROR)
             else:
                 commands.append(command(context, self._adapter, resources))
+        # the adapter may run on another node, so subscribe through it
+        self._adapter.tell(
+            AdapterMessage.of_subscribe(
+                context.self, _event_types(command.event_type for command in commands)
+            )
+        )
 
-        def on_message(
+        async def on_message(
             context: ActorContext[ClientMessage], message: ClientMessage
-        ) -> Behavior[ClientMessage]:
+        ) -> None:
             match message:
                 case AdapterEvent(event):
-                    for command in commands:
-                        if command.accepts(event):
-                            context.log(f"running command {command.name}")
-                            context.loop.create_task(command.execute(event))
-            return Behavior[ClientMessage].same
+                    accepted = [
+                        command for command in commands if command.accepts(event)
+                    ]
+                    for command in accepted:
+                        context.log(f"running command {command.name}")
+                    results = await asyncio.gather(
+                        *(command.execute(event) for command in accepted),
+                        return_exceptions=True,
+                    )
+                    for command, result in zip(accepted, results):
+                        if isinstance(result, Exception):
+                            context.log(
+                                f"Command {command.name} failed: {result}",
+                                LoggerLevel.ERROR,
+                            )
 
-        return Behaviors.receive_message(on_message)
+        return Behaviors.receive_async(on_message, self._config.concurrency)
 
     @property
     def commands(self) -> Sequence[str]:
         return self._config.commands
+
+
+def _event_types(types: Iterable[type[BaseEvent]]) -> list[type[BaseEvent]]:
+    """The classes in `types` that aren't subclasses of others, so no event matches twice."""
+    unique = set(types)
+    return [
+        event_type
+        for event_type in unique
+        if not any(
+            other is not event_type and issubclass(event_type, other)
+            for other in unique
+        )
+    ]
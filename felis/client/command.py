@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, Generic, TypeVar
+from functools import cache
+from typing import Any, Generic, TypeVar, get_type_hints
 
 from .resource import ResourceManager
 
@@ -36,31 +37,39 @@ class Command(ABC, Generic[T]):
     async def execute(self, event: T) -> None:
         raise NotImplementedError()
 
+    @property
+    def event_type(self) -> type[BaseEvent]:
+        """The class of events the command handles, from the annotation of `execute`."""
+        return _event_type(type(self))
+
     def accepts(self, event: BaseEvent) -> bool:
-        accepted_type = self.execute.__annotations__.get("event", None)
-        if accepted_type is None:
-            return True
-        return isinstance(event, accepted_type)
+        return isinstance(event, self.event_type)
 
     def send_back(self, event: T, message: Message) -> None:
+        """Replies to `event` with the bot that received it."""
+        self_id = None if event.self is None else event.self.user_id
         if type(event).__name__.startswith("Group"):
-            self.send_group_message(event.group_id, message)  # type: ignore
+            self.send_group_message(event.group_id, message, self_id)  # type: ignore
         elif type(event).__name__.startswith("Private"):
-            self.send_private_message(event.user_id, message)  # type: ignore
+            self.send_private_message(event.user_id, message, self_id)  # type: ignore
         else:
             return
 
-    def send_group_message(self, group_id: str, message: Message) -> None:
+    def send_group_message(
+        self, group_id: str, message: Message, self_id: str | None = None
+    ) -> None:
         self.adapter.tell(
             AdapterMessage.of_action(
-                Action.of(SendMessageRequest.group(group_id, message))
+                Action.of(SendMessageRequest.group(group_id, message)), None, self_id
             )
         )
 
-    def send_private_message(self, user_id: str, message: Message) -> None:
+    def send_private_message(
+        self, user_id: str, message: Message, self_id: str | None = None
+    ) -> None:
         self.adapter.tell(
             AdapterMessage.of_action(
-                Action.of(SendMessageRequest.private(user_id, message))
+                Action.of(SendMessageRequest.private(user_id, message)), None, self_id
             )
         )
 
@@ -68,10 +77,11 @@ class Command(ABC, Generic[T]):
         self,
         action: Action,
         timeout: float = 5.0,
+        self_id: str | None = None,
     ) -> Any:
         future = self.context.ask(
             self.adapter,
-            lambda f: AdapterMessage.of_action(action, f),
+            lambda f: AdapterMessage.of_action(action, f, self_id),
             timeout=timeout,
         )
         return await future
@@ -92,3 +102,15 @@ class MessageCommand(Command[MessageEvent]):
     @abstractmethod
     async def handle_message(self, event: MessageEvent, message: Message) -> None:
         raise NotImplementedError()
+
+
+@cache
+def _event_type(command: type[Command]) -> type[BaseEvent]:
+    # resolves string annotations, as with `from __future__ import annotations`
+    event_type = get_type_hints(command.execute).get("event", BaseEvent)
+    if not isinstance(event_type, type) or not issubclass(event_type, BaseEvent):
+        raise TypeError(
+            f"{command.__name__}.execute must annotate its event with an event class, "
+            f"not {event_type}"
+        )
+    return event_type
@@ -2,8 +2,7 @@ from typing_extensions import Self
 from pydantic import BaseModel
 
 from .mongo import MongoDatabase
-from ..actor import ActorContext, Behavior, Behaviors, ReceptionistRequest
-from ..adapter import EVENT_KEY
+from ..actor import ActorContext, Behavior, Behaviors
 from ..messages.client import AdapterEvent, ClientMessage
 from ..models.events.message import GroupMessageEvent, PrivateMessageEvent
 
@@ -28,26 +27,31 @@ class DatabaseActor:
         return Behaviors.setup(self.setup)
 
     def setup(self, context: ActorContext[ClientMessage]) -> Behavior[ClientMessage]:
-        context.system.receptionist.tell(
-            ReceptionistRequest.register(EVENT_KEY, context.self)
-        )
+        for event_type in (GroupMessageEvent, PrivateMessageEvent):
+            context.system.event_stream.subscribe(
+                context.self, event_type, adapter=ClientMessage.of_event
+            )
         database = MongoDatabase(self._config)
         group_msg = database.get_collection("group_msg", GroupMessageEvent)
         private_msg = database.get_collection("private_msg", PrivateMessageEvent)
 
-        def on_message(
-            context: ActorContext[ClientMessage], message: ClientMessage
+        def on_messages(
+            context: ActorContext[ClientMessage], messages: list[ClientMessage]
         ) -> Behavior[ClientMessage]:
-            match message:
-                case AdapterEvent(event):
-                    if isinstance(event, GroupMessageEvent):
-                        context.log(f"Saving group message: {event.message.as_text()}")
-                        group_msg.save(event)
-                    elif isinstance(event, PrivateMessageEvent):
-                        context.log(
-                            f"Saving private message: {event.message.as_text()}"
-                        )
-                        private_msg.save(event)
+            group_events = list[GroupMessageEvent]()
+            private_events = list[PrivateMessageEvent]()
+            for message in messages:
+                match message:
+                    case AdapterEvent(GroupMessageEvent() as event):
+                        group_events.append(event)
+                    case AdapterEvent(PrivateMessageEvent() as event):
+                        private_events.append(event)
+            if len(group_events) > 0:
+                context.log(f"Saving {len(group_events)} group messages")
+                group_msg.save_many(group_events)
+            if len(private_events) > 0:
+                context.log(f"Saving {len(private_events)} private messages")
+                private_msg.save_many(private_events)
             return Behavior[ClientMessage].same
 
-        return Behaviors.receive_message(on_message)
+        return Behaviors.receive_batch(on_messages)
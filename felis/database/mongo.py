@@ -35,6 +35,11 @@ class Collection(Generic[T]):
     def save(self, document: T) -> None:
         self.collection.insert_one(document.dict())
 
+    def save_many(self, documents: list[T]) -> None:
+        if len(documents) == 0:
+            return
+        self.collection.insert_many([document.dict() for document in documents])
+
     def find_one(self, query: dict) -> T:
         result = self.collection.find_one(query)
         if result is None:
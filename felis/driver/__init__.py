@@ -1,6 +1,7 @@
 from .backend import Backend, Backends
+from .codec import Codec, Codecs
 from .actor import DriverActor, DriverConfig
-from .backends import WebsocketReverseBackend
+from .backends import WebsocketReverseBackend, WebsocketServerBackend
 
 
 __all__ = [
@@ -8,5 +9,8 @@ __all__ = [
     "DriverConfig",
     "Backend",
     "Backends",
+    "Codec",
+    "Codecs",
     "WebsocketReverseBackend",
+    "WebsocketServerBackend",
 ]
@@ -1,25 +1,66 @@
+from collections import Counter
 from typing_extensions import Self
 from pydantic import BaseModel
 
-from .backend import Backends
-from ..actor import Behavior, Behaviors, ActorContext, ActorRef, ReceptionistRequest
+from .backend import Backends, Backoff, Compression, FlowControl
+from .buffer import Entry, OutboundBuffer
+from .codec import Codecs
+from ..actor import (
+    Behavior,
+    Behaviors,
+    ActorContext,
+    ActorRef,
+    ReceptionistRequest,
+    ShutdownPhase,
+    StashBuffer,
+    TimerScheduler,
+)
 from ..adapter import ACTION_KEY
 from ..messages.adapter import AdapterMessage
 from ..messages.driver import (
     AdapterAction,
     BackendClosed,
+    BackendConnected,
     DriverMessage,
     BackendData,
     BackendError,
+    BackendPressure,
+    BackendReturned,
+    Reconnect,
 )
 from ..utils import LoggerLevel
 
 
 class DriverConfig(BaseModel):
     backend_type: str = "websocket_reverse"
+    # the URL to listen on for "websocket_server", which serves many bots at once
     connect_url: str
     access_token: str | None = None
+    # "json", or "orjson" and "msgspec" if installed; "msgpack" sends binary
+    # MessagePack frames, for implementations that support them, and needs msgspec
+    codec: str = "json"
+    # permessage-deflate; unset window bits (8-15) and memory level (1-9) keep the
+    # defaults of websockets
+    compression: bool = True
+    compression_window_bits: int | None = None
+    compression_memory_level: int | None = None
+    # reconnect delays grow from retry_interval up to retry_max_interval
     retry_interval: float = 5.0
+    retry_max_interval: float = 60.0
+    retry_multiplier: float = 2.0
+    # fraction of a delay taken off at random
+    retry_jitter: float = 0.5
+    # actions kept while disconnected, beyond this the oldest are dropped or spilled
+    buffer_capacity: int = 1000
+    # seconds after which buffered actions are dropped instead of sent
+    buffer_ttl: float | None = 60.0
+    # file that takes actions beyond buffer_capacity and keeps them across restarts
+    buffer_spill_path: str | None = None
+    # actions queued per connection before the driver holds back further ones
+    high_watermark: int = 1000
+    low_watermark: int = 250
+    # actions held back beyond this go to dead letters
+    stash_capacity: int = 10_000
 
 
 class DriverActor:
@@ -30,40 +71,236 @@ class DriverActor:
         if BackendType is None:
             raise ValueError(f"Unknown backend type: {self._config.backend_type}")
         self._backend_type = BackendType
+        CodecType = Codecs.get(self._config.codec)
+        if CodecType is None:
+            raise ValueError(f"Unknown codec: {self._config.codec}")
+        self._codec_type = CodecType
+        self._backoff = Backoff(
+            self._config.retry_interval,
+            self._config.retry_max_interval,
+            self._config.retry_multiplier,
+            self._config.retry_jitter,
+        )
 
     @classmethod
     def of(cls, config: DriverConfig, adapter: ActorRef[AdapterMessage]) -> Self:
         return cls(config, adapter)
 
     def apply(self) -> Behavior[DriverMessage]:
-        return Behaviors.setup(self.setup)
+        return Behaviors.with_timers(self.setup)
 
-    def setup(self, context: ActorContext[DriverMessage]) -> Behavior[DriverMessage]:
-        backend = self._backend_type.of(context.self, self._config.connect_url)
+    def setup(
+        self,
+        context: ActorContext[DriverMessage],
+        timers: TimerScheduler[DriverMessage],
+    ) -> Behavior[DriverMessage]:
+        backend = self._backend_type.of(
+            context.self,
+            self._config.connect_url,
+            self._config.access_token,
+            self._codec_type(),
+            FlowControl(self._config.high_watermark, self._config.low_watermark),
+            Compression(
+                self._config.compression,
+                self._config.compression_window_bits,
+                self._config.compression_memory_level,
+            ),
+        )
         backend_task = lambda: context.loop.create_task(backend.start())
-        backend_task()
+        # the connection being made or served, at most one at a time
+        starting = backend_task()
         context.system.receptionist.tell(
             ReceptionistRequest.register(ACTION_KEY, context.self)
         )
 
-        def on_message(
-            context: ActorContext[DriverMessage], message: DriverMessage
+        async def pause() -> None:
+            backend.pause()
+
+        shutdown = context.system.coordinated_shutdown
+        shutdown.add_task(ShutdownPhase.STOP_INGEST, context.self.path, pause)
+        shutdown.add_task(ShutdownPhase.CLOSE, context.self.path, backend.close)
+
+        # actions sent while disconnected, replayed in order once connected
+        buffer = OutboundBuffer(
+            self._config.buffer_capacity,
+            self._config.buffer_ttl,
+            self._config.buffer_spill_path,
+        )
+        buffer.track(context.self.ref.metrics)
+
+        async def flush() -> None:
+            buffer.close()
+
+        shutdown.add_task(ShutdownPhase.FLUSH, context.self.path, flush)
+        connected = False
+        attempts = 0
+        # connections of a backend with several that closed and were not reopened yet
+        disconnected = set[str | None]()
+        # buffered actions dropped for overflow and expiry, as last reported
+        reported = [0, 0]
+
+        def replay(context: ActorContext[DriverMessage]) -> None:
+            # actions of closed or full connections, and the later ones of the same
+            # connections, stay buffered in order; as many as the buffer holds are
+            # skipped to get to the actions of other connections
+            deferred = list[Entry]()
+            blocked = set[str | None]()
+            while connected and len(deferred) < self._config.buffer_capacity:
+                entry = buffer.pop()
+                if entry is None:
+                    break
+                action, connection, _ = entry
+                if (
+                    connection in blocked
+                    or connection in disconnected
+                    or backend.is_pressured(connection)
+                ):
+                    blocked.add(connection)
+                    deferred.append(entry)
+                    continue
+                backend.send(action, connection)
+            for entry in reversed(deferred):
+                buffer.push_front(entry)
+            dropped, expired = buffer.dropped, buffer.expired
+            if [dropped, expired] != reported:
+                context.log(
+                    f"Dropped buffered actions: [overflow={dropped - reported[0]},expired={expired - reported[1]}]",
+                    LoggerLevel.WARNING,
+                )
+                reported[:] = dropped, expired
+
+        def on_data(
+            context: ActorContext[DriverMessage], message: BackendData
+        ) -> Behavior[DriverMessage]:
+            context.log(f"Received data: {message.data}")
+            self._adapter.tell(
+                AdapterMessage.of_response(message.data, message.connection)
+            )
+            return Behavior[DriverMessage].same
+
+        def on_error(
+            context: ActorContext[DriverMessage], message: BackendError
+        ) -> Behavior[DriverMessage]:
+            context.log(f"Received error: {message.error}", LoggerLevel.ERROR)
+            return Behavior[DriverMessage].same
+
+        def on_connected(
+            context: ActorContext[DriverMessage], message: BackendConnected
         ) -> Behavior[DriverMessage]:
-            match message:
-                case BackendData(data):
-                    context.log(f"Received data: {data}")
-                    self._adapter.tell(AdapterMessage.of_response(data))
-                case BackendError(error):
-                    context.log(f"Received error: {error}", LoggerLevel.ERROR)
-                case BackendClosed():
+            nonlocal connected, attempts
+            if message.connection is not None:
+                disconnected.discard(message.connection)
+                pending = buffer.pending(message.connection)
+                if pending > 0:
                     context.log(
-                        f"Backend closed, retrying in {self._config.retry_interval} seconds...",
-                        LoggerLevel.ERROR,
+                        f"Connection {message.connection} reopened, replaying {pending} actions."
                     )
-                    context.loop.call_later(self._config.retry_interval, backend_task)
-                case AdapterAction(action):
-                    context.log(f"Sending action: {action}")
-                    backend.send(action)
+                replay(context)
+                return Behavior[DriverMessage].same
+            connected = True
+            attempts = 0
+            if len(buffer) > 0:
+                context.log(f"Backend connected, replaying {len(buffer)} actions.")
+            replay(context)
             return Behavior[DriverMessage].same
 
-        return Behaviors.receive_message(on_message)
+        def on_returned(
+            context: ActorContext[DriverMessage], message: BackendReturned
+        ) -> Behavior[DriverMessage]:
+            for request in message.requests:
+                buffer.push(request, message.connection)
+            replay(context)
+            return Behavior[DriverMessage].same
+
+        def on_closed(
+            context: ActorContext[DriverMessage], message: BackendClosed
+        ) -> Behavior[DriverMessage]:
+            nonlocal connected, attempts
+            if message.connection is not None:
+                # the implementation reconnects by itself
+                disconnected.add(message.connection)
+                context.log(
+                    f"Connection {message.connection} closed, buffering its actions.",
+                    LoggerLevel.WARNING,
+                )
+                held.clear()
+                return stash.unstash_all(Behavior[DriverMessage].same)
+            if not connected and timers.is_active("reconnect"):
+                # reported by a connection that is no longer current
+                return Behavior[DriverMessage].same
+            connected = False
+            delay = self._backoff.delay(attempts)
+            attempts += 1
+            context.log(
+                f"Backend closed, retrying in {delay:.1f} seconds...",
+                LoggerLevel.ERROR,
+            )
+            timers.start_single_timer("reconnect", DriverMessage.of_reconnect(), delay)
+            # actions held back for a full queue are buffered before later ones
+            held.clear()
+            return stash.unstash_all(Behavior[DriverMessage].same)
+
+        def on_reconnect(
+            context: ActorContext[DriverMessage], _: Reconnect
+        ) -> Behavior[DriverMessage]:
+            nonlocal starting
+            if not starting.done():
+                # the previous connection is still winding down, try again later
+                timers.start_single_timer(
+                    "reconnect",
+                    DriverMessage.of_reconnect(),
+                    self._backoff.delay(attempts),
+                )
+                return Behavior[DriverMessage].same
+            starting = backend_task()
+            return Behavior[DriverMessage].same
+
+        # actions held back per connection, sent in order once its queue drained
+        held = Counter[str | None]()
+        stash = StashBuffer[DriverMessage](context, self._config.stash_capacity)
+
+        def on_action(
+            context: ActorContext[DriverMessage], message: AdapterAction
+        ) -> Behavior[DriverMessage]:
+            connection = message.connection
+            if (
+                not connected
+                or connection in disconnected
+                or buffer.pending(connection) > 0
+            ):
+                buffer.push(message.action, connection)
+                return Behavior[DriverMessage].same
+            if held[connection] > 0 or backend.is_pressured(connection):
+                if stash.stash(message):
+                    held[connection] += 1
+                return Behavior[DriverMessage].same
+            context.log(f"Sending action: {message.action}")
+            backend.send(message.action, connection)
+            return Behavior[DriverMessage].same
+
+        def on_pressure(
+            context: ActorContext[DriverMessage], message: BackendPressure
+        ) -> Behavior[DriverMessage]:
+            if message.pressured:
+                context.log(
+                    f"Holding back actions for connection {message.connection}, its queue is full.",
+                    LoggerLevel.WARNING,
+                )
+                return Behavior[DriverMessage].same
+            replay(context)
+            # actions for connections that are still pressured are held back again
+            held.clear()
+            return stash.unstash_all(Behavior[DriverMessage].same)
+
+        return Behaviors.receive_typed(
+            {
+                BackendData: on_data,
+                BackendError: on_error,
+                BackendConnected: on_connected,
+                BackendClosed: on_closed,
+                BackendReturned: on_returned,
+                Reconnect: on_reconnect,
+                AdapterAction: on_action,
+                BackendPressure: on_pressure,
+            }
+        )
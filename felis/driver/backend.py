@@ -1,22 +1,198 @@
+import asyncio
+import random
 from abc import ABC, abstractmethod
-from typing import Any, Mapping
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Mapping, Sequence
 from typing_extensions import Self
+from websockets.extensions.permessage_deflate import (
+    ClientPerMessageDeflateFactory,
+    ServerPerMessageDeflateFactory,
+)
 
+from .codec import Codec, JsonCodec
 from ..actor.actor import ActorRef
 from ..messages.driver import DriverMessage
 from ..utils import Registry
 
 
+@dataclass(frozen=True)
+class FlowControl:
+    """
+    FlowControl: the watermarks of the outbound queue of a connection. The driver holds
+    back actions for a connection once `high_watermark` of them are queued or being
+    written, and sends them when the queue drained to `low_watermark`.
+    """
+
+    high_watermark: int = 1000
+    low_watermark: int = 250
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.low_watermark < self.high_watermark:
+            raise ValueError("Watermarks must satisfy 0 <= low < high")
+
+
+@dataclass(frozen=True)
+class Compression:
+    """
+    Compression: the permessage-deflate settings of the connections of a backend.
+    `window_bits` (8 to 15) bounds the window both sides compress with and `memory_level`
+    (1 to 9) the memory zlib compresses with; larger ones compress better at the cost of
+    memory per connection. Unset ones keep the defaults of websockets.
+    """
+
+    enabled: bool = True
+    window_bits: int | None = None
+    memory_level: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.window_bits is not None and not 8 <= self.window_bits <= 15:
+            raise ValueError("Window bits must be between 8 and 15")
+        if self.memory_level is not None and not 1 <= self.memory_level <= 9:
+            raise ValueError("Memory level must be between 1 and 9")
+
+    def client_options(self) -> dict[str, Any]:
+        """Keyword arguments of `websockets.client.connect`."""
+        if not self.enabled:
+            return {"compression": None}
+        if self.window_bits is None and self.memory_level is None:
+            return {}
+        factory = ClientPerMessageDeflateFactory(
+            server_max_window_bits=self.window_bits,
+            client_max_window_bits=self.window_bits or True,
+            compress_settings={"memLevel": self.memory_level or 5},
+        )
+        return {"extensions": [factory]}
+
+    def server_options(self) -> dict[str, Any]:
+        """Keyword arguments of `websockets.server.serve`."""
+        if not self.enabled:
+            return {"compression": None}
+        if self.window_bits is None and self.memory_level is None:
+            return {}
+        factory = ServerPerMessageDeflateFactory(
+            server_max_window_bits=self.window_bits or 12,
+            client_max_window_bits=self.window_bits or 12,
+            compress_settings={"memLevel": self.memory_level or 5},
+        )
+        return {"extensions": [factory]}
+
+
+@dataclass(frozen=True)
+class Backoff:
+    """
+    Backoff: the delays between attempts to reconnect a backend. The delay starts at
+    `initial` and grows by `multiplier` with every failed attempt up to `maximum`. A
+    random part of up to `jitter` of it is taken off, so that bots disconnected at once
+    don't reconnect at once.
+    """
+
+    initial: float = 5.0
+    maximum: float = 60.0
+    multiplier: float = 2.0
+    jitter: float = 0.5
+
+    def __post_init__(self) -> None:
+        if not 0 < self.initial <= self.maximum:
+            raise ValueError("Delays must satisfy 0 < initial <= maximum")
+        if self.multiplier < 1:
+            raise ValueError("Multiplier must be at least 1")
+        if not 0 <= self.jitter <= 1:
+            raise ValueError("Jitter must be between 0 and 1")
+
+    def delay(self, attempt: int) -> float:
+        """Delay before the attempt after `attempt` failed ones."""
+        # the exponent is capped, the delay reached the maximum long before
+        base = min(self.maximum, self.initial * self.multiplier ** min(attempt, 64))
+        return base * (1 - self.jitter * random.random())
+
+
+class SendQueue:
+    """
+    SendQueue: the outbound requests of a connection. The sender takes all queued
+    requests at once and writes them back to back. `on_pressure(True)` is called when
+    the queue reaches the high watermark and `on_pressure(False)` when it drained to the
+    low one.
+    """
+
+    def __init__(
+        self, flow_control: FlowControl, on_pressure: Callable[[bool], None]
+    ) -> None:
+        self._flow_control = flow_control
+        self._on_pressure = on_pressure
+        self._requests = deque[Mapping[str, Any]]()
+        self._in_flight = 0
+        self._ready = asyncio.Event()
+        self._sent = asyncio.Event()
+        self._sent.set()
+        self._pressured = False
+
+    def __len__(self) -> int:
+        """Number of requests queued or being written."""
+        return len(self._requests) + self._in_flight
+
+    @property
+    def pressured(self) -> bool:
+        return self._pressured
+
+    def put(self, request: Mapping[str, Any]) -> None:
+        self._requests.append(request)
+        self._ready.set()
+        self._sent.clear()
+        if not self._pressured and len(self) >= self._flow_control.high_watermark:
+            self._pressured = True
+            self._on_pressure(True)
+
+    async def take_all(self) -> list[Mapping[str, Any]]:
+        """Waits for requests and takes all of them; call `done` once they are written."""
+        await self._ready.wait()
+        batch = list(self._requests)
+        self._requests.clear()
+        self._ready.clear()
+        self._in_flight = len(batch)
+        return batch
+
+    def done(self, unsent: Sequence[Mapping[str, Any]] = ()) -> None:
+        """Ends a batch; `unsent` requests go back to the front of the queue."""
+        self._in_flight = 0
+        if len(unsent) > 0:
+            self._requests.extendleft(reversed(unsent))
+            self._ready.set()
+        elif len(self._requests) == 0:
+            self._sent.set()
+        if self._pressured and len(self) <= self._flow_control.low_watermark:
+            self._pressured = False
+            self._on_pressure(False)
+
+    def clear(self) -> list[Mapping[str, Any]]:
+        """Takes out the requests not written yet, once the sender stopped."""
+        unsent = list(self._requests)
+        self._requests.clear()
+        self._ready.clear()
+        self._sent.set()
+        return unsent
+
+    async def join(self) -> None:
+        """Waits until every request is written."""
+        await self._sent.wait()
+
+
 class Backend(ABC):
     def __init__(
         self,
         driver_actor: "ActorRef[DriverMessage]",
         url: str,
         access_token: str | None,
+        codec: Codec | None = None,
+        flow_control: FlowControl | None = None,
+        compression: Compression | None = None,
     ) -> None:
         self.driver = driver_actor
         self.url = url
         self.access_token = access_token
+        self.codec = codec or JsonCodec()
+        self.flow_control = flow_control or FlowControl()
+        self.compression = compression or Compression()
 
     @classmethod
     def of(
@@ -24,15 +200,61 @@ class Backend(ABC):
         driver_actor: "ActorRef[DriverMessage]",
         url: str,
         access_token: str | None = None,
+        codec: Codec | None = None,
+        flow_control: FlowControl | None = None,
+        compression: Compression | None = None,
     ) -> Self:
-        return cls(driver_actor, url, access_token)
+        return cls(driver_actor, url, access_token, codec, flow_control, compression)
 
     @abstractmethod
     async def start(self) -> None:
         pass
 
     @abstractmethod
-    def send(self, data: Mapping[str, Any]) -> None:
+    def send(self, data: Mapping[str, Any], connection: str | None = None) -> None:
+        """Sends `data` on `connection`, for backends with several connections."""
+        pass
+
+    async def write(
+        self, queue: SendQueue, send: Callable[[str | bytes], Awaitable[None]]
+    ) -> None:
+        """
+        Encodes and sends the requests of `queue` until `send` fails, taking all queued
+        requests per wakeup. The requests not sent yet are put back into the queue.
+        """
+        encode = self.codec.encode
+        while True:
+            batch = await queue.take_all()
+            index = 0
+            try:
+                for index, request in enumerate(batch):
+                    try:
+                        frame = encode(request)
+                    except Exception as e:
+                        self.on_error(e)
+                        continue
+                    await send(frame)
+            except BaseException:
+                queue.done(batch[index:])
+                raise
+            queue.done()
+
+    def on_error(self, e: Exception) -> None:
+        self.driver.tell(DriverMessage.of_error(e))
+
+    def is_pressured(self, connection: str | None = None) -> bool:
+        """Whether the outbound queue of `connection` is over its high watermark."""
+        return False
+
+    def on_pressure(self, pressured: bool, connection: str | None = None) -> None:
+        self.driver.tell(DriverMessage.of_pressure(pressured, connection))
+
+    def pause(self) -> None:
+        """Stops receiving data, while still sending it."""
+        pass
+
+    async def close(self) -> None:
+        """Sends the data queued so far and closes the connection for good."""
         pass
 
 
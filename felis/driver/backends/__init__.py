@@ -1,3 +1,4 @@
 from .ws_reverse import WebsocketReverseBackend
+from .ws_server import WebsocketServerBackend
 
-__all__ = ["WebsocketReverseBackend"]
+__all__ = ["WebsocketReverseBackend", "WebsocketServerBackend"]
@@ -1,10 +1,10 @@
 import asyncio
-import json
 import websockets.client as wsc
-from typing import Any, Callable, Coroutine, Mapping
-from websockets.exceptions import ConnectionClosed
+from typing import Any, Mapping
+from websockets.exceptions import ConnectionClosed, InvalidHandshake
 
-from ..backend import Backend, Backends
+from ..backend import Backend, Backends, Compression, FlowControl, SendQueue
+from ..codec import Codec
 from ..actor import DriverMessage
 from ...actor import ActorRef
 
@@ -16,60 +16,118 @@ class WebsocketReverseBackend(Backend):
         driver_actor: "ActorRef[DriverMessage]",
         url: str,
         access_token: str | None,
+        codec: Codec | None = None,
+        flow_control: FlowControl | None = None,
+        compression: Compression | None = None,
     ) -> None:
-        super().__init__(driver_actor, url, access_token)
-        self.requests = asyncio.Queue[Mapping[str, Any]]()
+        super().__init__(
+            driver_actor, url, access_token, codec, flow_control, compression
+        )
+        self.requests = SendQueue(self.flow_control, self.on_pressure)
+        self._ws: wsc.WebSocketClientProtocol | None = None
+        self._tasks = list[asyncio.Task[None]]()
+        self._paused = False
+        self._closed = False
 
     async def on_message(self, data: str | bytes) -> None:
-        data_dict = json.loads(data)
+        data_dict = self.codec.decode(data)
         if not isinstance(data_dict, dict):
             self.on_error(ValueError(f"invalid data: {data_dict}"))
+            return
         self.driver.tell(DriverMessage.of_data(data_dict))
 
-    def on_error(self, e: Exception) -> None:
-        self.driver.tell(DriverMessage.of_error(e))
-
     def on_closed(self) -> None:
+        if self._closed:
+            # the driver is stopped by the shutdown that closed the connection
+            return
         self.driver.tell(DriverMessage.of_closed())
 
     async def start(self) -> None:
         try:
-            async with wsc.connect(self.url, extra_headers=self.get_headers()) as ws:
-                await asyncio.gather(
-                    self.task(ws, self._send),
-                    self.task(ws, self._recv),
-                    return_exceptions=True,
+            async with wsc.connect(
+                self.url,
+                extra_headers=self.get_headers(),
+                **self.compression.client_options(),
+            ) as ws:
+                self._ws = ws
+                self.driver.tell(DriverMessage.of_connected())
+                await self._run(ws)
+        except (OSError, InvalidHandshake) as e:
+            # refused, unresolved or rejected connections are retried like closed ones
+            self.on_error(e)
+        finally:
+            self._ws = None
+        # reported once per connection, however it ended
+        self.on_closed()
+
+    async def _run(self, ws: wsc.WebSocketClientProtocol) -> None:
+        """
+        Sends and receives on `ws` until either stops, then stops the other. The tasks of
+        a connection are done when this returns, so a sender of a closed connection has
+        put its batch back before the sender of the next one takes it.
+        """
+        workers = [asyncio.ensure_future(self._send(ws))]
+        if not self._paused:
+            workers.append(asyncio.ensure_future(self._recv(ws)))
+        self._tasks = workers
+        # notices the connection closing while nothing is sent or received
+        tasks = [*workers, asyncio.ensure_future(ws.wait_closed())]
+        pending = set(tasks)
+        try:
+            while len(pending) > 0:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
                 )
-        except ConnectionError:
-            self.on_closed()
+                # the receiving task is cancelled on pause, the connection lives on
+                if any(not task.cancelled() for task in done):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if len(pending) > 0:
+                await asyncio.wait(pending)
+            if self._tasks is workers:
+                self._tasks = []
+        for task in tasks:
+            if task.cancelled():
+                continue
+            e = task.exception()
+            if e is not None and not isinstance(e, ConnectionClosed):
+                self.on_error(e)
 
-    async def task(
-        self,
-        ws: wsc.WebSocketClientProtocol,
-        handler: Callable[[wsc.WebSocketClientProtocol], Coroutine[Any, Any, None]],
-    ) -> None:
+    async def _send(self, ws: wsc.WebSocketClientProtocol) -> None:
+        await self.write(self.requests, ws.send)
+
+    async def _recv(self, ws: wsc.WebSocketClientProtocol) -> None:
         while True:
+            data = await ws.recv()
             try:
-                await handler(ws)
-            except ConnectionClosed:
-                self.on_closed()
-                return
+                await self.on_message(data)
             except Exception as e:
                 self.on_error(e)
-            except asyncio.CancelledError:
-                return
 
-    async def _send(self, ws: wsc.WebSocketClientProtocol) -> None:
-        request = await self.requests.get()
-        data = json.dumps(request)
-        await ws.send(data)
+    def send(self, request: Mapping[str, Any], connection: str | None = None) -> None:
+        self.requests.put(request)
 
-    async def _recv(self, ws: wsc.WebSocketClientProtocol) -> None:
-        data = await ws.recv()
-        await self.on_message(data)
+    def is_pressured(self, connection: str | None = None) -> bool:
+        return self.requests.pressured
+
+    def pause(self) -> None:
+        self._paused = True
+        # the receiving task is always the last one
+        if len(self._tasks) == 2:
+            self._tasks[1].cancel()
 
-    def send(self, request: Mapping[str, Any]) -> None:
-        self.requests.put_nowait(request)
+    async def close(self) -> None:
+        self._closed = True
+        try:
+            if self._ws is not None:
+                await self.requests.join()
+        finally:
+            if self._ws is not None:
+                await self._ws.close()
+            for task in self._tasks:
+                task.cancel()
 
     def get_headers(self) -> Mapping[str, str]:
         headers = {}
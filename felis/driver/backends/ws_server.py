@@ -0,0 +1,217 @@
+import asyncio
+import hmac
+from functools import partial
+import websockets.server as wss
+from http import HTTPStatus
+from typing import Any, Mapping
+from urllib.parse import parse_qs, urlparse
+from websockets.datastructures import Headers
+from websockets.exceptions import ConnectionClosed
+
+from ..backend import Backend, Backends, Compression, FlowControl, SendQueue
+from ..codec import Codec
+from ..actor import DriverMessage
+from ...actor import ActorRef
+from ...utils import Logger
+
+
+class _Connection:
+    def __init__(self, ws: wss.WebSocketServerProtocol, requests: SendQueue) -> None:
+        self.ws = ws
+        self.requests = requests
+        # set once the connection handed back its unsent requests
+        self.finished = asyncio.Event()
+
+
+@Backends.register("websocket_server")
+class WebsocketServerBackend(Backend):
+    """
+    WebsocketServerBackend: listens on `url` for OneBot implementations that connect in
+    reverse WebSocket mode, any number of them at once. A connection is named by the
+    X-Self-ID header of the implementation, or by its address if there is none. Data is
+    tagged with the connection it came from, and actions are sent on the connection they
+    name, or on the one that connected first if they name none. Actions a connection did
+    not send before it closed, or that name a connection which closed, are handed back
+    to the driver, which sends them once the implementation connects again.
+    """
+
+    def __init__(
+        self,
+        driver_actor: "ActorRef[DriverMessage]",
+        url: str,
+        access_token: str | None,
+        codec: Codec | None = None,
+        flow_control: FlowControl | None = None,
+        compression: Compression | None = None,
+    ) -> None:
+        super().__init__(
+            driver_actor, url, access_token, codec, flow_control, compression
+        )
+        self.connections = dict[str, _Connection]()
+        # names of the connections seen so far
+        self._seen = set[str]()
+        self._server: wss.WebSocketServer | None = None
+        self._receiving = asyncio.Event()
+        self._receiving.set()
+        self._closed = False
+
+    def on_message(self, data: str | bytes, connection: str) -> None:
+        data_dict = self.codec.decode(data)
+        if not isinstance(data_dict, dict):
+            self.on_error(ValueError(f"invalid data: {data_dict}"))
+            return
+        self.driver.tell(DriverMessage.of_data(data_dict, connection))
+
+    def on_closed(self) -> None:
+        if self._closed:
+            return
+        self.driver.tell(DriverMessage.of_closed())
+
+    async def start(self) -> None:
+        url = urlparse(self.url)
+        try:
+            self._server = await wss.serve(
+                self._handle,
+                url.hostname,
+                url.port,
+                process_request=self._check_request,
+                **self.compression.server_options(),
+            )
+        except OSError as e:
+            self.on_error(e)
+            self.on_closed()
+            return
+        Logger.instance.info(f"Listening for bots on {self.url}.")
+        self.driver.tell(DriverMessage.of_connected())
+        await self._server.wait_closed()
+        self._server = None
+        self.on_closed()
+
+    async def _check_request(
+        self, path: str, headers: Headers
+    ) -> tuple[HTTPStatus, list[tuple[str, str]], bytes] | None:
+        url = urlparse(path)
+        expected = urlparse(self.url).path or "/"
+        if url.path != expected:
+            return HTTPStatus.NOT_FOUND, [], b""
+        if self.access_token is None:
+            return None
+        header = headers.get("Authorization", "").removeprefix("Bearer ")
+        query = parse_qs(url.query).get("access_token", [""])[0]
+        # compare both in constant time, so timing reveals neither
+        matches = [self._authorized(token) for token in (header, query)]
+        if not any(matches):
+            return HTTPStatus.UNAUTHORIZED, [], b""
+        return None
+
+    def _authorized(self, token: str) -> bool:
+        assert self.access_token is not None
+        return hmac.compare_digest(token.encode(), self.access_token.encode())
+
+    async def _handle(self, ws: wss.WebSocketServerProtocol) -> None:
+        name = ws.request_headers.get("X-Self-ID")
+        if name is None:
+            host, port = ws.remote_address[:2]
+            name = f"{host}:{port}"
+        previous = self.connections.get(name)
+        if previous is not None:
+            # the implementation reconnected before its old connection timed out
+            await previous.ws.close()
+            await previous.finished.wait()
+        if self._closed:
+            await ws.close()
+            return
+        connection = _Connection(
+            ws, SendQueue(self.flow_control, partial(self.on_pressure, connection=name))
+        )
+        self.connections[name] = connection
+        self._seen.add(name)
+        Logger.instance.info(f"Bot {name} connected from {ws.remote_address}.")
+        self.driver.tell(DriverMessage.of_connected(name))
+        sender = asyncio.ensure_future(self._send(connection))
+        try:
+            while True:
+                await self._receiving.wait()
+                if self._closed:
+                    return
+                data = await ws.recv()
+                try:
+                    self.on_message(data, name)
+                except Exception as e:
+                    self.on_error(e)
+        except ConnectionClosed:
+            pass
+        finally:
+            sender.cancel()
+            # actions sent meanwhile still go to this queue and are handed back with it
+            await asyncio.wait([sender])
+            self._finish(name, connection)
+
+    def _finish(self, name: str, connection: _Connection) -> None:
+        if self.connections.get(name) is connection:
+            del self.connections[name]
+        Logger.instance.info(f"Bot {name} disconnected.")
+        unsent = connection.requests.clear()
+        if self._closed:
+            if len(unsent) > 0:
+                Logger.instance.warning(
+                    f"Dropped {len(unsent)} actions for bot {name}."
+                )
+        else:
+            if len(unsent) > 0:
+                self.driver.tell(DriverMessage.of_returned(unsent, name))
+            if connection.requests.pressured:
+                self.on_pressure(False, name)
+            if name not in self.connections:
+                self.driver.tell(DriverMessage.of_closed(name))
+        connection.finished.set()
+
+    async def _send(self, connection: _Connection) -> None:
+        try:
+            await self.write(connection.requests, connection.ws.send)
+        except ConnectionClosed:
+            return
+
+    def _target(self, connection: str | None) -> _Connection | None:
+        if connection is None and len(self.connections) > 0:
+            # connections are kept in the order they connected
+            return next(iter(self.connections.values()))
+        return None if connection is None else self.connections.get(connection)
+
+    def send(self, request: Mapping[str, Any], connection: str | None = None) -> None:
+        target = self._target(connection)
+        if target is None and connection in self._seen and not self._closed:
+            # the implementation disconnected, it is sent once it connects again
+            self.driver.tell(DriverMessage.of_returned([request], connection))
+            return
+        if target is None:
+            self.on_error(
+                ValueError(
+                    f"No connection {connection} among {list(self.connections)} for action {request}"
+                )
+            )
+            return
+        target.requests.put(request)
+
+    def is_pressured(self, connection: str | None = None) -> bool:
+        target = self._target(connection)
+        return target is not None and target.requests.pressured
+
+    def pause(self) -> None:
+        self._receiving.clear()
+
+    async def close(self) -> None:
+        self._closed = True
+        try:
+            await asyncio.gather(
+                *(
+                    connection.requests.join()
+                    for connection in self.connections.values()
+                )
+            )
+        finally:
+            # wake up paused connections, so they see the backend is closed
+            self._receiving.set()
+            if self._server is not None:
+                self._server.close()
+                await self._server.wait_closed()
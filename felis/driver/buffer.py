@@ -0,0 +1,174 @@
+import base64
+import json
+import os
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import IO, Any, Mapping
+
+from ..actor import ActorMetrics
+
+# an action, the connection to send it on and when it was buffered
+Entry = tuple[Mapping[str, Any], str | None, float]
+
+# binary MessagePack actions may carry bytes, which JSON lines keep as base64
+_BYTES_KEY = "$bytes"
+
+
+def _encode_bytes(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return {_BYTES_KEY: base64.b64encode(value).decode()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_bytes(value: dict[str, Any]) -> Any:
+    if len(value) == 1 and isinstance(value.get(_BYTES_KEY), str):
+        return base64.b64decode(value[_BYTES_KEY])
+    return value
+
+
+def _dumps(entry: Entry) -> str:
+    return json.dumps(entry, default=_encode_bytes) + "\n"
+
+
+class OutboundBuffer:
+    """
+    OutboundBuffer: the actions a driver sends while its backend is disconnected, in the
+    order they were sent. Up to `capacity` actions are kept in memory. With `spill_path`
+    set, further actions are appended to that file, which also keeps the actions in
+    memory when the buffer is closed and is read back when it is opened again; otherwise
+    the oldest action is dropped for a new one. Actions older than `ttl` seconds are
+    dropped when they are taken out. Dropped, expired and spilled actions are counted,
+    also in the metrics set with `track`, and so are the actions buffered per connection.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        ttl: float | None = None,
+        spill_path: str | Path | None = None,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("Buffer capacity must be positive")
+        self._capacity = capacity
+        self._ttl = ttl
+        self._memory = deque[Entry]()
+        self._metrics: ActorMetrics | None = None
+        self._pending = Counter[str | None]()
+        self.dropped = 0
+        self.expired = 0
+        self.spilled = 0
+        self._spill_path = None if spill_path is None else Path(spill_path)
+        self._reader: IO[str] | None = None
+        self._writer: IO[str] | None = None
+        # entries in the spill file that were not read yet
+        self._spilled = 0
+        if self._spill_path is not None:
+            self._open_spill(self._spill_path)
+
+    def _open_spill(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = open(path, "a", encoding="utf-8")
+        self._reader = open(path, "r", encoding="utf-8")
+        for line in self._reader:
+            self._spilled += 1
+            try:
+                _, connection, _ = json.loads(line, object_hook=_decode_bytes)
+            except ValueError:
+                continue
+            self._pending[connection] += 1
+        self._reader.seek(0)
+
+    def track(self, metrics: ActorMetrics | None) -> None:
+        self._metrics = metrics
+
+    def __len__(self) -> int:
+        return len(self._memory) + self._spilled
+
+    def pending(self, connection: str | None) -> int:
+        """Number of actions buffered for `connection`."""
+        return self._pending[connection]
+
+    def push(self, action: Mapping[str, Any], connection: str | None) -> None:
+        entry = action, connection, time.time()
+        self._pending[connection] += 1
+        if self._spilled == 0 and len(self._memory) < self._capacity:
+            self._memory.append(entry)
+        elif self._writer is not None:
+            # entries in the file are newer than the ones in memory
+            self._write(entry)
+            self.spilled += 1
+            self._increment("actions_spilled")
+        else:
+            self._pending[self._memory.popleft()[1]] -= 1
+            self._memory.append(entry)
+            self.dropped += 1
+            self._increment("actions_dropped")
+
+    def push_front(self, entry: Entry) -> None:
+        """Puts back an entry taken out with `pop`."""
+        self._pending[entry[1]] += 1
+        self._memory.appendleft(entry)
+
+    def pop(self) -> Entry | None:
+        """Takes out the oldest action that did not expire, or returns None."""
+        deadline = None if self._ttl is None else time.time() - self._ttl
+        while True:
+            entry = self._memory.popleft() if len(self._memory) > 0 else self._read()
+            if entry is None:
+                return None
+            self._pending[entry[1]] -= 1
+            if deadline is not None and entry[2] < deadline:
+                self.expired += 1
+                self._increment("actions_expired")
+                continue
+            return entry
+
+    def _write(self, entry: Entry) -> None:
+        assert self._writer is not None
+        self._writer.write(_dumps(entry))
+        self._writer.flush()
+        self._spilled += 1
+
+    def _read(self) -> Entry | None:
+        while self._reader is not None and self._spilled > 0:
+            line = self._reader.readline()
+            self._spilled -= 1
+            if self._spilled == 0:
+                # every spilled entry was read, start the file over
+                assert self._writer is not None
+                self._writer.truncate(0)
+                self._reader.seek(0)
+            try:
+                action, connection, buffered_at = json.loads(
+                    line, object_hook=_decode_bytes
+                )
+            except ValueError:
+                # the last line is cut short if the process died while writing it
+                self.dropped += 1
+                self._increment("actions_dropped")
+                continue
+            return action, connection, buffered_at
+        return None
+
+    def close(self) -> None:
+        """Moves the actions in memory to the spill file, if there is one, and closes it."""
+        if self._reader is None or self._writer is None or self._spill_path is None:
+            self._memory.clear()
+            self._pending.clear()
+            return
+        if len(self._memory) > 0:
+            remaining = list(self._reader)
+            temp = self._spill_path.with_name(self._spill_path.name + ".tmp")
+            with open(temp, "w", encoding="utf-8") as file:
+                file.writelines(_dumps(entry) for entry in self._memory)
+                file.writelines(remaining)
+            os.replace(temp, self._spill_path)
+            self._memory.clear()
+        self._reader.close()
+        self._writer.close()
+        self._reader = self._writer = None
+
+    def _increment(self, name: str) -> None:
+        if self._metrics is not None:
+            self._metrics.increment(name)
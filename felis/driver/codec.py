@@ -0,0 +1,105 @@
+import json
+from abc import ABC, abstractmethod
+from importlib import import_module
+from types import ModuleType
+from typing import Any, Mapping
+
+from ..utils import Registry
+
+
+def _require(module: str, codec: str) -> ModuleType:
+    try:
+        return import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"Codec {codec} requires {module}, install it with `pip install {module}`"
+        ) from e
+
+
+class Codec(ABC):
+    """
+    Codec: decodes the frames a backend receives into data and encodes the data it sends.
+    Frames are decoded from str and bytes alike, as they arrive from the connection.
+    Codecs encoding into bytes set `binary`; their frames are sent as binary frames.
+    """
+
+    binary: bool = False
+
+    @abstractmethod
+    def decode(self, frame: str | bytes) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def encode(self, data: Mapping[str, Any]) -> str | bytes:
+        raise NotImplementedError()
+
+
+class Codecs(Registry[Codec]):
+    pass
+
+
+@Codecs.register("json")
+class JsonCodec(Codec):
+    def decode(self, frame: str | bytes) -> Any:
+        return json.loads(frame)
+
+    def encode(self, data: Mapping[str, Any]) -> str:
+        return json.dumps(data)
+
+
+@Codecs.register("orjson")
+class OrjsonCodec(Codec):
+    """Parses str frames in place and bytes frames without decoding them first."""
+
+    def __init__(self) -> None:
+        orjson = _require("orjson", "orjson")
+        self._loads = orjson.loads
+        self._dumps = orjson.dumps
+
+    def decode(self, frame: str | bytes) -> Any:
+        return self._loads(frame)
+
+    def encode(self, data: Mapping[str, Any]) -> str:
+        # text frames carry str; orjson only encodes into UTF-8 bytes
+        return self._dumps(data).decode()
+
+
+@Codecs.register("msgspec")
+class MsgspecCodec(Codec):
+    """Parses str and bytes frames alike, with a reused decoder and encoder."""
+
+    def __init__(self) -> None:
+        msgspec = _require("msgspec", "msgspec")
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def decode(self, frame: str | bytes) -> Any:
+        return self._decoder.decode(frame)
+
+    def encode(self, data: Mapping[str, Any]) -> str:
+        return self._encoder.encode(data).decode()
+
+
+@Codecs.register("msgpack")
+class MsgpackCodec(Codec):
+    """
+    Encodes into MessagePack binary frames, for implementations that support them.
+    Binary frames are decoded as MessagePack and text frames as JSON, since some
+    implementations still send events as text.
+    """
+
+    binary = True
+
+    def __init__(self) -> None:
+        msgspec = _require("msgspec", "msgpack")
+        self._decoder = msgspec.msgpack.Decoder()
+        self._encoder = msgspec.msgpack.Encoder()
+        self._json_decoder = msgspec.json.Decoder()
+
+    def decode(self, frame: str | bytes) -> Any:
+        if isinstance(frame, str):
+            return self._json_decoder.decode(frame)
+        return self._decoder.decode(frame)
+
+    def encode(self, data: Mapping[str, Any]) -> bytes:
+        return self._encoder.encode(data)
@@ -1,20 +1,31 @@
 from dataclasses import dataclass
-from typing import Mapping, Any
+from typing import Mapping, Any, Sequence
 
-from ..actor import Future
+from ..actor import ActorRef, Future
 from ..models.action import Action, ActionResponse
+from ..models.event import BaseEvent
 
 
 class AdapterMessage:
     @staticmethod
-    def of_response(data: Mapping[str, Any]) -> "AdapterMessage":
-        return ServerData(data)
+    def of_response(
+        data: Mapping[str, Any], connection: str | None = None
+    ) -> "AdapterMessage":
+        return ServerData(data, connection)
 
     @staticmethod
     def of_action(
-        action: Action, future: Future[ActionResponse] | None = None
+        action: Action,
+        future: Future[ActionResponse] | None = None,
+        self_id: str | None = None,
+    ) -> "AdapterMessage":
+        return ClientAction(action, future, self_id)
+
+    @staticmethod
+    def of_subscribe(
+        subscriber: ActorRef[Any], events: Sequence[type[BaseEvent]]
     ) -> "AdapterMessage":
-        return ClientAction(action, future)
+        return SubscribeEvents(subscriber, events)
 
     @staticmethod
     def of_terminated() -> "AdapterMessage":
@@ -24,6 +35,7 @@ class AdapterMessage:
 @dataclass
 class ServerData(AdapterMessage):
     data: Mapping[str, Any]
+    connection: str | None = None
 
 
 @dataclass
@@ -32,6 +44,16 @@ class ClientAction(AdapterMessage):
 
     action: Action
     future: Future | None = None
+    # the bot to send the action with, if the driver serves several
+    self_id: str | None = None
+
+
+@dataclass
+class SubscribeEvents(AdapterMessage):
+    """subscribe a client to events of the given classes, also from other nodes"""
+
+    subscriber: ActorRef[Any]
+    events: Sequence[type[BaseEvent]]
 
 
 @dataclass
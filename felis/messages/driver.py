@@ -1,28 +1,54 @@
 from dataclasses import dataclass
-from typing import Any, Mapping
+from typing import Any, Mapping, Sequence
 
 
 class DriverMessage:
     @staticmethod
-    def of_data(data: Mapping[str, Any]) -> "BackendData":
-        return BackendData(data)
+    def of_data(
+        data: Mapping[str, Any], connection: str | None = None
+    ) -> "BackendData":
+        return BackendData(data, connection)
 
     @staticmethod
     def of_error(error: Exception) -> "BackendError":
         return BackendError(error)
 
     @staticmethod
-    def of_action(action: Mapping[str, Any]) -> "AdapterAction":
-        return AdapterAction(action)
+    def of_action(
+        action: Mapping[str, Any], connection: str | None = None
+    ) -> "AdapterAction":
+        return AdapterAction(action, connection)
 
     @staticmethod
-    def of_closed() -> "BackendClosed":
-        return BackendClosed()
+    def of_connected(connection: str | None = None) -> "BackendConnected":
+        return BackendConnected(connection)
+
+    @staticmethod
+    def of_closed(connection: str | None = None) -> "BackendClosed":
+        return BackendClosed(connection)
+
+    @staticmethod
+    def of_returned(
+        requests: Sequence[Mapping[str, Any]], connection: str | None = None
+    ) -> "BackendReturned":
+        return BackendReturned(requests, connection)
+
+    @staticmethod
+    def of_pressure(
+        pressured: bool, connection: str | None = None
+    ) -> "BackendPressure":
+        return BackendPressure(pressured, connection)
+
+    @staticmethod
+    def of_reconnect() -> "Reconnect":
+        return Reconnect()
 
 
 @dataclass
 class BackendData(DriverMessage):
     data: Mapping[str, Any]
+    # the connection the data came from, for backends with several
+    connection: str | None = None
 
 
 @dataclass
@@ -30,11 +56,41 @@ class BackendError(DriverMessage):
     error: Exception
 
 
+@dataclass
+class BackendConnected(DriverMessage):
+    # a connection of a backend with several, or the backend itself if None
+    connection: str | None = None
+
+
 @dataclass
 class BackendClosed(DriverMessage):
-    pass
+    # a connection of a backend with several, or the backend itself if None
+    connection: str | None = None
+
+
+@dataclass
+class BackendReturned(DriverMessage):
+    """requests a connection closed before sending, handed back in order"""
+
+    requests: Sequence[Mapping[str, Any]]
+    connection: str | None = None
+
+
+@dataclass
+class BackendPressure(DriverMessage):
+    """the outbound queue of a connection crossed its high or low watermark"""
+
+    pressured: bool
+    connection: str | None = None
 
 
 @dataclass
 class AdapterAction(DriverMessage):
     action: Mapping[str, Any]
+    # the connection to send the action on, for backends with several
+    connection: str | None = None
+
+
+@dataclass
+class Reconnect(DriverMessage):
+    pass
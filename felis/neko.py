@@ -1,9 +1,19 @@
 import asyncio
+import signal
 from pathlib import Path
 from pydantic import BaseModel
 from typing_extensions import Self
 
-from .actor import ActorContext, Behavior, Behaviors, ActorSystem
+from .actor import (
+    ActorContext,
+    Behavior,
+    Behaviors,
+    ActorSystem,
+    Dispatchers,
+    Placements,
+    RemoteConfig,
+)
+from .utils import Logger
 from .adapter import AdapterConfig, AdapterActor
 from .client import ClientConfig, ClientActor
 from .database import DatabaseConfig, DatabaseActor
@@ -17,12 +27,21 @@ class NekoConfig(BaseModel):
     client: ClientConfig = ClientConfig()
     database: DatabaseConfig | None = None
     driver: DriverConfig
+    metrics: bool = False
+    # number of event loops isolating slow actors from I/O, not for parallelism; the
+    # client runs on one of them if there are any
+    isolated_loops: int = 0
+    remote: RemoteConfig | None = None
+    # node running the driver and the adapter; if set, this node only runs the client
+    hub: str | None = None
 
 
 class Neko:
     def __init__(self, config: NekoConfig) -> None:
         self._name = config.name
         self._config = config
+        # the loop only keeps weak references to its tasks
+        self._shutdown: asyncio.Task[None] | None = None
 
     @classmethod
     def from_config(cls, config: NekoConfig) -> Self:
@@ -40,21 +59,48 @@ class Neko:
         pass
 
     def setup(self, context: ActorContext[NekoMessage]) -> Behavior[NekoMessage]:
-        self.adapter = context.spawn(
-            AdapterActor.of(self.config.adapter).apply(), name="adapter"
-        )
+        if self.config.hub is not None:
+            remoting = context.system.remoting
+            if remoting is None:
+                raise ValueError("A hub requires remote to be configured")
+            self.adapter = remoting.ref(
+                f"felis://{self.config.hub}/{self.name}/adapter"
+            )
+        else:
+            self.adapter = context.spawn(
+                AdapterActor.of(self.config.adapter).apply(), name="adapter"
+            )
         self.client = context.spawn(
-            ClientActor.of(self.config.client, self.adapter).apply(), name="client"
+            ClientActor.of(self.config.client, self.adapter).apply(),
+            name="client",
+            placement=Placements.round_robin(),
         )
+        # drained on shutdown in this order: events flow from the adapter to the client,
+        # whose actions go back through the adapter to the driver
+        shutdown = context.system.coordinated_shutdown
+        shutdown.add_drain(self.adapter)
+        shutdown.add_drain(self.client)
+        if self.config.hub is None:
+            self.spawn_services(context)
+        self.customized_setup(context)
+        return Behavior[NekoMessage].same
+
+    def spawn_services(self, context: ActorContext[NekoMessage]) -> None:
         self.driver = context.spawn(
-            DriverActor.of(self.config.driver, self.adapter).apply(), name="driver"
+            DriverActor.of(self.config.driver, self.adapter).apply(),
+            name="driver",
+            placement=Placements.io(),
         )
+        context.system.coordinated_shutdown.add_drain(self.driver)
         if self.config.database:
+            # pymongo blocks, so keep database writes off the event loop
             self.database = context.spawn(
-                DatabaseActor.of(self.config.database).apply(), name="database"
+                DatabaseActor.of(self.config.database).apply(),
+                name="database",
+                dispatcher=Dispatchers.thread(1),
             )
-        self.customized_setup(context)
-        return Behavior[NekoMessage].same
+            # its mailbox buffers the messages to write
+            context.system.coordinated_shutdown.add_drain(self.database)
 
     def on_message(self, _, message: NekoMessage) -> Behavior[NekoMessage]:
         match message:
@@ -71,8 +117,28 @@ class Neko:
         return self._name
 
     async def start(self):
-        system = ActorSystem(self.apply(), self.name)
-        await system.wait()
+        self.system = ActorSystem(
+            self.apply(),
+            self.name,
+            metrics=self.config.metrics,
+            isolated_loops=self.config.isolated_loops,
+            remote=self.config.remote,
+        )
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+            except NotImplementedError:
+                # not supported by the event loops on Windows
+                pass
+        await self.system.wait()
+
+    def stop(self) -> None:
+        """Shuts the actor system down gracefully, see `CoordinatedShutdown`."""
+        if self._shutdown is not None or self.system.coordinated_shutdown.is_started:
+            return
+        Logger.instance.info(f"Shutting down {self.name}...")
+        self._shutdown = self.system.io_loop.create_task(self.system.shutdown())
 
     def run(self):
         asyncio.run(self.start())
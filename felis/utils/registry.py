@@ -6,6 +6,11 @@ T = TypeVar("T")
 class Registry(Generic[T]):
     registries: dict[str, Type[T]] = {}
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # every registry keeps its own entries
+        cls.registries = {}
+
     @classmethod
     def register(cls, name: str) -> Callable[[Type[T]], Type[T]]:
         def init(obj: Type[T]) -> Type[T]:
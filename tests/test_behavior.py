@@ -0,0 +1,101 @@
+import asyncio
+import pickle
+from typing import Any, Callable
+
+from felis.actor import ActorSystem, Behavior, Behaviors
+from felis.utils import Logger, LoggerLevel
+
+Logger.instance.set_level(LoggerLevel.WARNING)
+
+
+def run(
+    behavior: Behavior[Any],
+    messages: list[Any],
+    wait: float = 0.1,
+    **spawn: Any,
+) -> None:
+    """Spawns `behavior`, tells it `messages` at once and waits for it to handle them."""
+
+    async def main() -> None:
+        refs = []
+
+        def setup(context):
+            refs.append(context.spawn(behavior, "actor", **spawn))
+            return Behaviors.receive(lambda _, __: Behaviors.same)
+
+        system = ActorSystem(Behaviors.setup(setup), "test")
+        await asyncio.sleep(0)
+        for message in messages:
+            refs[0].tell(message)
+        await asyncio.sleep(wait)
+        await system.shutdown()
+
+    asyncio.run(main())
+
+
+def recorder(handled: list[Any]) -> Callable[[Any, Any], Behavior[Any]]:
+    def on_receive(_, message):
+        handled.append(message)
+        return Behaviors.same
+
+    return on_receive
+
+
+def test_receive_batch_gets_the_drained_messages():
+    batches = list[list[int]]()
+    run(
+        Behaviors.receive_batch(recorder(batches)),
+        list(range(10)),
+        batch_size=4,
+    )
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert sum(batches, []) == list(range(10))
+
+
+def test_receive_batch_can_change_behavior():
+    handled = list[Any]()
+
+    def first(_, batch):
+        handled.append(("batch", batch))
+        return Behaviors.receive_message(recorder(handled))
+
+    run(Behaviors.receive_batch(first), list(range(4)), batch_size=2)
+    assert handled == [("batch", [0, 1]), 2, 3]
+
+
+def concurrency_of(concurrency: int) -> tuple[int, list[int]]:
+    running = [0, 0]
+    finished = list[int]()
+
+    async def on_message(_, message):
+        running[0] += 1
+        running[1] = max(running[1], running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        finished.append(message)
+
+    behavior = Behaviors.receive_async(on_message, concurrency)
+    run(behavior, list(range(6)), wait=0.2)
+    return running[1], finished
+
+
+def test_receive_async_handles_messages_one_at_a_time_in_order():
+    peak, finished = concurrency_of(1)
+    assert peak == 1
+    assert finished == list(range(6))
+
+
+def test_receive_async_bounds_concurrency():
+    peak, finished = concurrency_of(3)
+    assert peak == 3
+    assert sorted(finished) == list(range(6))
+
+
+def test_receive_async_wrappers_can_be_pickled():
+    behavior = Behaviors.receive_async(_handler)
+    wrapper = pickle.loads(pickle.dumps(behavior.on_receive_async))
+    assert wrapper.args == (_handler,)
+
+
+async def _handler(_, __) -> None:
+    pass
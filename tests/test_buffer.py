@@ -0,0 +1,95 @@
+import time
+from pathlib import Path
+
+from felis.driver.backend import Backoff
+from felis.driver.buffer import OutboundBuffer
+
+
+def actions(buffer: OutboundBuffer) -> list[int]:
+    taken = list[int]()
+    while (entry := buffer.pop()) is not None:
+        taken.append(entry[0]["seq"])
+    return taken
+
+
+def test_overflow_drops_the_oldest_actions():
+    buffer = OutboundBuffer(3)
+    for seq in range(5):
+        buffer.push({"seq": seq}, None)
+    assert buffer.dropped == 2
+    assert actions(buffer) == [2, 3, 4]
+
+
+def test_spilled_actions_replay_in_order(tmp_path: Path):
+    buffer = OutboundBuffer(2, spill_path=tmp_path / "spill.jsonl")
+    for seq in range(5):
+        buffer.push({"seq": seq}, None)
+    assert buffer.spilled == 3
+    assert len(buffer) == 5
+    assert actions(buffer) == [0, 1, 2, 3, 4]
+    # the file starts over once it is read, and takes new actions after memory fills
+    for seq in range(5, 8):
+        buffer.push({"seq": seq}, None)
+    assert actions(buffer) == [5, 6, 7]
+    buffer.close()
+
+
+def test_closed_buffers_reopen_with_their_actions(tmp_path: Path):
+    path = tmp_path / "spill.jsonl"
+    buffer = OutboundBuffer(2, spill_path=path)
+    for seq in range(4):
+        buffer.push({"seq": seq, "data": b"\x00\xff"}, "bot")
+    buffer.close()
+
+    buffer = OutboundBuffer(2, spill_path=path)
+    assert buffer.pending("bot") == 4
+    entry = buffer.pop()
+    assert entry is not None and entry[0] == {"seq": 0, "data": b"\x00\xff"}
+    assert entry[1] == "bot"
+    assert actions(buffer) == [1, 2, 3]
+    assert buffer.pending("bot") == 0
+    buffer.close()
+
+
+def test_torn_spill_lines_are_dropped(tmp_path: Path):
+    path = tmp_path / "spill.jsonl"
+    buffer = OutboundBuffer(1, spill_path=path)
+    for seq in range(3):
+        buffer.push({"seq": seq}, None)
+    buffer.close()
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('[{"seq": 3}, nu')
+
+    buffer = OutboundBuffer(1, spill_path=path)
+    assert actions(buffer) == [0, 1, 2]
+    assert buffer.dropped == 1
+    buffer.close()
+
+
+def test_expired_actions_are_skipped():
+    buffer = OutboundBuffer(10, ttl=0.05)
+    buffer.push({"seq": 0}, None)
+    time.sleep(0.1)
+    buffer.push({"seq": 1}, None)
+    assert actions(buffer) == [1]
+    assert buffer.expired == 1
+
+
+def test_pending_counts_actions_per_connection():
+    buffer = OutboundBuffer(10)
+    buffer.push({"seq": 0}, "a")
+    buffer.push({"seq": 1}, "b")
+    buffer.push({"seq": 2}, "a")
+    assert (buffer.pending("a"), buffer.pending("b")) == (2, 1)
+    entry = buffer.pop()
+    assert entry is not None and buffer.pending("a") == 1
+    buffer.push_front(entry)
+    assert buffer.pending("a") == 2
+    assert actions(buffer) == [0, 1, 2]
+
+
+def test_backoff_grows_up_to_the_maximum():
+    backoff = Backoff(initial=1.0, maximum=8.0, multiplier=2.0, jitter=0.0)
+    assert [backoff.delay(attempt) for attempt in range(6)] == [1, 2, 4, 8, 8, 8]
+    jittered = Backoff(initial=1.0, maximum=8.0, jitter=0.5)
+    assert all(0.5 <= jittered.delay(0) <= 1.0 for _ in range(100))
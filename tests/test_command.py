@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from felis.client.command import Command
+from felis.models.event import BaseEvent
+from felis.models.events import MessageEvent
+
+
+class Echo(Command[MessageEvent]):
+    async def execute(self, event: MessageEvent) -> None:
+        pass
+
+
+class Anything(Command[BaseEvent]):
+    async def execute(self, event) -> None:  # type: ignore
+        pass
+
+
+class Broken(Command[Any]):
+    async def execute(self, event: MessageEvent | None) -> None:
+        pass
+
+
+def command(cls: type[Command]) -> Command:
+    return cls.__new__(cls)
+
+
+def test_event_type_resolves_string_annotations():
+    assert command(Echo).event_type is MessageEvent
+
+
+def test_event_type_defaults_to_all_events():
+    assert command(Anything).event_type is BaseEvent
+
+
+def test_event_type_must_be_a_class():
+    with pytest.raises(TypeError):
+        command(Broken).event_type
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+import pytest
+
+from felis.actor import ActorSystem, Behaviors
+from felis.actor.future import Future
+from felis.utils import Logger, LoggerLevel
+
+Logger.instance.set_level(LoggerLevel.WARNING)
+
+
+def test_future_times_out():
+    async def main() -> None:
+        future = Future(loop=asyncio.get_running_loop(), timeout=0.05)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(future, 1.0)
+
+    asyncio.run(main())
+
+
+def test_future_ignores_completions_after_the_first():
+    async def main() -> int:
+        future = Future(loop=asyncio.get_running_loop(), timeout=0.05)
+        future.set_result(1)
+        future.set_result(2)
+        future.set_exception(RuntimeError())
+        await asyncio.sleep(0.1)
+        return await future
+
+    assert asyncio.run(main()) == 1
+
+
+def test_future_created_off_its_loop_completes():
+    async def main() -> int:
+        loop = asyncio.get_running_loop()
+        futures = list[Future]()
+
+        thread = threading.Thread(
+            target=lambda: futures.append(Future(loop=loop, timeout=1.0))
+        )
+        thread.start()
+        thread.join()
+        # completed on the loop, as by an actor replying to an ask from another thread
+        futures[0].set_result(42)
+        return await asyncio.wait_for(futures[0], 1.0)
+
+    assert asyncio.run(main()) == 42
+
+
+def test_future_created_off_its_loop_times_out():
+    async def main() -> None:
+        loop = asyncio.get_running_loop()
+        futures = list[Future]()
+        thread = threading.Thread(
+            target=lambda: futures.append(Future(loop=loop, timeout=0.05))
+        )
+        thread.start()
+        thread.join()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(futures[0], 1.0)
+
+    asyncio.run(main())
+
+
+def test_ask_many_keeps_replies_when_some_time_out():
+    def replier(value: int):
+        def on_message(_, future):
+            if value > 0:
+                future.set_result(value)
+            return Behaviors.same
+
+        return Behaviors.receive_message(on_message)
+
+    async def main() -> list:
+        contexts = []
+
+        def setup(context):
+            contexts.append(context)
+            return Behaviors.receive(lambda _, __: Behaviors.same)
+
+        system = ActorSystem(Behaviors.setup(setup), "test")
+        await asyncio.sleep(0.05)
+        context = contexts[0]
+        refs = [context.spawn(replier(i), f"replier_{i}") for i in range(3)]
+        replies = await context.ask_many(refs, lambda future: future, timeout=0.1)
+        await system.shutdown()
+        return replies
+
+    replies = asyncio.run(main())
+    assert [reply.result for reply in replies] == [None, 1, 2]
+    assert isinstance(replies[0].error, asyncio.TimeoutError)
+    assert replies[1].ok and replies[2].ok
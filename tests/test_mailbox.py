@@ -0,0 +1,122 @@
+import asyncio
+from functools import partial
+
+import pytest
+
+from felis.actor import Signal
+from felis.actor.mailbox import DequeMailbox, OverflowPolicy, PriorityMailbox
+from felis.actor.mailbox import QueueMailbox
+
+MAILBOXES = [DequeMailbox, QueueMailbox]
+
+
+def drain(mailbox, limit: int = 100) -> list:
+    return asyncio.run(mailbox.get_batch(limit)) if len(mailbox) > 0 else []
+
+
+@pytest.mark.parametrize("factory", MAILBOXES)
+def test_messages_are_delivered_in_order(factory):
+    mailbox = factory()
+    for i in range(5):
+        assert mailbox.offer(i)
+    assert drain(mailbox) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("factory", MAILBOXES)
+def test_batches_are_limited(factory):
+    mailbox = factory()
+    for i in range(5):
+        mailbox.offer(i)
+    assert drain(mailbox, 2) == [0, 1]
+    assert drain(mailbox, 2) == [2, 3]
+    assert len(mailbox) == 1
+
+
+@pytest.mark.parametrize("factory", MAILBOXES)
+def test_drop_newest_keeps_the_queued_messages(factory):
+    mailbox = factory(2, OverflowPolicy.DROP_NEWEST)
+    assert all(mailbox.offer(i) for i in range(4))
+    assert drain(mailbox) == [0, 1]
+    assert mailbox.dropped[OverflowPolicy.DROP_NEWEST] == 2
+
+
+@pytest.mark.parametrize("factory", MAILBOXES)
+def test_drop_oldest_keeps_the_newest_messages(factory):
+    mailbox = factory(2, OverflowPolicy.DROP_OLDEST)
+    assert all(mailbox.offer(i) for i in range(4))
+    assert drain(mailbox) == [2, 3]
+    assert mailbox.dropped[OverflowPolicy.DROP_OLDEST] == 2
+
+
+@pytest.mark.parametrize("factory", MAILBOXES)
+def test_dead_letters_rejects_messages(factory):
+    mailbox = factory(1, OverflowPolicy.DEAD_LETTERS)
+    assert mailbox.offer(0)
+    assert not mailbox.offer(1)
+    assert mailbox.dropped[OverflowPolicy.DEAD_LETTERS] == 1
+
+
+@pytest.mark.parametrize("factory", MAILBOXES)
+def test_block_waits_for_free_space(factory):
+    async def main() -> list:
+        mailbox = factory(1, OverflowPolicy.BLOCK)
+        await mailbox.offer_async(0)
+        putter = asyncio.ensure_future(mailbox.offer_async(1))
+        await asyncio.sleep(0.01)
+        assert not putter.done()
+        taken = await mailbox.get_batch(1)
+        assert await asyncio.wait_for(putter, 1.0)
+        return taken + await mailbox.get_batch(1)
+
+    assert asyncio.run(main()) == [0, 1]
+
+
+@pytest.mark.parametrize("factory", MAILBOXES)
+def test_close_releases_blocked_senders(factory):
+    async def main() -> bool:
+        mailbox = factory(1, OverflowPolicy.BLOCK)
+        await mailbox.offer_async(0)
+        putter = asyncio.ensure_future(mailbox.offer_async(1))
+        await asyncio.sleep(0.01)
+        mailbox.close()
+        return await asyncio.wait_for(putter, 1.0)
+
+    assert asyncio.run(main()) is False
+
+
+class Ping(Signal):
+    pass
+
+
+@pytest.mark.parametrize("factory", [DequeMailbox, partial(PriorityMailbox, key=abs)])
+def test_signals_go_ahead_of_messages(factory):
+    mailbox = factory()
+    mailbox.offer(1)
+    mailbox.offer(2)
+    ping = Ping()
+    mailbox.offer_signal(ping)
+    assert drain(mailbox) == [ping, 1, 2]
+
+
+def test_signals_ignore_the_capacity():
+    mailbox = DequeMailbox(1, OverflowPolicy.DEAD_LETTERS)
+    mailbox.offer(1)
+    ping = Ping()
+    assert mailbox.offer_signal(ping)
+    # signals don't count towards the capacity either
+    assert not mailbox.offer(2)
+    assert drain(mailbox) == [ping, 1]
+
+
+def test_priority_mailbox_orders_by_key_then_arrival():
+    mailbox = PriorityMailbox(key=lambda message: message[0])
+    for message in [(2, "a"), (1, "b"), (2, "c"), (1, "d")]:
+        mailbox.offer(message)
+    assert drain(mailbox) == [(1, "b"), (1, "d"), (2, "a"), (2, "c")]
+
+
+def test_priority_mailbox_drops_the_last_message_to_deliver():
+    mailbox = PriorityMailbox(2, OverflowPolicy.DROP_OLDEST, key=abs)
+    for message in [3, 1, 2]:
+        mailbox.offer(message)
+    assert drain(mailbox) == [1, 2]
@@ -0,0 +1,105 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from felis.actor import ActorSystem, Behaviors, Storages
+from felis.actor.persistence import FileStorage, Storage
+from felis.utils import Logger, LoggerLevel
+
+Logger.instance.set_level(LoggerLevel.ERROR)
+
+
+@pytest.fixture(params=["sqlite", "files"])
+def storage(request, tmp_path: Path):
+    if request.param == "sqlite":
+        storage = Storages.sqlite(tmp_path / "journal.db")
+    else:
+        storage = Storages.files(tmp_path / "journal")
+    yield storage
+    storage.close()
+
+
+def test_events_and_snapshots_round_trip(storage: Storage):
+    storage.write_events("a", [(1, b"one"), (2, b"two")])
+    storage.write_events("a", [(3, b"three")])
+    storage.write_events("b", [(1, b"other")])
+    assert list(storage.read_events("a", 1)) == [(2, b"two"), (3, b"three")]
+    storage.save_snapshot("a", 2, b"state")
+    storage.delete_events("a", 2)
+    assert storage.load_snapshot("a") == (2, b"state")
+    assert list(storage.read_events("a", 0)) == [(3, b"three")]
+    assert storage.load_snapshot("b") is None
+
+
+def test_torn_records_are_cut_off_the_journal(tmp_path: Path):
+    storage = FileStorage(tmp_path)
+    storage.write_events("a", [(1, b"one"), (2, b"two")])
+    storage.close()
+    journal = next(tmp_path.glob("*.journal"))
+    complete = journal.stat().st_size
+    # a record whose write was cut short by a crash
+    with open(journal, "ab") as file:
+        file.write(b"\x00\x00\x00\x00\x00\x00\x00\x03\x00\x00")
+
+    storage = FileStorage(tmp_path)
+    assert list(storage.read_events("a", 0)) == [(1, b"one"), (2, b"two")]
+    assert journal.stat().st_size == complete
+    storage.write_events("a", [(3, b"three")])
+    assert [seq for seq, _ in storage.read_events("a", 0)] == [1, 2, 3]
+    storage.close()
+
+
+def test_corrupted_records_end_the_journal(tmp_path: Path):
+    storage = FileStorage(tmp_path)
+    storage.write_events("a", [(1, b"one"), (2, b"two")])
+    storage.close()
+    journal = next(tmp_path.glob("*.journal"))
+    data = bytearray(journal.read_bytes())
+    data[-1] ^= 0xFF
+    journal.write_bytes(bytes(data))
+
+    storage = FileStorage(tmp_path)
+    assert list(storage.read_events("a", 0)) == [(1, b"one")]
+    storage.close()
+
+
+def run_counter(storage: Storage, messages: list[Any]) -> list[int]:
+    """Runs a persistent counter, adds `messages` to it and returns the states seen."""
+    states = list[int]()
+
+    def factory(context, persistence):
+        def on_message(_, message):
+            states.append(persistence.persist(message))
+            return Behaviors.same
+
+        states.append(persistence.state)
+        return Behaviors.receive_message(on_message)
+
+    async def main() -> None:
+        refs = []
+
+        def setup(context):
+            behavior = Behaviors.with_persistence(
+                "counter", storage, 0, lambda state, event: state + event, factory, 3
+            )
+            refs.append(context.spawn(behavior, "counter"))
+            return Behaviors.receive(lambda _, __: Behaviors.same)
+
+        system = ActorSystem(Behaviors.setup(setup), "test")
+        await asyncio.sleep(0)
+        # told while recovering, so they are stashed until it completes
+        for message in messages:
+            refs[0].tell(message)
+        await asyncio.sleep(0.1)
+        await system.shutdown()
+
+    asyncio.run(main())
+    return states
+
+
+def test_state_is_recovered_from_snapshots_and_events(storage: Storage):
+    assert run_counter(storage, [1, 2, 3, 4]) == [0, 1, 3, 6, 10]
+    assert run_counter(storage, [5]) == [10, 15]
+    assert run_counter(storage, []) == [15]
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+from felis.actor import ActorSystem, Behaviors, Placements
+from felis.utils import Logger, LoggerLevel
+
+Logger.instance.set_level(LoggerLevel.WARNING)
+
+
+def test_isolated_actors_run_on_their_own_loop():
+    async def main() -> None:
+        threads = list[int]()
+        done = asyncio.get_running_loop().create_future()
+
+        def on_message(context, message):
+            threads.append(threading.get_ident())
+            done.get_loop().call_soon_threadsafe(done.set_result, message)
+            return Behaviors.same
+
+        refs = []
+
+        def setup(context):
+            behavior = Behaviors.receive_message(on_message)
+            refs.append(
+                context.spawn(behavior, "slow", placement=Placements.isolated(0))
+            )
+            return Behaviors.receive(lambda _, __: Behaviors.same)
+
+        system = ActorSystem(Behaviors.setup(setup), "test", isolated_loops=1)
+        await asyncio.sleep(0.05)
+        refs[0].tell("ping")
+        assert await asyncio.wait_for(done, 1.0) == "ping"
+        assert threads[0] != threading.get_ident()
+        assert refs[0].ref._context.loop is system.isolated_loops[0]
+        await system.shutdown()
+
+    asyncio.run(main())
+
+
+def test_placements_fall_back_to_the_io_loop():
+    async def main() -> None:
+        refs = []
+
+        def setup(context):
+            behavior = Behaviors.receive(lambda _, __: Behaviors.same)
+            refs.append(
+                context.spawn(behavior, "a", placement=Placements.round_robin())
+            )
+            return Behaviors.receive(lambda _, __: Behaviors.same)
+
+        system = ActorSystem(Behaviors.setup(setup), "test")
+        await asyncio.sleep(0.05)
+        assert refs[0].ref._context.loop is system.io_loop
+        await system.shutdown()
+
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+import asyncio
+from typing import Any
+
+from felis.actor import (
+    ActorSystem,
+    Behaviors,
+    ListingResponse,
+    ListingUpdate,
+    ReceptionistRequest,
+    RemoteConfig,
+    ServiceKey,
+)
+from felis.actor.internal.receptionist import Listing
+from felis.utils import Logger, LoggerLevel
+
+Logger.instance.set_level(LoggerLevel.ERROR)
+
+KEY = ServiceKey[Any]("service")
+SECRET = "test-secret"
+
+
+async def eventually(condition, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met"
+        await asyncio.sleep(0.02)
+
+
+def node(name: str, contexts: dict[str, Any], received: list[Any], peers=None):
+    """A node with an `echo` actor that replies to asks and registers with `KEY`."""
+
+    def echo(_, message):
+        if isinstance(message, tuple):
+            future, value = message
+            future.set_result(value * 2)
+        else:
+            received.append(message)
+        return Behaviors.same
+
+    listing = Listing[Any]()
+
+    def on_listing(_, message):
+        if isinstance(message, (ListingResponse, ListingUpdate)):
+            listing.apply(message)
+        return Behaviors.same
+
+    def setup(context):
+        contexts[name] = context
+        ref = context.spawn(Behaviors.receive_message(echo), "echo")
+        context.system.receptionist.tell(ReceptionistRequest.register(KEY, ref))
+        watcher = context.spawn(Behaviors.receive_message(on_listing), "watcher")
+        context.system.receptionist.tell(ReceptionistRequest.subscribe(KEY, watcher))
+        return Behaviors.receive(lambda _, __: Behaviors.same)
+
+    config = RemoteConfig(
+        node=name, address="tcp://127.0.0.1:0", peers=peers or {}, secret=SECRET
+    )
+    return ActorSystem(Behaviors.setup(setup), name, remote=config), listing
+
+
+def test_two_nodes_on_localhost():
+    async def main() -> None:
+        contexts = dict[str, Any]()
+        received_a, received_b = list[Any](), list[Any]()
+        a, listing_a = node("a", contexts, received_a)
+        await asyncio.sleep(0.05)
+        assert a.remoting is not None
+        b, listing_b = node("b", contexts, received_b, {"a": a.remoting.address})
+        assert b.remoting is not None
+
+        # receptionist entries are replicated to both nodes
+        await eventually(lambda: len(listing_a) == 2 and len(listing_b) == 2)
+
+        # tell
+        echo_b = a.remoting.ref("felis://b/b/echo")
+        echo_b.tell("hello")
+        await eventually(lambda: received_b == ["hello"])
+
+        # ask
+        echo_a = b.remoting.ref("felis://a/a/echo")
+        future = contexts["b"].ask(echo_a, lambda future: (future, 21), timeout=2.0)
+        assert await future == 42
+
+        # remote event stream subscriptions
+        a.event_stream.subscribe(echo_b, "topic")
+        assert a.event_stream.publish("event", "topic") == 1
+        await eventually(lambda: received_b == ["hello", "event"])
+
+        # disconnect cleanup
+        await b.remoting.close()
+        await eventually(lambda: "b" not in a.remoting.peers)
+        await eventually(lambda: len(listing_a) == 1)
+        assert a.event_stream.publish("event", "topic") == 0
+
+        await b.shutdown()
+        await a.shutdown()
+
+    asyncio.run(main())
+
+
+def test_peers_without_the_secret_are_rejected():
+    async def main() -> None:
+        contexts = dict[str, Any]()
+        a, _ = node("a", contexts, [])
+        await asyncio.sleep(0.05)
+        assert a.remoting is not None
+        config = RemoteConfig(
+            node="c", address="tcp://127.0.0.1:0", peers={"a": a.remoting.address}
+        )
+        c = ActorSystem(
+            Behaviors.receive(lambda _, __: Behaviors.same), "c", remote=config
+        )
+        await asyncio.sleep(0.3)
+        assert "c" not in a.remoting.peers
+        await c.shutdown()
+        await a.shutdown()
+
+    asyncio.run(main())
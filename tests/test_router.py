@@ -0,0 +1,111 @@
+import asyncio
+import time
+from typing import Any
+
+from felis.actor import ActorSystem, Behaviors, Executors, Resizer, Routers
+from felis.actor.internal.receptionist import Listing, ListingResponse, ListingUpdate
+from felis.utils import Logger, LoggerLevel
+
+Logger.instance.set_level(LoggerLevel.WARNING)
+
+
+def route(executor: Any, messages: list[Any], size: int = 4) -> dict[str, list[Any]]:
+    """Routes `messages` through a pool and returns them by the worker they reached."""
+    received = dict[str, list[Any]]()
+
+    def on_message(context, message):
+        received.setdefault(context.self.name, []).append(message)
+        return Behaviors.same
+
+    async def main() -> None:
+        refs = []
+
+        def setup(context):
+            pool = Routers.pool(size, Behaviors.receive_message(on_message), executor)
+            refs.append(context.spawn(pool.apply(), "pool"))
+            return Behaviors.receive(lambda _, __: Behaviors.same)
+
+        system = ActorSystem(Behaviors.setup(setup), "test")
+        await asyncio.sleep(0.05)
+        for message in messages:
+            refs[0].tell(message)
+        await asyncio.sleep(0.1)
+        await system.shutdown()
+
+    asyncio.run(main())
+    return received
+
+
+def test_consistent_hash_keeps_keys_on_one_worker_in_order():
+    messages = [(key, i) for i in range(20) for key in "abcdefgh"]
+    received = route(Executors.consistent_hash(lambda message: message[0]), messages)
+    owners = dict[str, str]()
+    for worker, handled in received.items():
+        for key, _ in handled:
+            assert owners.setdefault(key, worker) == worker
+        for key in set(key for key, _ in handled):
+            assert [i for k, i in handled if k == key] == list(range(20))
+    assert len(owners) == 8
+
+
+def test_consistent_hash_rebuilds_the_ring_when_workers_change():
+    async def main() -> None:
+        refs = []
+
+        def setup(context):
+            for i in range(3):
+                refs.append(
+                    context.spawn(
+                        Behaviors.receive(lambda _, __: Behaviors.same), f"w{i}"
+                    )
+                )
+            return Behaviors.receive(lambda _, __: Behaviors.same)
+
+        system = ActorSystem(Behaviors.setup(setup), "test")
+        await asyncio.sleep(0.05)
+        executor = Executors.consistent_hash(lambda message: message)
+        listing = Listing[Any]()
+        listing.apply(ListingResponse(*refs[:2]))
+        chosen = {executor.select(listing, None, key) for key in range(100)}  # type: ignore
+        assert chosen == set(refs[:2])
+        listing.apply(ListingUpdate([refs[2]], [refs[0]]))
+        chosen = {executor.select(listing, None, key) for key in range(100)}  # type: ignore
+        assert chosen == set(refs[1:])
+        await system.shutdown()
+
+    asyncio.run(main())
+
+
+def test_round_robin_takes_workers_in_turn():
+    received = route(Executors.round_robin(), list(range(8)))
+    assert sorted(len(handled) for handled in received.values()) == [2, 2, 2, 2]
+
+
+def test_pool_grows_under_pressure():
+    def on_message(context, message):
+        time.sleep(0.002)
+        return Behaviors.same
+
+    async def main() -> int:
+        refs = []
+
+        def setup(context):
+            resizer = Resizer(lower=1, upper=4, interval=0.02, max_depth=2.0)
+            behavior = Behaviors.receive_message(on_message)
+            refs.append(
+                context.spawn(
+                    Routers.pool(1, behavior, resizer=resizer).apply(), "pool"
+                )
+            )
+            return Behaviors.receive(lambda _, __: Behaviors.same)
+
+        system = ActorSystem(Behaviors.setup(setup), "test")
+        await asyncio.sleep(0.05)
+        for i in range(500):
+            refs[0].tell(i)
+        await asyncio.sleep(0.3)
+        size = len(refs[0].ref._context._children)
+        await system.shutdown()
+        return size
+
+    assert asyncio.run(main()) > 1
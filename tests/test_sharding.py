@@ -0,0 +1,124 @@
+import asyncio
+from typing import Any, Hashable
+
+from felis.actor import ActorSystem, Behaviors, Passivate, Sharding, Signal
+from felis.utils import Logger, LoggerLevel
+
+Logger.instance.set_level(LoggerLevel.WARNING)
+
+
+def run(region: Any, messages: list[tuple[Hashable, str]], wait: float = 0.3) -> None:
+    async def main() -> None:
+        refs = []
+
+        def setup(context):
+            refs.append(context.spawn(region.apply(), "region"))
+            return Behaviors.receive(lambda _, __: Behaviors.same)
+
+        system = ActorSystem(Behaviors.setup(setup), "test")
+        await asyncio.sleep(0.05)
+        for message in messages:
+            refs[0].tell(message)
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(wait)
+        await system.shutdown()
+
+    asyncio.run(main())
+
+
+def entity(received: list[tuple[Any, str]], stop_after: int | None = None):
+    def factory(key: Hashable):
+        count = [0]
+
+        def on_receive(_, message):
+            if isinstance(message, Passivate):
+                return Behaviors.stop
+            if isinstance(message, Signal):
+                return Behaviors.same
+            received.append((key, message[1]))
+            count[0] += 1
+            if stop_after is not None and count[0] >= stop_after:
+                return Behaviors.stop
+            return Behaviors.same
+
+        return Behaviors.receive(on_receive)
+
+    return factory
+
+
+def test_keys_are_not_compared_by_string():
+    received = list[tuple[Any, str]]()
+    region = Sharding.entities(entity(received), lambda message: message[0])
+    run(region, [(1, "a"), ("1", "b")])
+    assert received == [(1, "a"), ("1", "b")]
+
+
+def test_evicted_entities_replay_buffered_messages():
+    received = list[tuple[Any, str]]()
+    region = Sharding.entities(
+        entity(received), lambda message: message[0], max_entities=1
+    )
+    run(region, [("a", "1"), ("b", "2"), ("a", "3")])
+    assert sorted(received) == [("a", "1"), ("a", "3"), ("b", "2")]
+
+
+def test_entities_that_stopped_get_a_new_incarnation():
+    received = list[tuple[Any, str]]()
+    region = Sharding.entities(
+        entity(received, stop_after=1), lambda message: message[0]
+    )
+    run(region, [("a", "1"), ("a", "2"), ("a", "3")])
+    assert received == [("a", "1"), ("a", "2"), ("a", "3")]
+
+
+def test_messages_to_stopped_entities_wait_for_terminated():
+    received = list[str]()
+    regions = list[Any]()
+
+    def factory(key: Hashable):
+        def on_receive(_, message):
+            if isinstance(message, Signal):
+                return Behaviors.same
+            received.append(message[1])
+            if message[1] == "1":
+                # reaches the region before the `Terminated` of this entity
+                regions[0].tell((key, "2"))
+                return Behaviors.stop
+            return Behaviors.same
+
+        return Behaviors.receive(on_receive)
+
+    async def main() -> None:
+        def setup(context):
+            region = Sharding.entities(factory, lambda message: message[0])
+            regions.append(context.spawn(region.apply(), "region"))
+            return Behaviors.receive(lambda _, __: Behaviors.same)
+
+        system = ActorSystem(Behaviors.setup(setup), "test")
+        await asyncio.sleep(0.05)
+        regions[0].tell(("a", "1"))
+        await asyncio.sleep(0.1)
+        assert regions[0].ref.is_alive
+        await system.shutdown()
+
+    asyncio.run(main())
+    assert received == ["1", "2"]
+
+
+def test_idle_entities_are_passivated():
+    passivated = list[Hashable]()
+
+    def factory(key: Hashable):
+        def on_receive(_, message):
+            if isinstance(message, Passivate):
+                passivated.append(key)
+                return Behaviors.stop
+            return Behaviors.same
+
+        return Behaviors.receive(on_receive)
+
+    region = Sharding.entities(
+        factory, lambda message: message[0], idle_timeout=0.05, check_interval=0.02
+    )
+    run(region, [("a", "1")])
+    assert passivated == ["a"]
@@ -0,0 +1,59 @@
+import asyncio
+from typing import Any
+
+from felis.actor import ActorSystem, Behaviors
+from felis.utils import Logger, LoggerLevel
+
+Logger.instance.set_level(LoggerLevel.WARNING)
+
+
+def run(capacity: int, messages: list[Any]) -> tuple[list[Any], list[Any]]:
+    """
+    Runs an actor that stashes messages until it gets "ready", then handles the stashed
+    messages and the rest. Returns the handled messages and the dead letters.
+    """
+    handled, dead = list[Any](), list[Any]()
+
+    def waiting(context, stash):
+        def on_message(_, message):
+            if message == "ready":
+                return stash.unstash_all(Behaviors.receive_message(ready))
+            stash.stash(message)
+            return Behaviors.same
+
+        return Behaviors.receive_message(on_message)
+
+    def ready(_, message):
+        handled.append(message)
+        return Behaviors.same
+
+    async def main() -> None:
+        refs = []
+
+        def setup(context):
+            behavior = Behaviors.with_stash(capacity, waiting)
+            refs.append(context.spawn(behavior, "actor", metrics=True))
+            return Behaviors.receive(lambda _, __: Behaviors.same)
+
+        system = ActorSystem(Behaviors.setup(setup), "test")
+        system.dead_letter = lambda message, _: dead.append(message)  # type: ignore
+        await asyncio.sleep(0)
+        for message in messages:
+            refs[0].tell(message)
+        await asyncio.sleep(0.1)
+        await system.shutdown()
+
+    asyncio.run(main())
+    return handled, dead
+
+
+def test_unstash_all_goes_before_queued_messages():
+    handled, dead = run(10, [1, 2, "ready", 3])
+    assert handled == [1, 2, 3]
+    assert dead == []
+
+
+def test_full_stash_sends_messages_to_dead_letters():
+    handled, dead = run(2, [1, 2, 3, "ready"])
+    assert handled == [1, 2]
+    assert dead == [3]
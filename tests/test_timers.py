@@ -0,0 +1,103 @@
+import asyncio
+import time
+from typing import Any
+
+from felis.actor import ActorSystem, Behaviors, Signal
+from felis.actor.timers import TimingWheel
+from felis.utils import Logger, LoggerLevel
+
+Logger.instance.set_level(LoggerLevel.WARNING)
+
+
+def test_timers_fire_after_blocked_loop():
+    async def main() -> float:
+        loop = asyncio.get_running_loop()
+        wheel = TimingWheel(loop)
+        fired = loop.create_future()
+        start = loop.time()
+        # a callback that schedules, like periodic timers re-arming themselves
+        wheel.schedule(0.01, wheel.schedule, 10.0, lambda: None)
+        wheel.schedule(0.05, lambda: fired.set_result(loop.time()))
+        await asyncio.sleep(0)
+        time.sleep(0.1)
+        return await asyncio.wait_for(fired, 1.0) - start
+
+    assert asyncio.run(main()) < 0.5
+
+
+def test_timers_fire_in_deadline_order():
+    async def main() -> list[int]:
+        loop = asyncio.get_running_loop()
+        wheel = TimingWheel(loop)
+        fired = list[int]()
+        for i in (3, 1, 2):
+            wheel.schedule(i * 0.02, fired.append, i)
+        await asyncio.sleep(0.15)
+        return fired
+
+    assert asyncio.run(main()) == [1, 2, 3]
+
+
+def test_cancelled_timer_does_not_fire():
+    async def main() -> list[int]:
+        loop = asyncio.get_running_loop()
+        wheel = TimingWheel(loop)
+        fired = list[int]()
+        wheel.schedule(0.02, fired.append, 1).cancel()
+        wheel.schedule(0.03, fired.append, 2)
+        await asyncio.sleep(0.1)
+        assert len(wheel) == 0
+        return fired
+
+    assert asyncio.run(main()) == [2]
+
+
+def test_timers_beyond_the_inner_wheel_cascade():
+    async def main() -> bool:
+        loop = asyncio.get_running_loop()
+        wheel = TimingWheel(loop, resolution=0.001)
+        fired = loop.create_future()
+        # 256 ticks per inner wheel, so this is placed in the next level
+        wheel.schedule(0.3, fired.set_result, True)
+        return await asyncio.wait_for(fired, 1.0)
+
+    assert asyncio.run(main())
+
+
+class Tick(Signal):
+    pass
+
+
+def test_signal_timers_go_ahead_of_queued_messages():
+    handled = list[Any]()
+
+    def setup(context, timers):
+        timers.start_single_timer("tick", Tick(), 0.01)
+
+        def on_receive(_, message):
+            handled.append(message)
+            if not isinstance(message, Signal):
+                time.sleep(0.02)
+            return Behaviors.same
+
+        return Behaviors.receive(on_receive)
+
+    async def main() -> None:
+        refs = []
+
+        def root(context):
+            # one message per wakeup, so the timer can fire in between
+            behavior = Behaviors.with_timers(setup)
+            refs.append(context.spawn(behavior, "ticking", batch_size=1))
+            return Behaviors.receive(lambda _, __: Behaviors.same)
+
+        system = ActorSystem(Behaviors.setup(root), "test")
+        await asyncio.sleep(0)
+        for i in range(5):
+            refs[0].tell(i)
+        await asyncio.sleep(0.3)
+        await system.shutdown()
+
+    asyncio.run(main())
+    ticks = [i for i, message in enumerate(handled) if isinstance(message, Tick)]
+    assert len(ticks) == 1 and ticks[0] < 5
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import socket
+from typing import Any
+
+import pytest
+import websockets.client
+from websockets.exceptions import InvalidStatusCode
+
+from felis.driver.backends.ws_server import WebsocketServerBackend
+
+
+class Driver:
+    """Records the messages a backend sends to its driver."""
+
+    def __init__(self) -> None:
+        self.messages = list[Any]()
+
+    def tell(self, message: Any) -> None:
+        self.messages.append(message)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def connect(url: str, name: str, token: str | None = None):
+    headers = {"X-Self-ID": name}
+    if token is not None:
+        headers["Authorization"] = f"Bearer {token}"
+    return websockets.client.connect(url, extra_headers=headers)
+
+
+def run(test) -> None:
+    async def main() -> None:
+        url = f"ws://127.0.0.1:{free_port()}/onebot"
+        backend = WebsocketServerBackend(Driver(), url, "secret")  # type: ignore
+        server = asyncio.ensure_future(backend.start())
+        await asyncio.sleep(0.1)
+        try:
+            await test(backend, url)
+        finally:
+            await backend.close()
+            await server
+
+    asyncio.run(main())
+
+
+def test_rejects_wrong_tokens():
+    async def test(backend: WebsocketServerBackend, url: str) -> None:
+        with pytest.raises(InvalidStatusCode):
+            async with connect(url, "a", "wrong"):
+                pass
+        async with websockets.client.connect(f"{url}?access_token=secret"):
+            pass
+
+    run(test)
+
+
+def test_actions_without_a_connection_go_to_the_first_bot():
+    async def test(backend: WebsocketServerBackend, url: str) -> None:
+        async with connect(url, "a", "secret") as a, connect(url, "b", "secret") as b:
+            await asyncio.sleep(0.05)
+            backend.send({"action": "first"})
+            backend.send({"action": "second"}, "b")
+            assert json.loads(await asyncio.wait_for(a.recv(), 1.0)) == {
+                "action": "first"
+            }
+            assert json.loads(await asyncio.wait_for(b.recv(), 1.0)) == {
+                "action": "second"
+            }
+
+    run(test)